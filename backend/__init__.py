@@ -4,13 +4,13 @@ Estrutura completa com blueprints, configurações e banco de dados
 """
 
 import os
+import re
 import time
 import uuid
 from flask import Flask, jsonify, g, request
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
-from flask_compress import Compress
 
 # Importações locais
 from .config import get_config
@@ -19,9 +19,24 @@ from .services.db.connection import _enable_sqlite_foreign_keys  # internal help
 from .blueprints.api.controllers import api_bp
 from .blueprints.auth.controllers import auth_bp
 from .blueprints.admin.controllers import admin_bp
+from .services.cashflow_ledger import register_ledger_events
+from .services.period_totals import register_period_totals_events
+from .services.delinquency import register_delinquency_events
+from .services.player_search import register_player_search_events
+from .services.tenant_versions import register_tenant_version_events
+from .services.cache import init_cache
+from .services.sql_profiler import get_profiler, init_sql_profiler, request_db_metrics, reset_request_db_metrics
+from .services.server_timing import TimedCompress, init_server_timing
+from .services.metrics import init_metrics
+from .services.structured_logging import init_logging
+from .services.json_provider import init_json_provider
+from .cli import register_commands
 
-# Extensão de compressão HTTP
-compress = Compress()
+# Extensão de compressão HTTP (mede a fase 'compress' do Server-Timing)
+compress = TimedCompress()
+
+# Trace id recebido do proxy/cliente (X-Trace-Id) é reaproveitado se tiver formato seguro
+_TRACE_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{8,64}$')
 
 
 def create_app(config_name=None):
@@ -44,6 +59,12 @@ def create_app(config_name=None):
     
     config = get_config(config_name)
     app.config.from_object(config)
+
+    # Logging estruturado via fila (antes das extensões, que já registram avisos)
+    init_logging(app)
+
+    # JSON em uma passada (Decimal/datetime/modelos no encoder; orjson se instalado)
+    init_json_provider(app)
     
     # Inicializar extensões
     init_extensions(app)
@@ -69,18 +90,23 @@ def create_app(config_name=None):
     # Registrar rotas básicas
     register_basic_routes(app)
 
+    # Registrar comandos CLI (flask cashflow ...)
+    register_commands(app)
+
     # ===================== PERF MONITORING (Request Timing) =====================
     @app.before_request
     def _trace_id_start():
-        # Gera um Trace ID para correlacionar logs e requisições
+        # Propaga o Trace ID recebido ou gera um novo para correlacionar logs e requisições
         try:
-            g._trace_id = uuid.uuid4().hex
+            incoming = request.headers.get('X-Trace-Id', '')
+            g._trace_id = incoming if _TRACE_ID_PATTERN.match(incoming) else uuid.uuid4().hex
         except Exception:
             g._trace_id = None
     @app.before_request
     def _perf_request_start():
         try:
             g._req_start = time.perf_counter()
+            reset_request_db_metrics()
         except Exception:
             # silencioso em ambientes sem suporte
             pass
@@ -97,13 +123,12 @@ def create_app(config_name=None):
                 trace_id = getattr(g, '_trace_id', None)
                 if trace_id:
                     response.headers['X-Trace-Id'] = trace_id
-                # Log estruturado
-                try:
-                    app.logger.info(
-                        f"[Perf][Request] {request.method} {request.path} -> {response.status_code} in {duration_ms}ms"
-                    )
-                except Exception:
-                    pass
+                # Quantidade e tempo de SQL da requisição (se o profiler estiver ativo)
+                if get_profiler() is not None:
+                    db_queries, db_time_ms = request_db_metrics()
+                    response.headers['X-DB-Queries'] = str(db_queries)
+                    response.headers['X-DB-Time-ms'] = f"{db_time_ms:.1f}"
+                # Log estruturado por fase: services/server_timing.py (após a compressão)
         except Exception:
             pass
         return response
@@ -126,6 +151,27 @@ def init_extensions(app):
     except Exception as e:
         app.logger.warning(f"Falha ao configurar PRAGMA foreign_keys: {e}")
     
+    # Manutenção incremental do ledger de fluxo de caixa (cashflow_monthly)
+    register_ledger_events()
+
+    # Totais em cache dos períodos mantidos por deltas no flush
+    register_period_totals_events()
+
+    # Meses consecutivos em aberto (pending_months_count) recalculados no flush
+    register_delinquency_events()
+
+    # Texto normalizado para busca de jogadores
+    register_player_search_events()
+
+    # Versão dos dados por usuário (ETag / GET condicional)
+    register_tenant_version_events()
+
+    # Cache de respostas (CACHE_TYPE: simple/lru, sqlite, null)
+    init_cache(app)
+
+    # Perfil de SQL por requisição e log de consultas lentas (SQL_PROFILER_ENABLED)
+    init_sql_profiler(app)
+
     # CORS
     CORS(app, 
          origins=app.config.get('CORS_ORIGINS', ['http://localhost:3000']),
@@ -137,6 +183,12 @@ def init_extensions(app):
     # Marshmallow
     ma = Marshmallow(app)
 
+    # Server-Timing por fase (registrado antes da compressão para medi-la)
+    init_server_timing(app)
+
+    # Contadores e histogramas por rota e do pool em /metrics (também antes da compressão)
+    init_metrics(app)
+
     # Compressão HTTP
     try:
         compress.init_app(app)
@@ -0,0 +1,11 @@
+"""
+Benchmark reprodutível da API
+
+- ``datagen``: tenants grandes gerados de forma determinística (semente);
+- ``scenarios``: uma requisição por endpoint do ``api_bp``;
+- ``runner``: mede latência, queries e pico de memória por endpoint;
+- ``compare``: compara dois resultados e aponta regressões;
+- ``loadtest``: carga HTTP concorrente contra a aplicação em execução.
+
+Uso: ``python -m backend.benchmarks run|compare|load`` (ver docs/testing.md).
+"""
@@ -0,0 +1,150 @@
+"""
+CLI do benchmark
+
+    python -m backend.benchmarks run --output bench/baseline.json
+    python -m backend.benchmarks compare bench/baseline.json bench/atual.json
+    python -m backend.benchmarks load --base-url http://127.0.0.1:5000 --users 10 --concurrency 20
+
+``compare`` sai com código 1 se houver regressão (adequado para CI).
+"""
+import argparse
+import json
+import os
+import sys
+
+from .compare import DEFAULT_MIN_DELTA_MS, DEFAULT_THRESHOLD, compare, format_report
+from .datagen import TenantSize
+from .loadtest import DEFAULT_PASSWORD
+
+
+def _run(args) -> int:
+    from sqlalchemy.engine import make_url
+
+    from .runner import run
+
+    database_url = args.database_url or os.environ.get('BENCH_DATABASE_URL')
+    if database_url and make_url(database_url).get_backend_name() != 'sqlite' and not args.reset:
+        print('O benchmark apaga e recria todas as tabelas do banco; confirme com --reset.', file=sys.stderr)
+        return 2
+
+    size = TenantSize(
+        players=args.players, periods=args.periods,
+        expenses_per_month=args.expenses, casual_per_month=args.casual,
+    )
+
+    def progress(endpoint, result):
+        latency = result['latency_ms']
+        print(
+            f"{endpoint:<48} {result['method']:<7} status={','.join(map(str, result['status']))} "
+            f"med={latency['median']:.2f}ms p95={latency['p95']:.2f}ms "
+            f"queries={result['queries']} mem={result['peak_memory_kb']:.0f}KB",
+            file=sys.stderr
+        )
+
+    result = run(
+        size=size, tenants=args.tenants, seed=args.seed, iterations=args.iterations,
+        warmup=args.warmup, database_url=database_url, progress=progress,
+    )
+    if result['uncovered']:
+        print(f"Endpoints sem cenário: {', '.join(result['uncovered'])}", file=sys.stderr)
+
+    payload = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(payload + '\n')
+        print(f'Resultado salvo em {args.output}', file=sys.stderr)
+    else:
+        print(payload)
+
+    # 4xx é registrado (pode ser regra de negócio); 5xx invalida a medição
+    rejected = [e for e, r in result['results'].items() if any(400 <= s < 500 for s in r['status'])]
+    if rejected:
+        print(f"Endpoints com resposta 4xx: {', '.join(rejected)}", file=sys.stderr)
+    failed = [e for e, r in result['results'].items() if any(s >= 500 for s in r['status'])]
+    if failed:
+        print(f"Endpoints com erro 5xx: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline, encoding='utf-8') as fh:
+        baseline = json.load(fh)
+    with open(args.current, encoding='utf-8') as fh:
+        current = json.load(fh)
+
+    regressions = compare(baseline, current, threshold=args.threshold, min_delta_ms=args.min_delta_ms)
+    print(format_report(baseline, current, regressions))
+    return 1 if regressions else 0
+
+
+def _load(args) -> int:
+    from .loadtest import LoadTestError, format_load_report, run_load
+
+    try:
+        result = run_load(
+            args.base_url, users=args.users, concurrency=args.concurrency, duration=args.duration,
+            think_ms=args.think_ms, seed=args.seed, players_per_user=args.players,
+            password=args.password,
+        )
+    except LoadTestError as e:
+        print(f'Teste de carga interrompido: {e}', file=sys.stderr)
+        return 2
+
+    print(format_load_report(result), file=sys.stderr)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(result, indent=2, ensure_ascii=False) + '\n')
+        print(f'Resultado salvo em {args.output}', file=sys.stderr)
+    return 1 if result['total']['errors'] else 0
+
+
+def main(argv=None) -> int:
+    defaults = TenantSize()
+    parser = argparse.ArgumentParser(prog='python -m backend.benchmarks', description='Benchmark da API')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Gera os dados e mede todos os endpoints')
+    run_parser.add_argument('--players', type=int, default=defaults.players, help='Jogadores por tenant')
+    run_parser.add_argument('--periods', type=int, default=defaults.periods, help='Meses por tenant')
+    run_parser.add_argument('--expenses', type=int, default=defaults.expenses_per_month, help='Despesas por mês')
+    run_parser.add_argument('--casual', type=int, default=defaults.casual_per_month, help='Avulsos por mês')
+    run_parser.add_argument('--tenants', type=int, default=1, help='Tenants gerados (o primeiro é medido)')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--iterations', type=int, default=20, help='Execuções medidas por endpoint')
+    run_parser.add_argument('--warmup', type=int, default=3, help='Execuções descartadas por endpoint')
+    run_parser.add_argument('--database-url', help='Padrão: BENCH_DATABASE_URL ou instance/benchmark.db')
+    run_parser.add_argument('--reset', action='store_true',
+                            help='Confirma que o banco (não SQLite) pode ser apagado e recriado')
+    run_parser.add_argument('--output', '-o', help='Arquivo JSON de saída (padrão: stdout)')
+    run_parser.set_defaults(func=_run)
+
+    compare_parser = commands.add_parser('compare', help='Compara dois resultados e aponta regressões')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='Aumento relativo tolerado (0.2 = 20%%)')
+    compare_parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                                help='Aumento absoluto mínimo de latência para acusar regressão')
+    compare_parser.set_defaults(func=_compare)
+
+    load_parser = commands.add_parser('load', help='Teste de carga HTTP contra a aplicação em execução')
+    load_parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    load_parser.add_argument('--users', type=int, default=10, help='Usuários sintéticos (tenants)')
+    load_parser.add_argument('--concurrency', '-c', type=int, default=20, help='Threads simultâneas')
+    load_parser.add_argument('--duration', '-d', type=float, default=30.0, help='Segundos de carga')
+    load_parser.add_argument('--think-ms', type=float, default=0.0, help='Pausa média entre requisições')
+    load_parser.add_argument('--players', type=int, default=50, help='Jogadores no período de cada usuário')
+    load_parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Senha dos usuários sintéticos')
+    load_parser.add_argument('--seed', type=int, default=42)
+    load_parser.add_argument('--output', '-o', help='Arquivo JSON com o relatório')
+    load_parser.set_defaults(func=_load)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
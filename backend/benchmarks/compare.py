@@ -0,0 +1,112 @@
+"""
+Comparação de dois resultados do benchmark
+
+Regressões sinalizadas por endpoint:
+- ``latency``: mediana acima de ``threshold`` (relativo) e de ``min_delta_ms``
+  (absoluto, para não acusar ruído em endpoints de ~1ms);
+- ``queries``: qualquer aumento na quantidade de SQL por requisição
+  (determinística, então não há tolerância);
+- ``memory``: pico acima de ``threshold`` e de ``min_delta_kb``;
+- ``status``: endpoint que passou a responder erro (>= 400);
+- ``missing``: endpoint presente na baseline e ausente no resultado atual.
+"""
+from typing import Any, Dict, List
+
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA_MS = 2.0
+DEFAULT_MIN_DELTA_KB = 64.0
+
+# Campos de ``meta`` que precisam coincidir para a comparação fazer sentido
+COMPARABLE_META = ('dialect', 'size', 'tenants', 'seed')
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before if before else float('inf') if after else 0.0
+
+
+def _has_error(result: Dict[str, Any]) -> bool:
+    return any(status >= 400 for status in result.get('status', ()))
+
+
+def meta_mismatches(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Campos de ``meta`` diferentes entre os dois resultados"""
+    before, after = baseline.get('meta', {}), current.get('meta', {})
+    return [key for key in COMPARABLE_META if before.get(key) != after.get(key)]
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+            min_delta_kb: float = DEFAULT_MIN_DELTA_KB) -> List[Dict[str, Any]]:
+    """
+    Lista as regressões de ``current`` em relação a ``baseline``.
+
+    Returns:
+        Lista de ``{'endpoint', 'metric', 'baseline', 'current', 'change'}``
+        (vazia = sem regressão)
+    """
+    regressions = []
+
+    def flag(endpoint, metric, before, after):
+        regressions.append({
+            'endpoint': endpoint,
+            'metric': metric,
+            'baseline': before,
+            'current': after,
+            'change': round(_change(before, after), 4) if isinstance(before, (int, float)) else None,
+        })
+
+    current_results = current.get('results', {})
+    for endpoint, before in sorted(baseline.get('results', {}).items()):
+        after = current_results.get(endpoint)
+        if after is None:
+            flag(endpoint, 'missing', before.get('status'), None)
+            continue
+
+        if _has_error(after) and not _has_error(before):
+            flag(endpoint, 'status', before['status'], after['status'])
+
+        before_ms, after_ms = before['latency_ms']['median'], after['latency_ms']['median']
+        if after_ms > before_ms * (1 + threshold) and after_ms - before_ms > min_delta_ms:
+            flag(endpoint, 'latency', before_ms, after_ms)
+
+        if after['queries'] > before['queries']:
+            flag(endpoint, 'queries', before['queries'], after['queries'])
+
+        before_kb, after_kb = before['peak_memory_kb'], after['peak_memory_kb']
+        if after_kb > before_kb * (1 + threshold) and after_kb - before_kb > min_delta_kb:
+            flag(endpoint, 'memory', before_kb, after_kb)
+
+    return regressions
+
+
+def format_report(baseline: Dict[str, Any], current: Dict[str, Any],
+                  regressions: List[Dict[str, Any]]) -> str:
+    """Tabela por endpoint (mediana, queries, memória) seguida das regressões"""
+    lines = []
+    mismatches = meta_mismatches(baseline, current)
+    if mismatches:
+        lines.append(f"ATENÇÃO: resultados não comparáveis ({', '.join(mismatches)} diferentes)")
+
+    lines.append(f"{'endpoint':<48} {'mediana ms':>21} {'queries':>9} {'memória KB':>21}")
+    before_results = baseline.get('results', {})
+    for endpoint, after in sorted(current.get('results', {}).items()):
+        before = before_results.get(endpoint)
+        if before is None:
+            lines.append(f"{endpoint:<48} {'(novo)':>21}")
+            continue
+        lines.append(
+            f"{endpoint:<48} "
+            f"{before['latency_ms']['median']:>9.2f} → {after['latency_ms']['median']:>9.2f} "
+            f"{before['queries']:>3} → {after['queries']:>3} "
+            f"{before['peak_memory_kb']:>9.1f} → {after['peak_memory_kb']:>9.1f}"
+        )
+
+    lines.append('')
+    if not regressions:
+        lines.append('Nenhuma regressão.')
+    for item in regressions:
+        change = f" ({item['change']:+.0%})" if item['change'] is not None else ''
+        lines.append(
+            f"REGRESSÃO {item['endpoint']} {item['metric']}: {item['baseline']} → {item['current']}{change}"
+        )
+    return '\n'.join(lines)
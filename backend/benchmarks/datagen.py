@@ -0,0 +1,197 @@
+"""
+Gerador determinístico de tenants para benchmark
+
+Mesma semente e mesmo tamanho produzem exatamente os mesmos dados (ids,
+nomes, valores e datas), em qualquer banco. As linhas são gravadas via Core
+em lote; o que os hooks do ORM manteriam é calculado aqui mesmo: totais dos
+períodos, ``search_text`` dos jogadores, ledger de fluxo de caixa
+(``rebuild_user``) e versão do tenant.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from werkzeug.security import generate_password_hash
+
+from ..services import delinquency
+from ..services.cashflow_ledger import rebuild_user
+from ..services.db.connection import db
+from ..services.db.models import (
+    CasualPlayer, Expense, MonthlyPeriod, MonthlyPlayer, Player, User
+)
+from ..services.player_search import build_search_text
+from ..services.tenant_versions import mark_tenant_written
+
+# Último período gerado (fixo para que os dados não dependam da data atual)
+DEFAULT_END = (2025, 12)
+
+POSITIONS = ('goalkeeper', 'defender', 'midfielder', 'forward')
+EXPENSE_CATEGORIES = ('equipment', 'field_rental', 'referee', 'transportation', 'food', 'medical', 'maintenance', 'other')
+FIRST_NAMES = ('João', 'José', 'Antônio', 'Francisco', 'Carlos', 'Paulo', 'Pedro', 'Lucas', 'Luís', 'Marcos',
+               'Gabriel', 'Rafael', 'Daniel', 'Marcelo', 'Bruno', 'Eduardo', 'Felipe', 'Raimundo', 'Rodrigo', 'Sérgio')
+LAST_NAMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+              'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Araújo', 'Melo', 'Barbosa', 'Cardoso', 'Conceição', 'Rocha')
+
+# Lotes do INSERT em executemany
+INSERT_CHUNK = 5000
+
+BENCH_PASSWORD = 'bench-password'
+
+
+@dataclass(frozen=True)
+class TenantSize:
+    """Tamanho de um tenant gerado"""
+    players: int = 500
+    periods: int = 60
+    expenses_per_month: int = 20
+    casual_per_month: int = 5
+    # Fração de jogadores inscrita em cada período e fração dos pagamentos quitados
+    enrollment: float = 0.9
+    paid_ratio: float = 0.8
+
+
+@dataclass
+class TenantData:
+    """Ids gerados para um tenant (usados para montar as URLs do benchmark)"""
+    user_id: str
+    username: str
+    player_ids: List[str] = field(default_factory=list)
+    period_ids: List[str] = field(default_factory=list)
+    periods: List[Tuple[int, int]] = field(default_factory=list)
+    # period_id -> [(monthly_player_id, player_id)]
+    monthly_players: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    casual_players: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def _months_back(end: Tuple[int, int], count: int) -> List[Tuple[int, int]]:
+    year, month = end
+    months = []
+    for _ in range(count):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+    return list(reversed(months))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _insert(table, rows: List[dict]) -> None:
+    conn = db.session.connection()
+    for start in range(0, len(rows), INSERT_CHUNK):
+        conn.execute(table.insert(), rows[start:start + INSERT_CHUNK])
+
+
+def generate_tenant(index: int, size: TenantSize, seed: int = 42, end: Tuple[int, int] = DEFAULT_END) -> TenantData:
+    """
+    Gera um tenant completo (não faz commit).
+
+    Args:
+        index: Número do tenant (entra na semente e no username)
+        size: Quantidades a gerar
+        seed: Semente base
+        end: Último (ano, mês) gerado
+    """
+    rng = random.Random(f'{seed}:{index}')
+    created = datetime(end[0], end[1], 1)
+
+    username = f'bench{index}'
+    user_id = _uuid(rng)
+    _insert(User.__table__, [{
+        'id': user_id, 'username': username, 'email': f'{username}@bench.local',
+        'password_hash': generate_password_hash(BENCH_PASSWORD), 'is_active': True,
+        'initial_balance': Decimal('1000.00'), 'created_at': created, 'updated_at': created,
+    }])
+    data = TenantData(user_id=user_id, username=username)
+
+    players = []
+    for i in range(size.players):
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i:04d}'
+        phone = f'11 9{index:02d}{i:06d}'
+        email = f'jogador{i}@t{index}.bench.local' if rng.random() < 0.7 else None
+        status = rng.choices(('active', 'inactive', 'pending', 'delayed'), weights=(80, 10, 5, 5))[0]
+        players.append({
+            'id': _uuid(rng), 'user_id': user_id, 'name': name, 'position': rng.choice(POSITIONS),
+            'phone': phone, 'email': email, 'join_date': date(2020, 1, 1) if i % 2 else date(2021, 6, 1),
+            'status': status, 'monthly_fee': Decimal(rng.choice(('80.00', '100.00', '120.00'))),
+            'is_active': status != 'inactive', 'search_text': build_search_text(name, phone, email),
+            'created_at': created, 'updated_at': created,
+        })
+    _insert(Player.__table__, players)
+    data.player_ids = [p['id'] for p in players]
+
+    periods, monthly_players, casual_players, expenses = [], [], [], []
+    for year, month in _months_back(end, size.periods):
+        period_id = _uuid(rng)
+        expected = received = Decimal('0')
+        enrolled = [p for p in players if rng.random() < size.enrollment]
+        data.monthly_players[period_id] = []
+        for player in enrolled:
+            mp_id = _uuid(rng)
+            custom_fee = Decimal('50.00') if rng.random() < 0.05 else None
+            paid = rng.random() < size.paid_ratio
+            effective = custom_fee if custom_fee is not None else player['monthly_fee']
+            expected += effective
+            if paid:
+                received += effective
+            monthly_players.append({
+                'id': mp_id, 'player_id': player['id'], 'monthly_period_id': period_id, 'user_id': user_id,
+                'player_name': player['name'], 'position': player['position'], 'phone': player['phone'],
+                'email': player['email'] or '', 'monthly_fee': player['monthly_fee'],
+                'custom_monthly_fee': custom_fee, 'join_date': player['join_date'],
+                'status': 'paid' if paid else 'pending',
+                'payment_date': datetime(year, month, rng.randint(1, 28)) if paid else None,
+                'pending_months_count': 0, 'created_at': created, 'updated_at': created,
+            })
+            data.monthly_players[period_id].append((mp_id, player['id']))
+
+        data.casual_players[period_id] = []
+        for c in range(size.casual_per_month):
+            cp_id = _uuid(rng)
+            casual_players.append({
+                'id': cp_id, 'monthly_period_id': period_id, 'user_id': user_id,
+                'player_name': f'Avulso {c}', 'play_date': date(year, month, rng.randint(1, 28)),
+                'invited_by': rng.choice(players)['name'] if players else '',
+                'amount': Decimal('25.00'), 'status': rng.choice(('paid', 'pending')),
+                'payment_date': None, 'created_at': created, 'updated_at': created,
+            })
+            data.casual_players[period_id].append(cp_id)
+
+        for _ in range(size.expenses_per_month):
+            expenses.append({
+                'id': _uuid(rng), 'monthly_period_id': period_id, 'user_id': user_id,
+                'description': f'Despesa {rng.choice(EXPENSE_CATEGORIES)}',
+                'amount': Decimal(rng.randint(1000, 50000)) / 100, 'category': rng.choice(EXPENSE_CATEGORIES),
+                'date': date(year, month, rng.randint(1, 28)), 'month': month, 'year': year,
+                'created_at': created, 'updated_at': created,
+            })
+
+        periods.append({
+            'id': period_id, 'user_id': user_id, 'year': year, 'month': month, 'name': f'{month:02d}/{year}',
+            'is_active': True, 'total_expected': expected, 'total_received': received,
+            'players_count': len(enrolled), 'created_at': created, 'updated_at': created,
+        })
+        data.period_ids.append(period_id)
+        data.periods.append((year, month))
+
+    _insert(MonthlyPeriod.__table__, periods)
+    _insert(MonthlyPlayer.__table__, monthly_players)
+    _insert(CasualPlayer.__table__, casual_players)
+    _insert(Expense.__table__, expenses)
+
+    rebuild_user(user_id)
+    delinquency.refresh(db.session.connection(), user_id)
+    mark_tenant_written(db.session, user_id)
+    return data
+
+
+def generate(size: TenantSize, tenants: int = 1, seed: int = 42, end: Tuple[int, int] = DEFAULT_END) -> List[TenantData]:
+    """Gera ``tenants`` tenants do mesmo tamanho e faz commit (o primeiro é o medido)"""
+    generated = [generate_tenant(i, size, seed=seed, end=end) for i in range(tenants)]
+    db.session.commit()
+    return generated
@@ -0,0 +1,289 @@
+"""
+Teste de carga HTTP contra a aplicação em execução (ex.: ``run_gunicorn.py``)
+
+Só biblioteca padrão (threads + ``http.client`` com keep-alive por thread).
+
+1. Preparação: cada usuário sintético é registrado (ou já existia) e faz
+   login por ``POST /api/auth/login``; se ainda não houver período do mês
+   corrente, cria jogadores em lote, o período e inclui os jogadores nele.
+2. Carga: ``concurrency`` threads, cada uma presa a um usuário, repetem o mix
+   do dashboard (``DASHBOARD_MIX``) durante ``duration`` segundos.
+3. Relatório por ação: requisições, vazão, taxa de erro, status e latência
+   (p50/p90/p95/p99).
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .stats import latency_summary
+
+DEFAULT_PASSWORD = 'loadtest-password'
+
+# Percentis do relatório
+REPORT_PERCENTILES = (90, 95, 99)
+
+
+@dataclass
+class LoadUser:
+    """Usuário sintético já autenticado e com dados para o mix"""
+    username: str
+    token: str
+    period_id: str
+    player_ids: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Action:
+    name: str
+    weight: int
+    build: Callable[[LoadUser, random.Random], Tuple[str, str, Optional[dict]]]
+
+
+# Uso típico do dashboard: listas e resumo dominam, com baixas de pagamento no meio
+DASHBOARD_MIX: Tuple[Action, ...] = (
+    Action('players', 30, lambda u, rng: ('GET', '/api/players?page=1&per_page=20', None)),
+    Action('period_players', 30, lambda u, rng: ('GET', f'/api/monthly-periods/{u.period_id}/players', None)),
+    Action('payment_patch', 15, lambda u, rng: (
+        'PATCH', f'/api/monthly-periods/{u.period_id}/players/{rng.choice(u.player_ids)}/payment',
+        {'status': rng.choice(('paid', 'pending'))}
+    )),
+    Action('cashflow_summary', 25, lambda u, rng: ('GET', '/api/cashflow/summary', None)),
+)
+
+
+class LoadTestError(Exception):
+    """Falha na preparação (login/dados) que impede o teste"""
+
+
+class HttpClient:
+    """Conexão keep-alive de uma thread (reconecta se o servidor fechar)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+
+    def request(self, method: str, path: str, body: Optional[dict] = None,
+                token: Optional[str] = None) -> Tuple[int, Any, float]:
+        """Executa a requisição e devolve ``(status, json, ms)``; status 0 = falha de conexão"""
+        headers = {'Accept': 'application/json'}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        start = time.perf_counter()
+        for attempt in range(2):
+            try:
+                self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                raw = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # Conexão keep-alive encerrada pelo servidor: tenta de novo uma vez
+                self.connection.close()
+                if attempt:
+                    return 0, None, (time.perf_counter() - start) * 1000
+            except (OSError, http.client.HTTPException):
+                self.connection.close()
+                return 0, None, (time.perf_counter() - start) * 1000
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = None
+        return response.status, data, elapsed_ms
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _login(client: HttpClient, username: str, password: str) -> str:
+    status, data, _ = client.request('POST', '/api/auth/register', {
+        'username': username, 'email': f'{username}@loadtest.local', 'password': password
+    })
+    if status not in (201, 409):
+        raise LoadTestError(f'Registro de {username} falhou: HTTP {status} {data}')
+
+    status, data, _ = client.request('POST', '/api/auth/login', {'username': username, 'password': password})
+    if status != 200:
+        raise LoadTestError(f'Login de {username} falhou: HTTP {status} {data}')
+    return data['access_token']
+
+
+def _ensure_period(client: HttpClient, token: str, index: int, players: int) -> Tuple[str, List[str]]:
+    """Período do mês corrente com jogadores (criado na primeira execução)"""
+    today = date.today()
+    status, periods, _ = client.request('GET', f'/api/monthly-periods?year={today.year}', token=token)
+    if status != 200:
+        raise LoadTestError(f'Listagem de períodos falhou: HTTP {status}')
+    period_id = next((p['id'] for p in periods if p['month'] == today.month), None)
+
+    if period_id is None:
+        status, data, _ = client.request('POST', '/api/monthly-payments',
+                                         {'year': today.year, 'month': today.month}, token=token)
+        if status != 201:
+            raise LoadTestError(f'Criação do período falhou: HTTP {status} {data}')
+        period_id = data['period_id']
+
+    status, enrolled, _ = client.request('GET', f'/api/monthly-periods/{period_id}/players', token=token)
+    if status != 200:
+        raise LoadTestError(f'Jogadores do período: HTTP {status}')
+    if enrolled:
+        return period_id, [mp['player_id'] for mp in enrolled]
+
+    status, data, _ = client.request('POST', '/api/players/bulk', {'players': [
+        {'name': f'Carga {index:03d} {i:04d}', 'phone': f'55 9{index:03d}{i:05d}',
+         'position': 'midfielder', 'monthly_fee': 100}
+        for i in range(players)
+    ]}, token=token)
+    if status not in (200, 201):
+        raise LoadTestError(f'Criação dos jogadores falhou: HTTP {status} {data}')
+    player_ids = [row['id'] for row in data['data']['results'] if row['status'] == 'created']
+    if not player_ids:
+        raise LoadTestError('Nenhum jogador criado para o período')
+
+    status, data, _ = client.request('POST', f'/api/monthly-periods/{period_id}/players',
+                                     {'player_ids': player_ids}, token=token)
+    if status != 200:
+        raise LoadTestError(f'Inclusão dos jogadores no período falhou: HTTP {status} {data}')
+    return period_id, player_ids
+
+
+def prepare_users(base_url: str, users: int, password: str = DEFAULT_PASSWORD,
+                  players_per_user: int = 50, prefix: str = 'loadtest') -> List[LoadUser]:
+    """Registra/autentica os usuários sintéticos e garante os dados do mix"""
+    client = HttpClient(base_url)
+    try:
+        prepared = []
+        for index in range(users):
+            username = f'{prefix}{index:03d}'
+            token = _login(client, username, password)
+            period_id, player_ids = _ensure_period(client, token, index, players_per_user)
+            prepared.append(LoadUser(username, token, period_id, player_ids))
+        return prepared
+    finally:
+        client.close()
+
+
+def _worker(base_url: str, user: LoadUser, mix, rng: random.Random, barrier: threading.Barrier,
+            deadline: List[float], think_ms: float, samples: Dict[str, list]) -> None:
+    client = HttpClient(base_url)
+    weights = [action.weight for action in mix]
+    try:
+        barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            action = rng.choices(mix, weights=weights)[0]
+            method, path, body = action.build(user, rng)
+            status, _, elapsed_ms = client.request(method, path, body, token=user.token)
+            samples.setdefault(action.name, []).append((status, elapsed_ms))
+            if think_ms:
+                time.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+    finally:
+        client.close()
+
+
+def _report(samples: List[Tuple[int, float]], elapsed: float) -> Dict[str, Any]:
+    statuses = Counter(status for status, _ in samples)
+    errors = sum(count for status, count in statuses.items() if status == 0 or status >= 400)
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4),
+        'status': {str(status): count for status, count in sorted(statuses.items())},
+        'latency_ms': latency_summary([ms for _, ms in samples], REPORT_PERCENTILES),
+    }
+
+
+def run_load(base_url: str, users: int = 10, concurrency: int = 20, duration: float = 30.0,
+             think_ms: float = 0.0, seed: int = 42, players_per_user: int = 50,
+             password: str = DEFAULT_PASSWORD, mix: Tuple[Action, ...] = DASHBOARD_MIX) -> Dict[str, Any]:
+    """
+    Executa o teste de carga e devolve o relatório (serializável em JSON).
+
+    Args:
+        base_url: URL da aplicação (ex.: ``http://127.0.0.1:5000``)
+        users: Usuários sintéticos (tenants distintos)
+        concurrency: Threads simultâneas (distribuídas entre os usuários)
+        duration: Duração da fase de carga em segundos
+        think_ms: Pausa média entre requisições de uma thread (0 = sem pausa)
+        seed: Semente do sorteio das ações
+        players_per_user: Jogadores criados no período de cada usuário
+    """
+    prepared = prepare_users(base_url, users, password, players_per_user)
+
+    per_thread = [dict() for _ in range(concurrency)]
+    barrier = threading.Barrier(concurrency + 1)
+    deadline = [float('inf')]
+    threads = [
+        threading.Thread(
+            target=_worker, name=f'loadtest-{i}', daemon=True,
+            args=(base_url, prepared[i % len(prepared)], mix, random.Random(f'{seed}:{i}'),
+                  barrier, deadline, think_ms, per_thread[i]),
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Todas as threads começam juntas; o prazo vale a partir da liberação
+    deadline[0] = time.perf_counter() + duration
+    start = time.perf_counter()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    merged: Dict[str, list] = {}
+    for samples in per_thread:
+        for name, values in samples.items():
+            merged.setdefault(name, []).extend(values)
+    all_samples = [sample for values in merged.values() for sample in values]
+    if not all_samples:
+        raise LoadTestError('Nenhuma requisição concluída')
+
+    return {
+        'meta': {
+            'base_url': base_url,
+            'users': users,
+            'concurrency': concurrency,
+            'duration_seconds': round(elapsed, 2),
+            'think_ms': think_ms,
+            'seed': seed,
+            'players_per_user': players_per_user,
+            'mix': {action.name: action.weight for action in mix},
+        },
+        'endpoints': {name: _report(merged[name], elapsed) for name in sorted(merged)},
+        'total': _report(all_samples, elapsed),
+    }
+
+
+def format_load_report(result: Dict[str, Any]) -> str:
+    """Tabela por ação seguida do total"""
+    meta = result['meta']
+    lines = [
+        f"{meta['base_url']} usuários={meta['users']} concorrência={meta['concurrency']} "
+        f"duração={meta['duration_seconds']}s",
+        f"{'ação':<18} {'req':>7} {'req/s':>8} {'erros':>7} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'máx':>8}",
+    ]
+    rows = list(result['endpoints'].items()) + [('TOTAL', result['total'])]
+    for name, report in rows:
+        latency = report['latency_ms']
+        lines.append(
+            f"{name:<18} {report['requests']:>7} {report['throughput_rps']:>8.1f} "
+            f"{report['error_rate']:>7.1%} {latency['median']:>8.1f} {latency['p90']:>8.1f} "
+            f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,175 @@
+"""
+Execução do benchmark
+
+Recria o banco, gera os tenants e mede cada cenário de ``scenarios.py`` pelo
+test client (sem servidor HTTP): leituras primeiro, depois escritas. Para
+cada endpoint registra latência (min/mediana/p95/máx/média), quantidade e
+tempo de SQL (headers ``X-DB-Queries``/``X-DB-Time-ms``) e pico de memória
+Python (``tracemalloc``, numa execução extra para não distorcer a latência).
+"""
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from flask_jwt_extended import create_access_token
+
+from .. import create_app
+from ..services.db.connection import db
+from .datagen import TenantSize, generate
+from .scenarios import SCENARIOS, BenchContext, Scenario
+from .stats import latency_summary
+
+# Versão do formato do JSON de resultados
+RESULT_FORMAT = 1
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def create_benchmark_app(database_url: Optional[str] = None):
+    """App com ``BenchmarkConfig`` (URL do banco opcionalmente sobrescrita)"""
+    if database_url:
+        from ..config import BenchmarkConfig
+        BenchmarkConfig.SQLALCHEMY_DATABASE_URI = database_url
+    return create_app('benchmark')
+
+
+def _method_of(scenario: Scenario, ctx: BenchContext) -> str:
+    return scenario.build(ctx)[0]
+
+
+def _request(app, client, scenario: Scenario, ctx: BenchContext, headers: Dict[str, str]):
+    if scenario.setup is not None:
+        with app.app_context():
+            scenario.setup(ctx)
+    method, url, body = scenario.build(ctx)
+    start = time.perf_counter()
+    response = client.open(url, method=method, json=body, headers=headers)
+    # Respostas em streaming (exportações) só são geradas ao consumir o corpo
+    response.get_data()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    ctx.iteration += 1
+    return method, url, response, elapsed_ms
+
+
+def measure(app, client, scenario: Scenario, ctx: BenchContext, headers: Dict[str, str],
+            iterations: int = 20, warmup: int = 3) -> Dict[str, Any]:
+    """Mede um cenário: ``warmup`` execuções descartadas + ``iterations`` medidas + 1 com tracemalloc"""
+    latencies, queries, db_ms, statuses = [], [], [], set()
+    method = url = None
+    for i in range(warmup + iterations):
+        method, url, response, elapsed_ms = _request(app, client, scenario, ctx, headers)
+        statuses.add(response.status_code)
+        if i < warmup:
+            continue
+        latencies.append(elapsed_ms)
+        queries.append(int(response.headers.get('X-DB-Queries', 0)))
+        db_ms.append(float(response.headers.get('X-DB-Time-ms', 0)))
+
+    tracemalloc.start()
+    try:
+        _, _, response, _ = _request(app, client, scenario, ctx, headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    statuses.add(response.status_code)
+
+    return {
+        'method': method,
+        'url': url,
+        'status': sorted(statuses),
+        'samples': len(latencies),
+        'latency_ms': latency_summary(latencies),
+        'queries': int(statistics.median(queries)),
+        'db_ms': round(statistics.median(db_ms), 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def uncovered_endpoints(app, scenarios: List[Scenario] = SCENARIOS) -> List[str]:
+    """Endpoints do ``api_bp`` sem cenário"""
+    covered = {s.endpoint for s in scenarios}
+    return sorted({
+        rule.endpoint for rule in app.url_map.iter_rules()
+        if rule.endpoint.startswith('api.') and rule.endpoint not in covered
+    })
+
+
+def run(size: TenantSize = TenantSize(), tenants: int = 1, seed: int = 42, iterations: int = 20,
+        warmup: int = 3, database_url: Optional[str] = None, app=None,
+        scenarios: List[Scenario] = SCENARIOS, progress=None) -> Dict[str, Any]:
+    """
+    Executa o benchmark completo e devolve o resultado (serializável em JSON).
+
+    Args:
+        size: Tamanho de cada tenant
+        tenants: Quantidade de tenants (o primeiro é o medido; os demais só
+            ocupam as tabelas, como numa base multi-tenant)
+        seed: Semente dos dados
+        iterations: Execuções medidas por endpoint
+        warmup: Execuções descartadas antes da medição
+        database_url: Banco a usar (recriado!); padrão ``BENCH_DATABASE_URL``
+        app: App já criada (testes); ignora ``database_url``
+        progress: Callback ``(endpoint, resultado)`` chamado a cada cenário
+    """
+    if app is None:
+        app = create_benchmark_app(database_url)
+
+    with app.app_context():
+        engine = db.engine
+        dialect = engine.dialect.name
+        server_version = '.'.join(str(v) for v in (engine.dialect.server_version_info or ()))
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        generated = generate(size, tenants=tenants, seed=seed)
+        generation_seconds = time.perf_counter() - start
+        token = create_access_token(identity=generated[0].user_id)
+        db.session.remove()
+
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+    ctx = BenchContext(tenant=generated[0])
+
+    # Escritas por último: as leituras medem a base recém-gerada
+    ordered = sorted(scenarios, key=lambda s: _method_of(s, ctx) not in READ_METHODS)
+
+    results = {}
+    for scenario in ordered:
+        results[scenario.endpoint] = measure(app, client, scenario, ctx, headers, iterations, warmup)
+        if progress is not None:
+            progress(scenario.endpoint, results[scenario.endpoint])
+
+    return {
+        'format': RESULT_FORMAT,
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'dialect': dialect,
+            'server_version': server_version or None,
+            'size': asdict(size),
+            'tenants': tenants,
+            'seed': seed,
+            'iterations': iterations,
+            'warmup': warmup,
+            'generation_seconds': round(generation_seconds, 2),
+        },
+        'results': results,
+        'uncovered': uncovered_endpoints(app, scenarios),
+    }
@@ -0,0 +1,201 @@
+"""
+Requisições do benchmark, uma por endpoint do ``api_bp``
+
+Cada cenário recebe o contexto (tenant gerado + contador da iteração) e
+devolve ``(método, url, json)``. Cenários de escrita que consomem o alvo
+(excluir/ativar/desativar jogador, incluir jogador no período, criar
+período) preparam o alvo em ``setup``, fora da medição.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, List, Optional
+
+from ..services.db.connection import db
+from ..services.db.models import MonthlyPeriod, Player
+from ..services.player_search import build_search_text
+from .datagen import TenantData
+
+
+@dataclass
+class BenchContext:
+    """Estado compartilhado pelos cenários durante a execução"""
+    tenant: TenantData
+    iteration: int = 0
+    target: Optional[str] = None
+    targets_created: int = 0
+
+    @property
+    def period_id(self) -> str:
+        # Período mais recente: o mais consultado na prática
+        return self.tenant.period_ids[-1]
+
+    @property
+    def period(self):
+        return self.tenant.periods[-1]
+
+    def unique(self, prefix: str) -> str:
+        return f'{prefix}{self.iteration:05d}'
+
+    def new_player(self, status: str = 'active') -> str:
+        """Insere um jogador novo (fora do período) e devolve o id"""
+        self.targets_created += 1
+        name = f'Bench Alvo {self.targets_created:05d}'
+        phone = f'11 8{self.targets_created:08d}'
+        now = datetime.utcnow()
+        player_id = f'bench-target-{self.targets_created:08d}'
+        db.session.execute(Player.__table__.insert().values(
+            id=player_id, user_id=self.tenant.user_id, name=name, position='forward', phone=phone,
+            email=None, join_date=date(2024, 1, 1), status=status, monthly_fee=Decimal('100.00'),
+            is_active=status != 'inactive', search_text=build_search_text(name, phone, None), created_at=now, updated_at=now,
+        ))
+        db.session.commit()
+        return player_id
+
+
+@dataclass(frozen=True)
+class Scenario:
+    endpoint: str
+    build: Callable[[BenchContext], tuple]
+    setup: Optional[Callable[[BenchContext], None]] = None
+
+
+def _setup_new_player(ctx: BenchContext) -> None:
+    ctx.target = ctx.new_player()
+
+
+def _setup_inactive_player(ctx: BenchContext) -> None:
+    ctx.target = ctx.new_player(status='inactive')
+
+
+def _future_period(ctx: BenchContext):
+    # Mês seguinte ao último gerado (a API só aceita até o ano que vem)
+    year, month = ctx.period
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _setup_future_period(ctx: BenchContext, months: int = 1) -> None:
+    # Remove os períodos criados na iteração anterior (via ORM, para manter os hooks)
+    year, month = _future_period(ctx)
+    for _ in range(months):
+        period = MonthlyPeriod.query.filter_by(user_id=ctx.tenant.user_id, year=year, month=month).first()
+        if period is not None:
+            db.session.delete(period)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    db.session.commit()
+
+
+# Meses pré-criados pelo cenário de temporada
+SEASON_BENCH_MONTHS = 3
+
+
+SCENARIOS: List[Scenario] = [
+    # ---------- jogadores ----------
+    Scenario('api.get_players', lambda c: ('GET', '/api/players?page=1&per_page=20', None)),
+    Scenario('api.get_player', lambda c: ('GET', f'/api/players/{c.tenant.player_ids[0]}', None)),
+    Scenario('api.get_player_payments', lambda c: (
+        'GET', f'/api/players/{c.tenant.player_ids[0]}/payments', None
+    )),
+    Scenario('api.create_player', lambda c: ('POST', '/api/players', {
+        'name': f'Novo {c.unique("")}', 'phone': f'11 7{c.iteration:08d}', 'position': 'forward'
+    })),
+    Scenario('api.bulk_create_players', lambda c: ('POST', '/api/players/bulk', {'players': [
+        {'name': f'Lote {c.iteration} {i}', 'phone': f'11 6{c.iteration:04d}{i:04d}', 'position': 'defender',
+         'monthly_fee': 100}
+        for i in range(50)
+    ]})),
+    Scenario('api.update_player', lambda c: ('PUT', f'/api/players/{c.tenant.player_ids[1]}', {
+        'name': f'Atualizado {c.unique("")}'
+    })),
+    Scenario('api.deactivate_player', lambda c: ('PATCH', f'/api/players/{c.target}/deactivate', None),
+             setup=_setup_new_player),
+    Scenario('api.activate_player', lambda c: ('PATCH', f'/api/players/{c.target}/activate', None),
+             setup=_setup_inactive_player),
+    Scenario('api.delete_player', lambda c: ('DELETE', f'/api/players/{c.target}', None), setup=_setup_new_player),
+
+    # ---------- pagamentos / períodos ----------
+    Scenario('api.get_monthly_payments', lambda c: ('GET', '/api/monthly-payments?page=1&per_page=12', None)),
+    Scenario('api.create_monthly_payment', lambda c: ('POST', '/api/monthly-payments', dict(
+        zip(('year', 'month'), _future_period(c))
+    )), setup=_setup_future_period),
+    Scenario('api.rollover_monthly_period', lambda c: ('POST', '/api/monthly-periods/rollover', dict(
+        zip(('year', 'month'), _future_period(c)), source_period_id=c.period_id
+    )), setup=_setup_future_period),
+    Scenario('api.create_season_periods', lambda c: ('POST', '/api/monthly-periods/season', {
+        'year': _future_period(c)[0], 'start_month': _future_period(c)[1], 'months': SEASON_BENCH_MONTHS,
+        'source_period_id': c.period_id,
+    }), setup=lambda c: _setup_future_period(c, SEASON_BENCH_MONTHS)),
+    Scenario('api.update_payment', lambda c: (
+        'PUT', f'/api/monthly-payments/{c.tenant.monthly_players[c.period_id][0][0]}/pay', {}
+    )),
+    Scenario('api.get_monthly_periods', lambda c: ('GET', '/api/monthly-periods', None)),
+    Scenario('api.get_monthly_period', lambda c: ('GET', f'/api/monthly-periods/{c.period_id}', None)),
+    Scenario('api.update_monthly_period', lambda c: ('PUT', f'/api/monthly-periods/{c.period_id}', {
+        'status': 'active', 'monthly_fee': 100 + c.iteration % 2 * 10
+    })),
+    Scenario('api.readjust_monthly_periods_fee', lambda c: ('PUT', '/api/monthly-periods/monthly-fee', {
+        'monthly_fee': 100 + c.iteration % 2 * 10, 'from_year': c.tenant.periods[0][0], 'to_year': c.period[0]
+    })),
+    Scenario('api.get_monthly_period_players', lambda c: ('GET', f'/api/monthly-periods/{c.period_id}/players', None)),
+    Scenario('api.add_players_to_monthly_period', lambda c: (
+        'POST', f'/api/monthly-periods/{c.period_id}/players', {'player_ids': [c.target]}
+    ), setup=_setup_new_player),
+    Scenario('api.get_available_players_for_period', lambda c: (
+        'GET', f'/api/monthly-periods/{c.period_id}/available-players', None
+    )),
+    Scenario('api.options_available_players', lambda c: (
+        'OPTIONS', f'/api/monthly-periods/{c.period_id}/available-players', None
+    )),
+    Scenario('api.update_monthly_player_payment_status', lambda c: (
+        'PATCH', f'/api/monthly-periods/{c.period_id}/players/{c.tenant.monthly_players[c.period_id][1][1]}/payment',
+        {'status': ('paid', 'pending')[c.iteration % 2]}
+    )),
+    Scenario('api.bulk_update_monthly_players_payment_status', lambda c: (
+        'PATCH', f'/api/monthly-periods/{c.period_id}/players/payments', {'payments': [
+            {'player_id': player_id, 'status': ('paid', 'pending')[c.iteration % 2]}
+            for _, player_id in c.tenant.monthly_players[c.period_id][:100]
+        ]}
+    )),
+    Scenario('api.update_monthly_player_custom_fee', lambda c: (
+        'PUT', f'/api/monthly-players/{c.tenant.monthly_players[c.period_id][2][0]}/custom-fee',
+        {'custom_monthly_fee': 60 + c.iteration % 2 * 10}
+    )),
+
+    # ---------- avulsos ----------
+    Scenario('api.get_monthly_period_casual_players', lambda c: (
+        'GET', f'/api/monthly-periods/{c.period_id}/casual-players', None
+    )),
+    Scenario('api.add_casual_player_to_monthly_period', lambda c: (
+        'POST', f'/api/monthly-periods/{c.period_id}/casual-players',
+        {'player_name': f'Convidado {c.unique("")}', 'amount': 25, 'invited_by': 'Bench',
+         'play_date': date(*c.period, 10).isoformat()}
+    )),
+    Scenario('api.update_casual_player_payment_status', lambda c: (
+        'PATCH', f'/api/monthly-periods/{c.period_id}/casual-players/{c.tenant.casual_players[c.period_id][0]}/payment',
+        {'status': ('paid', 'pending')[c.iteration % 2]}
+    )),
+
+    # ---------- despesas / fluxo de caixa ----------
+    Scenario('api.get_monthly_period_expenses', lambda c: ('GET', f'/api/monthly-periods/{c.period_id}/expenses', None)),
+    Scenario('api.create_monthly_period_expense', lambda c: (
+        'POST', f'/api/monthly-periods/{c.period_id}/expenses',
+        {'description': f'Despesa {c.unique("")}', 'amount': '42.50', 'category': 'other',
+         'expense_date': date(*c.period, 15).isoformat()}
+    )),
+    Scenario('api.get_cashflow_summary', lambda c: ('GET', '/api/cashflow/summary', None)),
+    Scenario('api.get_cashflow_settings', lambda c: ('GET', '/api/cashflow/settings', None)),
+    Scenario('api.update_cashflow_settings', lambda c: (
+        'PUT', '/api/cashflow/settings', {'initial_balance': 1000 + c.iteration % 2}
+    )),
+
+    # ---------- exportações ----------
+    Scenario('api.export_resource', lambda c: ('GET', '/api/export/monthly-payments?format=csv', None)),
+
+    # ---------- estatísticas ----------
+    Scenario('api.get_player_stats', lambda c: ('GET', '/api/stats/players', None)),
+    Scenario('api.get_payment_stats', lambda c: ('GET', '/api/stats/payments/{}/{}'.format(*c.period), None)),
+    Scenario('api.get_payment_stats_range', lambda c: (
+        'GET', f'/api/stats/payments?from_year={c.tenant.periods[0][0]}&to_year={c.period[0]}', None
+    )),
+    Scenario('api.get_outstanding_debts', lambda c: ('GET', '/api/debts?limit=100', None)),
+]
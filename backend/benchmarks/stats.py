@@ -0,0 +1,23 @@
+"""
+Estatísticas das amostras de latência (benchmark e teste de carga)
+"""
+import math
+import statistics
+from typing import Dict, Iterable, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil nearest-rank: com poucas amostras devolve um valor observado"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def latency_summary(values: List[float], percentiles: Iterable[int] = (95,)) -> Dict[str, float]:
+    """min/mediana/percentis/máx/média em ms (arredondados)"""
+    summary = {'min': min(values), 'median': statistics.median(values)}
+    for pct in percentiles:
+        summary[f'p{pct}'] = percentile(values, pct)
+    summary['max'] = max(values)
+    summary['mean'] = statistics.fmean(values)
+    return {key: round(value, 3) for key, value in summary.items()}
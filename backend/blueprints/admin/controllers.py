@@ -1,13 +1,31 @@
 """
 Blueprint de Administração
 """
-from flask import Blueprint, jsonify
+from functools import wraps
+
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+from ...services.sql_profiler import get_profiler
+
 # Criação do blueprint
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
 
+def operator_required(view):
+    """
+    Restringe a rota aos operadores (OPERATOR_USER_IDS): as estatísticas do
+    processo misturam consultas de todos os usuários
+    """
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if get_jwt_identity() not in current_app.config.get('OPERATOR_USER_IDS', []):
+            return jsonify({'error': 'Acesso restrito a operadores'}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
 @admin_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
 def dashboard():
@@ -48,4 +66,37 @@ def system_health():
         'status': 'healthy',
         'database': 'connected',
         'timestamp': '2024-01-01T00:00:00Z'
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+@admin_bp.route('/sql/slow-queries', methods=['GET'])
+@operator_required
+def slow_queries():
+    """
+    Statements mais lentos observados pelo profiler de SQL deste processo
+
+    Query params: limit (padrão SQL_PROFILER_TOP_N)
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'error': 'Profiler de SQL desabilitado (SQL_PROFILER_ENABLED)'}), 404
+
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        'slow_query_ms': profiler.slow_query_ms,
+        'queries': profiler.slowest(limit)
+    }), 200
+
+
+@admin_bp.route('/sql/slow-queries', methods=['DELETE'])
+@operator_required
+def reset_slow_queries():
+    """
+    Zera as estatísticas do profiler de SQL
+    """
+    profiler = get_profiler()
+    if profiler is None:
+        return jsonify({'error': 'Profiler de SQL desabilitado (SQL_PROFILER_ENABLED)'}), 404
+
+    profiler.reset()
+    return jsonify({'message': 'Estatísticas de SQL zeradas'}), 200
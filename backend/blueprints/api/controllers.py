@@ -1,29 +1,45 @@
 """
 Controladores da API para gerenciamento de jogadores e pagamentos mensais
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, extract, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, case, extract, func, literal, null, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime
+import logging
 import uuid
 
 from ...services.db.connection import db
-from ...services.db.models import Player, MonthlyPeriod, MonthlyPlayer, CasualPlayer, Expense, PaymentStatus, User
+from ...services.db.models import Player, MonthlyPeriod, MonthlyPlayer, CasualPlayer, Expense, PaymentStatus, PlayerStatus, User
 from .schemas import (
     PlayerCreateSchema, PlayerUpdateSchema, PlayerResponseSchema,
-    MonthlyPaymentCreateSchema, MonthlyPaymentResponseSchema,
+    MonthlyPaymentCreateSchema, MonthlyPaymentResponseSchema, MonthlyRolloverSchema, SeasonCreateSchema,
     CasualPlayerCreateSchema, ExpenseCreateSchema
 )
-from .response_utils import APIResponse, ValidationError, handle_api_error
+from .response_utils import APIResponse, ValidationError, handle_api_error, conditional_get
+from .pagination import cursor_requested, keyset_page
+from ...services.cashflow_ledger import ledger_rows
+from ...services.cache import cached_response
+from ...services.tenant_versions import mark_tenant_written
+from ...services.period_totals import aggregate_totals
+from ...services.player_search import apply_search, build_search_text
+from ...services.stats import month_range, payment_stats, player_stats
+from ...services.server_timing import timed
+from ...services.structured_logging import debug_sampled, log_event
+from ...services import delinquency, exports, period_rollover, read_models
+from ...services.read_models import casual_player_dict, expense_dict, period_dict
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+logger = logging.getLogger(__name__)
+
 # ==================== ROTAS DE JOGADORES ====================
 
 @api_bp.route('/players', methods=['GET'])
 @jwt_required()
+@conditional_get
 @handle_api_error
 def get_players():
     """
@@ -45,11 +61,24 @@ def get_players():
     if status:
         query = query.filter(Player.status == status)
     
+    # Busca por nome, telefone ou e-mail (sem acentos, ordenada por relevância)
     if search:
-        query = query.filter(
-            Player.name.ilike(f'%{search}%')
-        )
+        query = apply_search(query, search, ranked=not cursor_requested())
     
+    # Paginação por cursor (opcional): chave (name, id), sem COUNT(*)
+    if cursor_requested():
+        items, pagination = keyset_page(
+            query, [(Player.name, False), (Player.id, False)], per_page,
+            key_of=lambda p: (p.name, p.id)
+        )
+        with timed('dump'):
+            players_data = PlayerResponseSchema(many=True).dump(items)
+        return APIResponse.paginated(
+            data=players_data,
+            pagination=pagination,
+            message=f"{len(items)} jogadores nesta página"
+        )
+
     # Paginação (compatível com Flask-SQLAlchemy 3.x e versões anteriores)
     try:
         # Flask-SQLAlchemy < 3.x
@@ -69,7 +98,8 @@ def get_players():
     
     # Serializar dados
     schema = PlayerResponseSchema(many=True)
-    players_data = schema.dump(players.items)
+    with timed('dump'):
+        players_data = schema.dump(players.items)
     
     # Informações de paginação
     pagination = {
@@ -148,6 +178,182 @@ def create_player():
     )
 
 
+# Limite de linhas por importação e de parâmetros por cláusula IN
+BULK_PLAYERS_MAX_ROWS = 5000
+BULK_LOOKUP_CHUNK = 500
+
+
+def _insert_players_skipping_taken_phones(rows, user_id):
+    """
+    INSERT em lote dos jogadores que ignora telefones cadastrados por outra
+    requisição entre a verificação e o INSERT (``uq_players_user_phone``).
+
+    PostgreSQL/SQLite: ``ON CONFLICT DO NOTHING ... RETURNING id``. Demais
+    bancos: savepoint; na violação, refaz a verificação e insere só os livres.
+
+    Returns:
+        Conjunto com os ids inseridos
+    """
+    table = Player.__table__
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(table).on_conflict_do_nothing(index_elements=['user_id', 'phone']) \
+            .returning(table.c.id)
+        return set(db.session.execute(stmt, rows).scalars())
+
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert(), rows)
+        return {row['id'] for row in rows}
+    except IntegrityError:
+        taken = {
+            phone for (phone,) in db.session.query(Player.phone).filter(
+                Player.user_id == user_id, Player.phone.in_([row['phone'] for row in rows])
+            )
+        }
+        free = [row for row in rows if row['phone'] not in taken]
+        if free:
+            db.session.execute(table.insert(), free)
+        return {row['id'] for row in free}
+
+
+@api_bp.route('/players/bulk', methods=['POST'])
+@jwt_required()
+@handle_api_error
+def bulk_create_players():
+    """
+    Importa jogadores em lote.
+
+    Aceita {"players": [...]} (ou a lista diretamente). As linhas são
+    validadas com ``PlayerCreateSchema(many=True)``, os telefones já
+    cadastrados são buscados em uma única consulta e os jogadores válidos
+    são inseridos com um único INSERT em lote, na mesma transação.
+    Retorna o resultado de cada linha pelo índice de entrada.
+    """
+    data = request.json
+    rows = data.get('players') if isinstance(data, dict) else data
+
+    if not isinstance(rows, list) or not rows:
+        raise ValidationError("Dados não fornecidos", {'players': ['Informe uma lista de jogadores']})
+    if len(rows) > BULK_PLAYERS_MAX_ROWS:
+        raise ValidationError(
+            f"Máximo de {BULK_PLAYERS_MAX_ROWS} jogadores por importação",
+            {'players': [f'Recebidos {len(rows)} jogadores']}
+        )
+
+    current_user_id = str(get_jwt_identity())
+    valid_statuses = {s.value for s in PlayerStatus}
+
+    # Normalização: e-mail vazio vira nulo (o formulário envia "")
+    normalized = []
+    for row in rows:
+        if isinstance(row, dict):
+            row = dict(row)
+            if isinstance(row.get('email'), str) and not row['email'].strip():
+                row['email'] = None
+        normalized.append(row)
+
+    schema_errors = PlayerCreateSchema(many=True).validate(normalized)
+    loaded = {}
+    results = [None] * len(normalized)
+
+    for index, row in enumerate(normalized):
+        errors = dict(schema_errors.get(index, {}))
+        if not isinstance(row, dict):
+            results[index] = {'index': index, 'status': 'error', 'errors': {'_schema': ['Linha inválida']}}
+            continue
+        phone = (row.get('phone') or '').strip()
+        if not phone:
+            errors.setdefault('phone', []).append('Telefone é obrigatório')
+        status = row.get('status') or PlayerStatus.ACTIVE.value
+        if 'status' not in errors and status not in valid_statuses:
+            errors['status'] = [f"Status deve ser um dos: {sorted(valid_statuses)}"]
+        if errors:
+            results[index] = {'index': index, 'status': 'error', 'errors': errors}
+            continue
+        loaded[index] = {
+            'name': row['name'].strip(),
+            'position': row['position'],
+            'phone': phone,
+            'email': row['email'].strip().lower() if row.get('email') else None,
+            'monthly_fee': row['monthly_fee'],
+            'status': status,
+        }
+
+    # Telefones repetidos no próprio lote: a primeira ocorrência prevalece
+    seen_phones = {}
+    for index in list(loaded):
+        phone = loaded[index]['phone']
+        if phone in seen_phones:
+            results[index] = {
+                'index': index, 'status': 'duplicate',
+                'errors': {'phone': [f'Telefone repetido na linha {seen_phones[phone]}']}
+            }
+            del loaded[index]
+        else:
+            seen_phones[phone] = index
+
+    # Telefones já cadastrados: uma consulta (em blocos para o limite de parâmetros)
+    phones = list(seen_phones)
+    existing_phones = set()
+    for start in range(0, len(phones), BULK_LOOKUP_CHUNK):
+        chunk = phones[start:start + BULK_LOOKUP_CHUNK]
+        existing_phones.update(
+            phone for (phone,) in db.session.query(Player.phone).filter(
+                Player.user_id == current_user_id, Player.phone.in_(chunk)
+            )
+        )
+
+    now = datetime.utcnow()
+    today = now.date()
+    to_insert = []
+    for index, values in loaded.items():
+        if values['phone'] in existing_phones:
+            results[index] = {
+                'index': index, 'status': 'duplicate',
+                'errors': {'phone': ['Telefone já cadastrado']}
+            }
+            continue
+        player_id = str(uuid.uuid4())
+        to_insert.append({
+            'id': player_id,
+            'user_id': current_user_id,
+            'join_date': today,
+            'is_active': True,
+            'search_text': build_search_text(values['name'], values['phone'], values['email']),
+            'created_at': now,
+            'updated_at': now,
+            **values,
+        })
+        results[index] = {'index': index, 'status': 'created', 'id': player_id}
+
+    created = 0
+    if to_insert:
+        inserted = _insert_players_skipping_taken_phones(to_insert, current_user_id)
+        for result in results:
+            if result['status'] == 'created' and result['id'] not in inserted:
+                # Telefone cadastrado em paralelo por outra importação
+                result.pop('id')
+                result.update(status='duplicate', errors={'phone': ['Telefone já cadastrado']})
+        created = len(inserted)
+        if created:
+            mark_tenant_written(db.session, current_user_id)
+        db.session.commit()
+
+    summary = {
+        'created': created,
+        'duplicates': sum(1 for r in results if r['status'] == 'duplicate'),
+        'errors': sum(1 for r in results if r['status'] == 'error'),
+        'results': results,
+    }
+    return APIResponse.success(
+        data=summary,
+        message=f"{created} jogador(es) importado(s)",
+        status_code=201 if created else 200
+    )
+
+
 @api_bp.route('/players/<player_id>', methods=['GET'])
 @jwt_required()
 @handle_api_error
@@ -312,8 +518,76 @@ def delete_player(player_id):
 
 # ==================== ROTAS DE PAGAMENTOS MENSAIS ====================
 
+def _fetch_period_players_batch(period_ids, user_id, player_id=None, status=None):
+    """
+    Busca jogadores mensais e avulsos de vários períodos de uma só vez.
+
+    Executa uma consulta IN (...) por tabela (mais uma para os jogadores
+    referenciados pelo schema de resposta) e agrupa o resultado em memória
+    por monthly_period_id, preservando a ordem retornada pelo banco.
+
+    Returns:
+        Tuple (monthly_by_period, casual_by_period) com listas por período
+    """
+    monthly_by_period = {}
+    casual_by_period = {}
+    if not period_ids:
+        return monthly_by_period, casual_by_period
+
+    mp_query = db.session.query(MonthlyPlayer).options(
+        selectinload(MonthlyPlayer.player)
+    ).filter(
+        and_(MonthlyPlayer.monthly_period_id.in_(period_ids), MonthlyPlayer.user_id == user_id)
+    )
+    if player_id:
+        mp_query = mp_query.filter(MonthlyPlayer.player_id == player_id)
+    if status:
+        mp_query = mp_query.filter(MonthlyPlayer.status == status)
+
+    for mp in mp_query.all():
+        monthly_by_period.setdefault(mp.monthly_period_id, []).append(mp)
+
+    for cp in read_models.list_casual_players(user_id, *period_ids):
+        casual_by_period.setdefault(cp.monthly_period_id, []).append(cp)
+
+    return monthly_by_period, casual_by_period
+
+
+PLAYER_HISTORY_DEFAULT_PER_PAGE = 24
+
+
+@api_bp.route('/players/<player_id>/payments', methods=['GET'])
+@jwt_required()
+@conditional_get
+@handle_api_error
+def get_player_payments(player_id):
+    """
+    Histórico de pagamentos do jogador em todos os períodos: mensalidades e
+    jogos avulsos, do mês mais recente para o mais antigo.
+
+    Sempre paginado por cursor (``?cursor=`` do ``next_cursor`` anterior) com
+    ``per_page`` (padrão 24, máx. 100); cada página é uma única consulta.
+    """
+    current_user_id = str(get_jwt_identity())
+    per_page = min(max(request.args.get('per_page', PLAYER_HISTORY_DEFAULT_PER_PAGE, type=int), 1), 100)
+    if not read_models.player_exists(current_user_id, player_id):
+        return APIResponse.error('Jogador não encontrado', status_code=404)
+
+    query, history = read_models.player_history_query(current_user_id, player_id)
+    items, pagination = keyset_page(
+        query, [(history.c[key], True) for key in read_models.HISTORY_KEYS], per_page,
+        key_of=lambda row: tuple(getattr(row, key) for key in read_models.HISTORY_KEYS)
+    )
+    return APIResponse.paginated(
+        data=[read_models.history_entry_dict(row) for row in items],
+        pagination=pagination,
+        message=f"{len(items)} registros nesta página"
+    )
+
+
 @api_bp.route('/monthly-payments', methods=['GET'])
 @jwt_required()
+@cached_response()
 @handle_api_error
 def get_monthly_payments():
     """
@@ -337,75 +611,52 @@ def get_monthly_payments():
     if month:
         period_query = period_query.filter(MonthlyPeriod.month == month)
 
-    period_query = period_query.order_by(MonthlyPeriod.year.desc(), MonthlyPeriod.month.desc())
-    periods_paginated = period_query.paginate(page=page, per_page=per_page, error_out=False)
-
-    aggregated = []
-    for period in periods_paginated.items:
-        # Jogadores mensais do período (aplicar filtros opcionais)
-        mp_query = db.session.query(MonthlyPlayer).filter(
-            and_(MonthlyPlayer.monthly_period_id == period.id, MonthlyPlayer.user_id == current_user_id)
+    if cursor_requested():
+        # Paginação por cursor (opcional): chave (year, month, id) decrescente, sem COUNT(*)
+        periods, pagination = keyset_page(
+            period_query,
+            [(MonthlyPeriod.year, True), (MonthlyPeriod.month, True), (MonthlyPeriod.id, True)],
+            per_page,
+            key_of=lambda p: (p.year, p.month, p.id)
         )
-        if player_id:
-            mp_query = mp_query.filter(MonthlyPlayer.player_id == player_id)
-        if status:
-            mp_query = mp_query.filter(MonthlyPlayer.status == status)
+        message = f"{len(periods)} períodos nesta página"
+    else:
+        period_query = period_query.order_by(MonthlyPeriod.year.desc(), MonthlyPeriod.month.desc())
+        periods_paginated = period_query.paginate(page=page, per_page=per_page, error_out=False)
+        periods = periods_paginated.items
+        pagination = {
+            'page': periods_paginated.page,
+            'pages': periods_paginated.pages,
+            'per_page': periods_paginated.per_page,
+            'total': periods_paginated.total,
+            'has_next': periods_paginated.has_next,
+            'has_prev': periods_paginated.has_prev
+        }
+        message = f"Encontrados {periods_paginated.total} períodos"
 
-        monthly_players = mp_query.all()
+    # Busca em lote: uma consulta IN (...) por tabela para todos os períodos da página
+    period_ids = [period.id for period in periods]
+    monthly_by_period, casual_by_period = _fetch_period_players_batch(
+        period_ids, current_user_id, player_id=player_id, status=status
+    )
 
+    aggregated = []
+    mp_schema = MonthlyPaymentResponseSchema(many=True)
+    for period in periods:
         # Serializar jogadores mensais
-        mp_schema = MonthlyPaymentResponseSchema(many=True)
-        monthly_players_data = mp_schema.dump(monthly_players)
-
-        # Jogadores avulsos do período
-        casual_players = db.session.query(CasualPlayer).filter(
-            and_(CasualPlayer.monthly_period_id == period.id, CasualPlayer.user_id == current_user_id)
-        ).all()
-        casual_players_data = []
-        for cp in casual_players:
-            casual_players_data.append({
-                'id': cp.id,
-                'monthly_period_id': cp.monthly_period_id,
-                'player_name': cp.player_name,
-                'play_date': cp.play_date.isoformat() if cp.play_date else None,
-                'invited_by': getattr(cp, 'invited_by', None),
-                'amount': float(cp.amount) if cp.amount is not None else None,
-                'status': getattr(cp, 'status', None),
-                'payment_date': getattr(cp, 'payment_date', None).isoformat() if getattr(cp, 'payment_date', None) else None,
-                'created_at': cp.created_at.isoformat() if cp.created_at else None,
-                'updated_at': getattr(cp, 'updated_at', None).isoformat() if getattr(cp, 'updated_at', None) else None
-            })
+        with timed('dump'):
+            monthly_players_data = mp_schema.dump(monthly_by_period.get(period.id, []))
 
         aggregated.append({
-            'period': {
-                'id': period.id,
-                'month': period.month,
-                'year': period.year,
-                'name': period.name,
-                'is_active': getattr(period, 'is_active', True),
-                'total_expected': float(getattr(period, 'total_expected', 0) or 0),
-                'total_received': float(getattr(period, 'total_received', 0) or 0),
-                'players_count': getattr(period, 'players_count', None),
-                'created_at': period.created_at.isoformat() if getattr(period, 'created_at', None) else None,
-                'updated_at': getattr(period, 'updated_at', None).isoformat() if getattr(period, 'updated_at', None) else None
-            },
+            'period': period_dict(period),
             'monthly_players': monthly_players_data,
-            'casual_players': casual_players_data
+            'casual_players': [casual_player_dict(cp) for cp in casual_by_period.get(period.id, [])]
         })
 
-    pagination = {
-        'page': periods_paginated.page,
-        'pages': periods_paginated.pages,
-        'per_page': periods_paginated.per_page,
-        'total': periods_paginated.total,
-        'has_next': periods_paginated.has_next,
-        'has_prev': periods_paginated.has_prev
-    }
-
     return APIResponse.paginated(
         data=aggregated,
         pagination=pagination,
-        message=f"Encontrados {periods_paginated.total} períodos"
+        message=message
     )
 
 
@@ -439,21 +690,9 @@ def update_monthly_player_custom_fee(monthly_player_id):
     except (ValueError, TypeError):
         raise ValidationError("Taxa customizada deve ser um número válido")
     
-    # Atualizar taxa customizada
+    # Atualizar taxa customizada (totais do período ajustados no flush)
     monthly_player.custom_monthly_fee = custom_fee
     
-    # Recalcular totais do período
-    period = monthly_player.monthly_period
-    total_expected = db.session.query(
-        db.func.sum(
-            db.func.coalesce(MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.monthly_fee)
-        )
-    ).filter(
-        and_(MonthlyPlayer.monthly_period_id == period.id, MonthlyPlayer.user_id == current_user_id)
-    ).scalar() or 0
-    
-    period.total_expected = total_expected
-    
     db.session.commit()
     
     # Serializar resposta
@@ -541,7 +780,7 @@ def update_payment(payment_id):
         data = request.json
         payment_date = data.get('payment_date')
         
-        # Atualizar pagamento
+        # Atualizar pagamento (total recebido do período ajustado no flush)
         payment.status = 'paid'
         
         if payment_date:
@@ -549,25 +788,6 @@ def update_payment(payment_id):
         else:
             payment.payment_date = datetime.utcnow()
         
-        # Atualizar total recebido do período (escopo por usuário)
-        period = MonthlyPeriod.query.filter(
-            and_(MonthlyPeriod.id == payment.monthly_period_id, MonthlyPeriod.user_id == current_user_id)
-        ).first()
-        if not period:
-            return jsonify({'error': 'Período não encontrado'}), 404
-
-        period.total_received = db.session.query(
-            db.func.sum(
-                db.func.coalesce(MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.monthly_fee)
-            )
-        ).filter(
-            and_(
-                MonthlyPlayer.monthly_period_id == period.id,
-                MonthlyPlayer.user_id == current_user_id,
-                MonthlyPlayer.status == 'paid'
-            )
-        ).scalar() or 0
-        
         db.session.commit()
         
         # Retornar pagamento atualizado
@@ -583,41 +803,20 @@ def update_payment(payment_id):
 
 @api_bp.route('/stats/players', methods=['GET'])
 @jwt_required()
+@cached_response()
 def get_player_stats():
     """
-    Retorna estatísticas dos jogadores
+    Retorna estatísticas dos jogadores (por status e por posição)
+
+    Query params: position (opcional) restringe a uma posição
     """
     try:
         # Escopo por usuário autenticado
         current_user_id = str(get_jwt_identity())
 
-        # Contagens por status restritas ao usuário
-        active_count = Player.query.filter(
-            and_(Player.user_id == current_user_id, Player.status == 'active')
-        ).count()
-
-        inactive_count = Player.query.filter(
-            and_(Player.user_id == current_user_id, Player.status == 'inactive')
-        ).count()
-
-        pending_count = Player.query.filter(
-            and_(Player.user_id == current_user_id, Player.status == 'pending')
-        ).count()
-
-        delayed_count = Player.query.filter(
-            and_(Player.user_id == current_user_id, Player.status == 'delayed')
-        ).count()
-
-        total_count = Player.query.filter(Player.user_id == current_user_id).count()
+        # Uma única consulta: contagens por status e por posição
+        stats = player_stats(current_user_id, position=request.args.get('position') or None)
 
-        stats = {
-            'active': active_count,
-            'inactive': inactive_count,
-            'pending': pending_count,
-            'delayed': delayed_count,
-            'total': total_count
-        }
-        
         return jsonify(stats), 200
         
     except Exception as e:
@@ -626,6 +825,7 @@ def get_player_stats():
 
 @api_bp.route('/stats/payments/<int:year>/<int:month>', methods=['GET'])
 @jwt_required()
+@cached_response()
 def get_payment_stats(year, month):
     """
     Retorna estatísticas de pagamentos para um mês específico
@@ -634,43 +834,70 @@ def get_payment_stats(year, month):
         # Escopo por usuário autenticado
         current_user_id = str(get_jwt_identity())
 
-        # Buscar período do usuário
-        period = MonthlyPeriod.query.filter(
-            and_(
-                MonthlyPeriod.year == year,
-                MonthlyPeriod.month == month,
-                MonthlyPeriod.user_id == current_user_id
-            )
-        ).first()
-        
-        if not period:
+        # Período e contagens por status em uma única consulta
+        rows = payment_stats(current_user_id, MonthlyPeriod.year == year, MonthlyPeriod.month == month)
+        if not rows:
             return jsonify({'error': 'Período não encontrado'}), 404
-        
-        # Calcular estatísticas restritas ao usuário
-        payments = MonthlyPlayer.query.filter(
-            and_(MonthlyPlayer.monthly_period_id == period.id, MonthlyPlayer.user_id == current_user_id)
-        ).all()
-        
-        stats = {
-            'total_players': len(payments),
-            'paid': len([p for p in payments if p.status == 'paid']),
-            'partial': len([p for p in payments if p.status == 'partial']),
-            'pending': len([p for p in payments if p.status == 'pending']),
-            'total_expected': period.total_expected,
-            'total_received': period.total_received,
-            'collection_rate': (period.total_received / period.total_expected * 100) if period.total_expected > 0 else 0
-        }
-        
+        stats = rows[0]
+
         return jsonify(stats), 200
         
     except Exception as e:
         return jsonify({'error': f'Erro ao buscar estatísticas de pagamento: {str(e)}'}), 500
 
 
+@api_bp.route('/stats/payments', methods=['GET'])
+@jwt_required()
+@cached_response()
+@handle_api_error
+def get_payment_stats_range():
+    """
+    Estatísticas de pagamento de todos os períodos de um intervalo, em uma
+    única consulta (evita uma requisição por mês nos painéis anuais).
+
+    Query params: from_year, from_month (padrão 1), to_year, to_month (padrão 12)
+    """
+    current_user_id = str(get_jwt_identity())
+    start, end = _parse_month_range(request.args)
+    return APIResponse.success(data=payment_stats(current_user_id, month_range(start, end)))
+
+
+DEBTS_MAX_LIMIT = 500
+
+
+@api_bp.route('/debts', methods=['GET'])
+@jwt_required()
+@cached_response()
+@handle_api_error
+def get_outstanding_debts():
+    """
+    Devedores: meses em aberto, meses consecutivos em aberto e valor devido
+    por jogador, somando todos os períodos (maior débito primeiro).
+
+    Query params: min_months (mínimo de meses consecutivos em aberto, padrão 0)
+    e limit (máx. 500)
+    """
+    current_user_id = str(get_jwt_identity())
+    min_months = request.args.get('min_months', default=0, type=int)
+    limit = request.args.get('limit', type=int)
+    if min_months < 0:
+        raise ValidationError("Parâmetro inválido", {'min_months': ['Deve ser maior ou igual a zero']})
+    if limit is not None and not 1 <= limit <= DEBTS_MAX_LIMIT:
+        raise ValidationError("Parâmetro inválido", {'limit': [f'Deve estar entre 1 e {DEBTS_MAX_LIMIT}']})
+
+    rows = delinquency.outstanding_debts(current_user_id, min_consecutive=min_months, limit=limit)
+    return APIResponse.success(data={
+        'players': [delinquency.debt_dict(row) for row in rows],
+        'debtors': len(rows),
+        'total_outstanding': float(sum((row.outstanding_amount or 0 for row in rows), 0)),
+    })
+
+
 # ==================== MONTHLY PERIODS ROUTES ====================
 
 @api_bp.route('/monthly-periods', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_monthly_periods():
     """
     Lista todos os períodos mensais
@@ -682,28 +909,8 @@ def get_monthly_periods():
         year = request.args.get('year', type=int)
         month = request.args.get('month', type=int)
 
-        query = MonthlyPeriod.query.filter(MonthlyPeriod.user_id == current_user_id)
-        if year:
-            query = query.filter(MonthlyPeriod.year == year)
-        if month:
-            query = query.filter(MonthlyPeriod.month == month)
-
-        periods = query.order_by(MonthlyPeriod.year.desc(), MonthlyPeriod.month.desc()).all()
-        
-        result = []
-        for period in periods:
-            result.append({
-                'id': period.id,
-                'month': period.month,
-                'year': period.year,
-                'name': period.name,
-                'is_active': period.is_active,
-                'total_expected': float(period.total_expected),
-                'total_received': float(period.total_received),
-                'players_count': period.players_count,
-                'created_at': period.created_at.isoformat(),
-                'updated_at': period.updated_at.isoformat()
-            })
+        periods = read_models.list_periods(current_user_id, year=year, month=month)
+        result = [period_dict(period) for period in periods]
         
         return jsonify(result), 200
         
@@ -719,25 +926,12 @@ def get_monthly_period(period_id):
     """
     try:
         current_user_id = str(get_jwt_identity())
-        period = MonthlyPeriod.query.filter(
-            and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
-        ).first()
+        period = read_models.get_period(current_user_id, period_id)
         
         if not period:
             return jsonify({'error': 'Período não encontrado'}), 404
         
-        result = {
-            'id': period.id,
-            'month': period.month,
-            'year': period.year,
-            'name': period.name,
-            'is_active': period.is_active,
-            'total_expected': float(period.total_expected),
-            'total_received': float(period.total_received),
-            'players_count': period.players_count,
-            'created_at': period.created_at.isoformat(),
-            'updated_at': period.updated_at.isoformat()
-        }
+        result = period_dict(period)
         
         return jsonify(result), 200
         
@@ -745,12 +939,78 @@ def get_monthly_period(period_id):
         return jsonify({'error': f'Erro ao buscar período: {str(e)}'}), 500
 
 
+def _parse_monthly_fee(value):
+    """Converte e valida a nova mensalidade padrão (None se inválida)"""
+    try:
+        fee = float(value)
+    except (ValueError, TypeError):
+        return None
+    return fee if fee > 0 else None
+
+
+def _parse_month_range(source):
+    """
+    Lê from_year/from_month/to_year/to_month (meses opcionais: 1 e 12).
+
+    Raises:
+        ValidationError: Se o intervalo estiver ausente ou for inválido
+    """
+    if 'from_year' not in source or 'to_year' not in source:
+        raise ValidationError("Intervalo inválido", {'range': ['Informe from_year e to_year']})
+    try:
+        start = (int(source['from_year']), int(source.get('from_month', 1)))
+        end = (int(source['to_year']), int(source.get('to_month', 12)))
+    except (ValueError, TypeError):
+        raise ValidationError("Intervalo inválido", {'range': ['Ano e mês devem ser números inteiros']})
+    if start > end or not (1 <= start[1] <= 12 and 1 <= end[1] <= 12):
+        raise ValidationError("Intervalo inválido", {'range': ['Início deve ser anterior ao fim']})
+    return start, end
+
+
+def _readjust_monthly_fees(periods, user_id, new_monthly_fee):
+    """
+    Reajusta a mensalidade padrão dos períodos informados.
+
+    Um único UPDATE altera os jogadores sem mensalidade customizada e uma
+    única agregação recalcula previsto/recebido de todos os períodos. Não faz
+    commit: as alterações nos períodos disparam os hooks de flush (ledger e
+    versão do tenant) na transação do chamador.
+
+    Returns:
+        Quantidade de jogadores mensais atualizados
+    """
+    period_ids = [p.id for p in periods]
+    if not period_ids:
+        return 0
+    now = datetime.utcnow()
+
+    result = db.session.execute(
+        update(MonthlyPlayer)
+        .where(and_(
+            MonthlyPlayer.monthly_period_id.in_(period_ids),
+            MonthlyPlayer.user_id == user_id,
+            MonthlyPlayer.custom_monthly_fee.is_(None)
+        ))
+        .values(monthly_fee=new_monthly_fee, updated_at=now)
+    )
+
+    # UPDATE via Core não passa pelo hook de totais: recalcula os períodos
+    totals = aggregate_totals(period_ids, user_id)
+    for period in periods:
+        expected, received, _ = totals.get(period.id, (0, 0, 0))
+        period.total_expected = expected
+        period.total_received = received
+        period.updated_at = now
+
+    return result.rowcount
+
+
 @api_bp.route('/monthly-periods/<period_id>', methods=['PUT'])
 @jwt_required()
 @handle_api_error
 def update_monthly_period(period_id):
     """
-    Atualiza um período mensal (reajuste de mensalidade em massa)
+    Atualiza um período mensal (reajuste de mensalidade em massa e/ou status)
     """
     try:
         current_user_id = str(get_jwt_identity())
@@ -767,92 +1027,34 @@ def update_monthly_period(period_id):
         data = request.json
         if not data:
             return jsonify({'error': 'Dados não fornecidos'}), 400
-        
-        # Atualizar mensalidade padrão se fornecida
-        if 'monthly_fee' in data:
-            try:
-                new_monthly_fee = float(data['monthly_fee'])
-                if new_monthly_fee <= 0:
-                    return jsonify({'error': 'Mensalidade deve ser maior que zero'}), 400
-                
-                # Atualizar todos os jogadores mensais do período com a nova mensalidade
-                monthly_players = MonthlyPlayer.query.filter(
-                    and_(
-                        MonthlyPlayer.monthly_period_id == period_id,
-                        MonthlyPlayer.user_id == current_user_id
-                    )
-                ).all()
-                
-                updated_count = 0
-                for mp in monthly_players:
-                    # Só atualizar se não tiver mensalidade customizada
-                    if mp.custom_monthly_fee is None:
-                        mp.monthly_fee = new_monthly_fee
-                        updated_count += 1
-                
-                db.session.commit()
-                
-                # Recalcular totais do período
-                period.total_expected = sum(mp.effective_monthly_fee for mp in monthly_players)
-                period.total_received = sum(mp.effective_monthly_fee for mp in monthly_players if mp.status == 'paid')
-                period.updated_at = datetime.utcnow()
-                
-                db.session.commit()
-                
-                # Retornar período atualizado
-                result = {
-                    'id': period.id,
-                    'month': period.month,
-                    'year': period.year,
-                    'name': period.name,
-                    'is_active': period.is_active,
-                    'total_expected': float(period.total_expected),
-                    'total_received': float(period.total_received),
-                    'players_count': period.players_count,
-                    'created_at': period.created_at.isoformat(),
-                    'updated_at': period.updated_at.isoformat()
-                }
-                
-                return jsonify({
-                    'success': True,
-                    'message': f'Mensalidade reajustada para R$ {new_monthly_fee:.2f}. {updated_count} jogadores atualizados.',
-                    'data': result
-                }), 200
-                
-            except (ValueError, TypeError):
-                return jsonify({'error': 'Valor de mensalidade inválido'}), 400
-        
+
+        if 'monthly_fee' not in data and 'status' not in data:
+            return jsonify({'error': 'Nenhum campo válido para atualização fornecido'}), 400
+
+        message = 'Período atualizado com sucesso'
+
         # Atualizar status se fornecido
         if 'status' in data:
-            if data['status'] in ['active', 'closed']:
-                period.is_active = (data['status'] == 'active')
-                period.updated_at = datetime.utcnow()
-                db.session.commit()
-            else:
+            if data['status'] not in ['active', 'closed']:
                 return jsonify({'error': 'Status inválido. Use "active" ou "closed"'}), 400
-        
-        # Se chegou até aqui sem fazer nenhuma atualização
-        if 'monthly_fee' not in data and 'status' not in data:
-            return jsonify({'error': 'Nenhum campo válido para atualização fornecido'}), 400
-        
-        # Retornar período atualizado
-        result = {
-            'id': period.id,
-            'month': period.month,
-            'year': period.year,
-            'name': period.name,
-            'is_active': period.is_active,
-            'total_expected': float(period.total_expected),
-            'total_received': float(period.total_received),
-            'players_count': period.players_count,
-            'created_at': period.created_at.isoformat(),
-            'updated_at': period.updated_at.isoformat()
-        }
+            period.is_active = (data['status'] == 'active')
+            period.updated_at = datetime.utcnow()
+
+        # Reajustar mensalidade padrão se fornecida
+        if 'monthly_fee' in data:
+            new_monthly_fee = _parse_monthly_fee(data['monthly_fee'])
+            if new_monthly_fee is None:
+                return jsonify({'error': 'Mensalidade deve ser um número maior que zero'}), 400
+
+            updated_count = _readjust_monthly_fees([period], current_user_id, new_monthly_fee)
+            message = f'Mensalidade reajustada para R$ {new_monthly_fee:.2f}. {updated_count} jogadores atualizados.'
+
+        db.session.commit()
         
         return jsonify({
             'success': True,
-            'message': 'Período atualizado com sucesso',
-            'data': result
+            'message': message,
+            'data': period_dict(period)
         }), 200
         
     except Exception as e:
@@ -860,12 +1062,166 @@ def update_monthly_period(period_id):
         return jsonify({'error': f'Erro ao atualizar período: {str(e)}'}), 500
 
 
+@api_bp.route('/monthly-periods/monthly-fee', methods=['PUT'])
+@jwt_required()
+@handle_api_error
+def readjust_monthly_periods_fee():
+    """
+    Reajusta a mensalidade padrão de vários períodos em uma única transação.
+
+    Body: {"monthly_fee": 120, "period_ids": [...]} ou
+    {"monthly_fee": 120, "from_year": 2024, "from_month": 3, "to_year": 2024, "to_month": 12}
+    (meses opcionais: padrão 1 e 12).
+    """
+    data = request.json
+    if not data:
+        raise ValidationError("Dados não fornecidos")
+
+    new_monthly_fee = _parse_monthly_fee(data.get('monthly_fee'))
+    if new_monthly_fee is None:
+        raise ValidationError("Mensalidade inválida", {'monthly_fee': ['Informe um número maior que zero']})
+
+    current_user_id = str(get_jwt_identity())
+    query = MonthlyPeriod.query.filter(MonthlyPeriod.user_id == current_user_id)
+
+    period_ids = data.get('period_ids')
+    if period_ids is not None:
+        if not isinstance(period_ids, list) or not period_ids:
+            raise ValidationError("Lista de períodos inválida", {'period_ids': ['Informe ao menos um período']})
+        query = query.filter(MonthlyPeriod.id.in_([str(pid) for pid in period_ids]))
+    elif 'from_year' in data and 'to_year' in data:
+        start, end = _parse_month_range(data)
+        query = query.filter(month_range(start, end))
+    else:
+        raise ValidationError(
+            "Informe os períodos",
+            {'period_ids': ['Informe period_ids ou from_year/to_year']}
+        )
+
+    periods = query.order_by(MonthlyPeriod.year.asc(), MonthlyPeriod.month.asc()).all()
+    if period_ids is not None and len(periods) != len(set(map(str, period_ids))):
+        raise ValidationError("Período não encontrado", {'period_ids': ['Um ou mais períodos não existem']})
+
+    updated_count = _readjust_monthly_fees(periods, current_user_id, new_monthly_fee)
+    db.session.commit()
+
+    return APIResponse.success(
+        data={
+            'updated_players': updated_count,
+            'periods': [period_dict(p) for p in periods]
+        },
+        message=(
+            f"Mensalidade reajustada para R$ {new_monthly_fee:.2f} em {len(periods)} períodos. "
+            f"{updated_count} jogadores atualizados."
+        )
+    )
+
+
+def _rollover_source(user_id, source_period_id, before):
+    """Período de origem do elenco: o informado ou o último antes de ``before`` (pode não haver)"""
+    if source_period_id:
+        source = MonthlyPeriod.query.filter(
+            and_(MonthlyPeriod.id == source_period_id, MonthlyPeriod.user_id == user_id)
+        ).first()
+        if not source:
+            raise ValidationError('Período de origem não encontrado', {'source_period_id': ['Período não encontrado']})
+        return source
+    return period_rollover.latest_period(user_id, before=before)
+
+
+@api_bp.route('/monthly-periods/rollover', methods=['POST'])
+@jwt_required()
+@handle_api_error
+def rollover_monthly_period():
+    """
+    Abre um mês copiando o elenco do período anterior (INSERT ... SELECT).
+
+    Body (opcional): {"year": 2025, "month": 3, "source_period_id": "...", "carry_custom_fee": false}
+    Sem year/month abre o mês seguinte ao último período do usuário (ou o mês
+    corrente, se não houver nenhum). Sem source_period_id copia do último
+    período anterior ao mês aberto.
+    """
+    data = MonthlyRolloverSchema().load(request.get_json(silent=True) or {})
+    current_user_id = str(get_jwt_identity())
+
+    if 'year' in data:
+        target = (data['year'], data['month'])
+    else:
+        latest = period_rollover.latest_period(current_user_id)
+        now = datetime.now()
+        target = period_rollover.next_month(latest.year, latest.month) if latest else (now.year, now.month)
+
+    source = _rollover_source(current_user_id, data.get('source_period_id'), before=target)
+    result = period_rollover.open_periods(
+        current_user_id, [target],
+        source_period_id=source.id if source else None,
+        carry_custom_fee=data['carry_custom_fee'],
+    )
+    if result['skipped']:
+        raise ValidationError('Já existe um período para este mês/ano')
+    db.session.commit()
+
+    period = result['periods'][0]
+    return APIResponse.success(
+        data={
+            'period': period_dict(period),
+            'source_period_id': source.id if source else None,
+            'copied_players': result['copied'],
+        },
+        message=f"Período {period.name} aberto com {result['copied']} jogadores",
+        status_code=201
+    )
+
+
+@api_bp.route('/monthly-periods/season', methods=['POST'])
+@jwt_required()
+@handle_api_error
+def create_season_periods():
+    """
+    Pré-cria os períodos de uma temporada, todos com o mesmo elenco.
+
+    Body: {"year": 2025, "start_month": 8, "months": 10, "source_period_id": "...", "carry_custom_fee": false}
+    start_month e months seguem SEASON_START_MONTH/SEASON_END_MONTH por padrão.
+    Meses que já existem são mantidos como estão (``skipped``).
+    """
+    data = SeasonCreateSchema().load(request.get_json(silent=True) or {})
+    current_user_id = str(get_jwt_identity())
+
+    start_month = data.get('start_month') or current_app.config.get('SEASON_START_MONTH', 8)
+    end_month = current_app.config.get('SEASON_END_MONTH', 5)
+    months = data.get('months') or (end_month - start_month) % 12 + 1
+    season = period_rollover.season_months(data['year'], start_month, months)
+
+    source = _rollover_source(current_user_id, data.get('source_period_id'), before=season[0])
+    result = period_rollover.open_periods(
+        current_user_id, season,
+        source_period_id=source.id if source else None,
+        carry_custom_fee=data['carry_custom_fee'],
+    )
+    db.session.commit()
+
+    return APIResponse.success(
+        data={
+            'periods': [period_dict(p) for p in result['periods']],
+            'skipped': [f"{month:02d}/{year}" for year, month in result['skipped']],
+            'source_period_id': source.id if source else None,
+            'copied_players': result['copied'],
+        },
+        message=f"{len(result['periods'])} períodos criados",
+        status_code=201 if result['periods'] else 200
+    )
+
+
 @api_bp.route('/monthly-periods/<period_id>/players', methods=['POST'])
 @jwt_required()
 @handle_api_error
 def add_players_to_monthly_period(period_id):
     """
-    Adiciona jogadores selecionados a um período mensal
+    Adiciona jogadores a um período mensal
+
+    Aceita ``{"player_ids": [...]}`` ou ``{"all_active": true}`` (todos os
+    jogadores ativos). A inclusão é um único INSERT ... SELECT; jogadores que
+    já estão no período são ignorados e contados em ``skipped_players``.
     """
     try:
         # Verificar se o período existe e pertence ao usuário
@@ -878,69 +1234,37 @@ def add_players_to_monthly_period(period_id):
         
         # Validar dados de entrada
         data = request.json
-        if not data or 'player_ids' not in data:
-            raise ValidationError('Lista de player_ids é obrigatória')
-        
-        player_ids = data['player_ids']
-        if not isinstance(player_ids, list) or len(player_ids) == 0:
-            raise ValidationError('Lista de player_ids deve conter pelo menos um ID')
-        
-        # Buscar jogadores válidos do usuário
-        players = Player.query.filter(
-            and_(Player.id.in_(player_ids), Player.user_id == current_user_id)
-        ).all()
-        if len(players) != len(player_ids):
-            raise ValidationError('Um ou mais jogadores não foram encontrados')
-        
-        # Verificar se algum jogador já está no período
-        existing_players = MonthlyPlayer.query.filter(
-            and_(
-                MonthlyPlayer.monthly_period_id == period_id,
-                MonthlyPlayer.player_id.in_(player_ids),
-                MonthlyPlayer.user_id == current_user_id
-            )
-        ).all()
-        
-        if existing_players:
-            existing_names = [mp.player_name for mp in existing_players]
-            raise ValidationError(f'Os seguintes jogadores já estão no período: {", ".join(existing_names)}')
-        
-        # Criar registros para os jogadores selecionados
-        created_players = []
-        total_expected_increase = 0
-        
-        for player in players:
-            monthly_player = MonthlyPlayer(
-                id=str(uuid.uuid4()),
-                monthly_period_id=period_id,
-                player_id=player.id,
-                player_name=player.name,
-                position=player.position,
-                phone=player.phone or '',
-                email=player.email or '',
-                monthly_fee=player.monthly_fee,
-                join_date=player.join_date,
-                status='pending',
-                user_id=current_user_id
-            )
-            db.session.add(monthly_player)
-            created_players.append(monthly_player)
-            total_expected_increase += player.monthly_fee
-        
-        # Atualizar totais do período
-        period.total_expected += total_expected_increase
-        period.players_count = MonthlyPlayer.query.filter(
-            and_(MonthlyPlayer.monthly_period_id == period_id, MonthlyPlayer.user_id == current_user_id)
-        ).count() + len(created_players)
+        all_active = bool(data.get('all_active')) if isinstance(data, dict) else False
+        if not all_active:
+            if not data or 'player_ids' not in data:
+                raise ValidationError('Lista de player_ids é obrigatória')
+            player_ids = data['player_ids']
+            if not isinstance(player_ids, list) or len(player_ids) == 0:
+                raise ValidationError('Lista de player_ids deve conter pelo menos um ID')
+            player_ids = list(dict.fromkeys(str(player_id) for player_id in player_ids))
+        else:
+            player_ids = None
+        
+        result = period_rollover.add_players(period, current_user_id, player_ids)
+        skipped = 0
+        if player_ids is not None and result['added'] < len(player_ids):
+            # Caminho incomum: separar ids inexistentes de jogadores já no período
+            found = db.session.query(func.count(Player.id)).filter(
+                and_(Player.id.in_(player_ids), Player.user_id == current_user_id)
+            ).scalar()
+            if found != len(player_ids):
+                raise ValidationError('Um ou mais jogadores não foram encontrados')
+            skipped = len(player_ids) - result['added']
         
         db.session.commit()
         
         return APIResponse.success(
             data={
-                'added_players': len(created_players),
-                'total_expected_increase': float(total_expected_increase)
+                'added_players': result['added'],
+                'skipped_players': skipped,
+                'total_expected_increase': float(result['expected_increase'])
             },
-            message=f'{len(created_players)} jogadores adicionados com sucesso'
+            message=f'{result["added"]} jogadores adicionados com sucesso'
         )
         
     except Exception as e:
@@ -950,61 +1274,42 @@ def add_players_to_monthly_period(period_id):
 
 @api_bp.route('/monthly-periods/<period_id>/players', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_monthly_period_players(period_id):
     """
     Lista jogadores de um período mensal específico
     """
     try:
-        print(f"\n🔍 [FLASK] get_monthly_period_players - INÍCIO")
-        print(f"🔍 [FLASK] period_id recebido: {period_id}")
-        
         # Verificar se o período existe e pertence ao usuário
         current_user_id = str(get_jwt_identity())
-        print(f"🔍 [FLASK] current_user_id: {current_user_id}")
-        
+
         period = MonthlyPeriod.query.filter(
             and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
         ).first()
         
         if not period:
-            print(f"❌ [FLASK] Período não encontrado para period_id: {period_id}, user_id: {current_user_id}")
+            log_event(logger, logging.DEBUG, 'period_players.not_found', period_id=period_id, user_id=current_user_id)
             return jsonify({'error': 'Período não encontrado'}), 404
         
-        print(f"✅ [FLASK] Período encontrado: {period.name} ({period.month}/{period.year})")
-        print(f"🔍 [FLASK] Período players_count: {period.players_count}")
-        
         # Buscar jogadores do período do usuário com joinedload para evitar N+1
-        monthly_players_query = MonthlyPlayer.query.options(
+        monthly_players = MonthlyPlayer.query.options(
             joinedload(MonthlyPlayer.player)
         ).filter(
             and_(MonthlyPlayer.monthly_period_id == period_id, MonthlyPlayer.user_id == current_user_id)
-        )
-        
-        print(f"🔍 [FLASK] Query SQL: {monthly_players_query}")
-        monthly_players = monthly_players_query.all()
-        
-        print(f"🔍 [FLASK] Quantidade de jogadores encontrados na query: {len(monthly_players)}")
-        
-        if monthly_players:
-            print(f"🔍 [FLASK] Primeiro jogador encontrado:")
-            first_player = monthly_players[0]
-            print(f"  - ID: {first_player.id}")
-            print(f"  - Player ID: {first_player.player_id}")
-            print(f"  - Nome: {first_player.player_name}")
-            print(f"  - Monthly Period ID: {first_player.monthly_period_id}")
-            print(f"  - User ID: {first_player.user_id}")
-            print(f"  - Status: {first_player.status}")
-        else:
-            print(f"⚠️ [FLASK] Nenhum jogador encontrado para o período")
-            
-            # Verificar se existem jogadores na tabela MonthlyPlayer para este usuário
-            all_user_monthly_players = MonthlyPlayer.query.filter(MonthlyPlayer.user_id == current_user_id).all()
-            print(f"🔍 [FLASK] Total de jogadores mensais do usuário: {len(all_user_monthly_players)}")
-            
-            if all_user_monthly_players:
-                print(f"🔍 [FLASK] Períodos dos jogadores mensais do usuário:")
-                for mp in all_user_monthly_players:
-                    print(f"  - Jogador: {mp.player_name}, Período: {mp.monthly_period_id}")
+        ).all()
+
+        # Diagnóstico (amostrado; nenhuma consulta extra com DEBUG desligado)
+        if debug_sampled(logger):
+            fields = {'period_id': period_id, 'players': len(monthly_players), 'players_count': period.players_count}
+            if not monthly_players:
+                # Período vazio: em quais períodos o usuário tem jogadores
+                fields['user_periods'] = dict(
+                    db.session.query(MonthlyPlayer.monthly_period_id, func.count(MonthlyPlayer.id))
+                    .filter(MonthlyPlayer.user_id == current_user_id)
+                    .group_by(MonthlyPlayer.monthly_period_id)
+                    .all()
+                )
+            log_event(logger, logging.DEBUG, 'period_players.loaded', **fields)
         
         result = []
         for mp in monthly_players:
@@ -1037,18 +1342,39 @@ def get_monthly_period_players(period_id):
             
             result.append(player_data)
         
-        print(f"🔍 [FLASK] Resultado final sendo retornado: {len(result)} jogadores")
-        print(f"🔍 [FLASK] Dados do resultado: {result}")
-        
         return jsonify(result), 200
         
     except Exception as e:
-        print(f"❌ [FLASK] Erro em get_monthly_period_players: {str(e)}")
-        import traceback
-        print(f"❌ [FLASK] Traceback: {traceback.format_exc()}")
+        logger.exception("Erro em get_monthly_period_players (period_id=%s)", period_id)
         return jsonify({'error': f'Erro ao buscar jogadores do período: {str(e)}'}), 500
 
 
+PAYMENT_STATUSES = ('paid', 'pending', 'overdue')
+BULK_PAYMENTS_MAX_ROWS = 500
+
+
+def _monthly_player_payment_data(monthly_player):
+    """Dados do jogador mensal retornados pelas rotas de status de pagamento"""
+    return {
+        'id': monthly_player.id,
+        'player_id': monthly_player.player_id,
+        'monthly_period_id': monthly_player.monthly_period_id,
+        'player_name': monthly_player.player_name,
+        'position': monthly_player.position,
+        'phone': monthly_player.phone,
+        'email': monthly_player.email,
+        'monthly_fee': float(monthly_player.monthly_fee),
+        'custom_monthly_fee': float(monthly_player.custom_monthly_fee) if monthly_player.custom_monthly_fee else None,
+        'effective_monthly_fee': float(monthly_player.custom_monthly_fee or monthly_player.monthly_fee),
+        'status': monthly_player.status,
+        'payment_date': monthly_player.payment_date.isoformat() if monthly_player.payment_date else None,
+        'created_at': monthly_player.created_at.isoformat(),
+        'updated_at': monthly_player.updated_at.isoformat(),
+        'amount_paid': float(monthly_player.custom_monthly_fee or monthly_player.monthly_fee) if monthly_player.status == 'paid' else 0,
+        'pending_months_count': monthly_player.pending_months_count or 0
+    }
+
+
 @api_bp.route('/monthly-periods/<period_id>/players/<player_id>/payment', methods=['PATCH'])
 @jwt_required()
 @handle_api_error
@@ -1085,7 +1411,7 @@ def update_monthly_player_payment_status(period_id, player_id):
             return jsonify({'error': 'Dados da requisição são obrigatórios'}), 400
         
         status = data.get('status')
-        if not status or status not in ['paid', 'pending', 'overdue']:
+        if not status or status not in PAYMENT_STATUSES:
             return jsonify({'error': 'Status deve ser "paid", "pending" ou "overdue"'}), 400
         
         # Atualizar status
@@ -1102,46 +1428,16 @@ def update_monthly_player_payment_status(period_id, player_id):
             # Se mudando para pendente ou em atraso, limpar data de pagamento
             monthly_player.payment_date = None
         
-        # Atualizar timestamp
+        # Atualizar timestamp (total recebido do período ajustado no flush)
         monthly_player.updated_at = datetime.utcnow()
         
-        # Recalcular total recebido do período
-        period.total_received = db.session.query(
-            db.func.sum(
-                db.func.coalesce(MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.monthly_fee)
-            )
-        ).filter(
-            and_(
-                MonthlyPlayer.monthly_period_id == period.id,
-                MonthlyPlayer.user_id == current_user_id,
-                MonthlyPlayer.status == 'paid'
-            )
-        ).scalar() or 0
-        
         db.session.commit()
         
         # Retornar dados atualizados do jogador
         result = {
             'success': True,
             'message': f'Status de pagamento atualizado para {status}',
-            'data': {
-                'id': monthly_player.id,
-                'player_id': monthly_player.player_id,
-                'monthly_period_id': monthly_player.monthly_period_id,
-                'player_name': monthly_player.player_name,
-                'position': monthly_player.position,
-                'phone': monthly_player.phone,
-                'email': monthly_player.email,
-                'monthly_fee': float(monthly_player.monthly_fee),
-                'custom_monthly_fee': float(monthly_player.custom_monthly_fee) if monthly_player.custom_monthly_fee else None,
-                'effective_monthly_fee': float(monthly_player.custom_monthly_fee or monthly_player.monthly_fee),
-                'status': monthly_player.status,
-                'payment_date': monthly_player.payment_date.isoformat() if monthly_player.payment_date else None,
-                'created_at': monthly_player.created_at.isoformat(),
-                'updated_at': monthly_player.updated_at.isoformat(),
-                'amount_paid': float(monthly_player.custom_monthly_fee or monthly_player.monthly_fee) if monthly_player.status == 'paid' else 0,
-                'pending_months_count': 0  # Calculado dinamicamente se necessário
-            }
+            'data': _monthly_player_payment_data(monthly_player)
         }
         
         return jsonify(result), 200
@@ -1151,55 +1447,159 @@ def update_monthly_player_payment_status(period_id, player_id):
         return jsonify({'error': f'Erro ao atualizar status de pagamento: {str(e)}'}), 500
 
 
+@api_bp.route('/monthly-periods/<period_id>/players/payments', methods=['PATCH'])
+@jwt_required()
+@handle_api_error
+def bulk_update_monthly_players_payment_status(period_id):
+    """
+    Atualiza o status de pagamento de vários jogadores do período.
+
+    Body: {"payments": [{"player_id": "...", "status": "paid", "payment_date": "..."}]}
+    Aplica tudo com um único UPDATE (CASE por jogador) e recalcula o total
+    recebido do período uma vez.
+    """
+    current_user_id = str(get_jwt_identity())
+
+    period = MonthlyPeriod.query.filter(
+        and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
+    ).first()
+    if not period:
+        return APIResponse.error("Período não encontrado", status_code=404)
+
+    data = request.get_json(silent=True)
+    payments = data.get('payments') if isinstance(data, dict) else data
+    if not isinstance(payments, list) or not payments:
+        raise ValidationError("Dados da requisição são obrigatórios", {'payments': ['Informe uma lista de pagamentos']})
+    if len(payments) > BULK_PAYMENTS_MAX_ROWS:
+        raise ValidationError(f"Máximo de {BULK_PAYMENTS_MAX_ROWS} pagamentos por requisição")
+
+    now = datetime.utcnow()
+    statuses = {}
+    payment_dates = {}
+    errors = {}
+    for index, item in enumerate(payments):
+        player_id = str(item.get('player_id') or '') if isinstance(item, dict) else ''
+        status = item.get('status') if isinstance(item, dict) else None
+        if not player_id:
+            errors[str(index)] = ['player_id é obrigatório']
+            continue
+        if player_id in statuses:
+            errors[str(index)] = ['Jogador repetido na requisição']
+            continue
+        if status not in PAYMENT_STATUSES:
+            errors[str(index)] = ['Status deve ser "paid", "pending" ou "overdue"']
+            continue
+
+        # Pago: data informada (ou agora); pendente/em atraso: limpa a data
+        payment_date = None
+        if status == 'paid':
+            payment_date = now
+            if item.get('payment_date'):
+                try:
+                    payment_date = datetime.fromisoformat(str(item['payment_date']).replace('Z', '+00:00'))
+                except ValueError:
+                    errors[str(index)] = ['payment_date inválida']
+                    continue
+        statuses[player_id] = status
+        payment_dates[player_id] = payment_date
+
+    if errors:
+        raise ValidationError("Pagamentos inválidos", errors)
+
+    player_ids = list(statuses)
+    scope = and_(
+        MonthlyPlayer.monthly_period_id == period.id,
+        MonthlyPlayer.user_id == current_user_id,
+        MonthlyPlayer.player_id.in_(player_ids)
+    )
+
+    found = {pid for (pid,) in db.session.query(MonthlyPlayer.player_id).filter(scope)}
+    missing = [pid for pid in player_ids if pid not in found]
+    if missing:
+        return APIResponse.error(
+            "Jogador não encontrado neste período",
+            {'player_id': missing},
+            status_code=404
+        )
+
+    db.session.execute(
+        update(MonthlyPlayer)
+        .where(scope)
+        .values(
+            status=case(statuses, value=MonthlyPlayer.player_id),
+            payment_date=case(
+                {pid: literal(value, MonthlyPlayer.payment_date.type) if value else null()
+                 for pid, value in payment_dates.items()},
+                value=MonthlyPlayer.player_id
+            ),
+            updated_at=now
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    # UPDATE via Core não passa pelos hooks: recalcula o recebido e a inadimplência
+    delinquency.refresh(db.session.connection(), current_user_id, player_ids=player_ids)
+    _, received, _ = aggregate_totals([period.id], current_user_id).get(period.id, (0, 0, 0))
+    period.total_received = received
+    period.updated_at = now
+
+    updated = MonthlyPlayer.query.filter(scope).order_by(MonthlyPlayer.player_name) \
+        .execution_options(populate_existing=True).all()
+    db.session.commit()
+
+    return APIResponse.success(
+        data={
+            'period': {
+                'id': period.id,
+                'total_expected': float(period.total_expected),
+                'total_received': float(period.total_received)
+            },
+            'players': [_monthly_player_payment_data(mp) for mp in updated]
+        },
+        message=f"{len(updated)} pagamentos atualizados"
+    )
+
+
 @api_bp.route('/monthly-periods/<period_id>/available-players', methods=['GET'])
 @jwt_required()
 @handle_api_error
 def get_available_players_for_period(period_id):
     """
     Lista jogadores disponíveis para importação em um período (não ainda adicionados ao período).
+    Filtros opcionais: search (nome, telefone ou e-mail) e position.
+    Com ``?cursor=`` pagina por (name, id) com ``per_page`` (padrão 50, máx. 100).
     Retorna resposta padronizada: { success, data, message }.
     """
     try:
         current_user_id = str(get_jwt_identity())
+        search = request.args.get('search')
+        position = request.args.get('position')
 
         # Verificar existência do período pertencente ao usuário
-        period = MonthlyPeriod.query.filter(
-            and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
-        ).first()
-        if not period:
+        if not read_models.period_exists(current_user_id, period_id):
             raise ValidationError('Período não encontrado')
 
-        # IDs de jogadores já no período
-        existing_player_ids = [mp.player_id for mp in MonthlyPlayer.query.filter(
-            and_(MonthlyPlayer.monthly_period_id == period_id, MonthlyPlayer.user_id == current_user_id)
-        ).all()]
-
-        # Jogadores ativos do usuário que não estão no período
-        available_players_query = Player.query.filter(
-            and_(
-                Player.user_id == current_user_id,
-                Player.status == 'active',
-                ~Player.id.in_(existing_player_ids) if existing_player_ids else True
+        # Paginação por cursor: chave (name, id), sem COUNT(*)
+        if cursor_requested():
+            per_page = min(max(request.args.get('per_page', 50, type=int), 1), 100)
+            query = read_models.available_players_query(current_user_id, period_id, position)
+            if search:
+                query = apply_search(query, search, ranked=False)
+            items, pagination = keyset_page(
+                query, [(Player.name, False), (Player.id, False)], per_page,
+                key_of=lambda p: (p.name, p.id)
+            )
+            return APIResponse.paginated(
+                data=[read_models.available_player_dict(p) for p in items],
+                pagination=pagination,
+                message=f'{len(items)} jogadores disponíveis nesta página'
             )
-        )
 
-        available_players = available_players_query.all()
-
-        # Formatar dados conforme esperado pelo frontend (campos do Player)
-        formatted = []
-        for p in available_players:
-            formatted.append({
-                'id': p.id,
-                'name': p.name,
-                'position': p.position,
-                'phone': p.phone or '',
-                'email': p.email or '',
-                'monthly_fee': float(p.monthly_fee) if p.monthly_fee is not None else 0.0,
-                'join_date': p.join_date.isoformat() if p.join_date else None,
-                'status': p.status,
-                'created_at': p.created_at.isoformat() if p.created_at else None,
-                'updated_at': p.updated_at.isoformat() if p.updated_at else None
-            })
+        # Jogadores ativos do usuário que não estão no período (NOT EXISTS no banco)
+        available_players = read_models.list_available_players(
+            current_user_id, period_id, position=position, search=search
+        )
+        formatted = [read_models.available_player_dict(p) for p in available_players]
 
         return APIResponse.success(
             data=formatted,
@@ -1293,17 +1693,7 @@ def add_casual_player_to_monthly_period(period_id):
         db.session.commit()
         
         # Retornar dados do jogador criado
-        result = {
-            'id': casual_player.id,
-            'monthly_period_id': casual_player.monthly_period_id,
-            'player_name': casual_player.player_name,
-            'play_date': casual_player.play_date.isoformat() if casual_player.play_date else None,
-            'invited_by': casual_player.invited_by,
-            'amount': float(casual_player.amount),
-            'status': casual_player.status,
-            'payment_date': casual_player.payment_date.isoformat() if casual_player.payment_date else None,
-            'created_at': casual_player.created_at.isoformat() if casual_player.created_at else None
-        }
+        result = casual_player_dict(casual_player)
         
         return jsonify({
             'success': True,
@@ -1327,31 +1717,11 @@ def get_monthly_period_casual_players(period_id):
     try:
         # Verificar se o período existe e pertence ao usuário
         current_user_id = str(get_jwt_identity())
-        period = MonthlyPeriod.query.filter(
-            and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
-        ).first()
-        if not period:
+        if not read_models.period_exists(current_user_id, period_id):
             return jsonify({'error': 'Período não encontrado'}), 404
         
         # Buscar jogadores casuais do período do usuário
-        casual_players = CasualPlayer.query.filter(
-            and_(CasualPlayer.monthly_period_id == period_id, CasualPlayer.user_id == current_user_id)
-        ).all()
-        
-        result = []
-        for cp in casual_players:
-            result.append({
-                'id': cp.id,
-                'monthly_period_id': cp.monthly_period_id,
-                'player_name': cp.player_name,
-                'play_date': cp.play_date.isoformat(),
-                'invited_by': cp.invited_by,
-                'amount': float(cp.amount),
-                'payment_date': cp.payment_date.isoformat() if cp.payment_date else None,
-                'status': cp.status,
-                'created_at': cp.created_at.isoformat(),
-                'updated_at': cp.updated_at.isoformat()
-            })
+        result = [casual_player_dict(cp) for cp in read_models.list_casual_players(current_user_id, period_id)]
         
         return jsonify(result), 200
         
@@ -1363,10 +1733,13 @@ def get_monthly_period_casual_players(period_id):
 
 @api_bp.route('/cashflow/summary', methods=['GET'])
 @jwt_required()
+@conditional_get
+@cached_response()
 def get_cashflow_summary():
     """
     Retorna resumo financeiro agregado por mês para o usuário autenticado.
     Filtros opcionais: year, month.
+    Lido do ledger materializado ``cashflow_monthly`` (ver services/cashflow_ledger.py).
 
     Formato por mês:
     {
@@ -1387,63 +1760,43 @@ def get_cashflow_summary():
         if user and getattr(user, 'initial_balance', None) is not None:
             initial_balance = float(user.initial_balance or 0)
 
-        # Períodos com totais (expected/received)
-        periods_q = db.session.query(MonthlyPeriod).filter(MonthlyPeriod.user_id == current_user_id)
-        if year:
-            periods_q = periods_q.filter(MonthlyPeriod.year == year)
-        if month:
-            periods_q = periods_q.filter(MonthlyPeriod.month == month)
-
-        periods = periods_q.order_by(MonthlyPeriod.year.asc(), MonthlyPeriod.month.asc()).all()
-
-        # Agregar despesas por (year, month)
-        expenses_q = db.session.query(
-            Expense.year.label('year'),
-            Expense.month.label('month'),
-            func.coalesce(func.sum(Expense.amount), 0).label('total'),
-            func.count(Expense.id).label('count')
-        ).filter(Expense.user_id == current_user_id)
-        if year:
-            expenses_q = expenses_q.filter(Expense.year == year)
-        if month:
-            expenses_q = expenses_q.filter(Expense.month == month)
-        expenses_q = expenses_q.group_by(Expense.year, Expense.month)
-        expenses_agg = {(row.year, row.month): {'total': float(row.total or 0), 'count': int(row.count)} for row in expenses_q.all()}
+        # Leitura por faixa no ledger materializado (user_id, year, month)
+        rows = ledger_rows(current_user_id, year=year, month=month)
 
         result = []
-        for p in periods:
-            exp = expenses_agg.get((p.year, p.month), {'total': 0.0, 'count': 0})
-            monthly_expected = float(p.total_expected or 0)
-            monthly_received = float(p.total_received or 0)
-            total_expenses = float(exp['total'] or 0)
-            net = monthly_received - total_expenses
-
+        for row in rows:
             result.append({
                 'period': {
-                    'year': p.year,
-                    'month': p.month,
-                    'name': p.name
+                    'year': row.year,
+                    'month': row.month,
+                    'name': row.period_name
                 },
                 'monthly': {
-                    'expected': monthly_expected,
-                    'received': monthly_received
+                    'expected': float(row.expected or 0),
+                    'received': float(row.received or 0)
                 },
                 'expenses': {
-                    'total': total_expenses,
-                    'itemsCount': exp['count']
+                    'total': float(row.expenses_total or 0),
+                    'itemsCount': int(row.expenses_count or 0)
                 },
                 'summary': {
-                    'net': net
+                    'net': float(row.net or 0)
                 }
             })
 
-        # Ordena por ano/mês ascendente para consistência e calcula saldo acumulado com saldo inicial
-        result.sort(key=lambda x: (x['period']['year'], x['period']['month']))
-        accumulated = initial_balance
-        for item in result:
-            accumulated += float(item['summary']['net'])
-            item['summary']['initial_balance'] = initial_balance
-            item['summary']['accumulated'] = accumulated
+        # Saldo acumulado considera apenas os meses retornados (com saldo inicial).
+        # Sem filtro de mês os meses são contíguos e o saldo vem pronto do ledger.
+        if rows and not month:
+            offset = rows[0].balance - rows[0].net
+            for row, item in zip(rows, result):
+                item['summary']['initial_balance'] = initial_balance
+                item['summary']['accumulated'] = initial_balance + float(row.balance - offset)
+        else:
+            accumulated = initial_balance
+            for item in result:
+                accumulated += float(item['summary']['net'])
+                item['summary']['initial_balance'] = initial_balance
+                item['summary']['accumulated'] = accumulated
         return jsonify(result), 200
 
     except Exception as e:
@@ -1490,10 +1843,7 @@ def get_monthly_period_expenses(period_id):
     try:
         # Verificar se o período existe e pertence ao usuário
         current_user_id = str(get_jwt_identity())
-        period = MonthlyPeriod.query.filter(
-            and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == current_user_id)
-        ).first()
-        if not period:
+        if not read_models.period_exists(current_user_id, period_id):
             return jsonify({
                 'success': False,
                 'message': 'Período não encontrado',
@@ -1501,23 +1851,7 @@ def get_monthly_period_expenses(period_id):
             }), 404
         
         # Buscar despesas do período do usuário
-        expenses = Expense.query.filter(
-            and_(Expense.monthly_period_id == period_id, Expense.user_id == current_user_id)
-        ).all()
-        
-        result = []
-        for expense in expenses:
-            result.append({
-                'id': expense.id,
-                'monthly_period_id': expense.monthly_period_id,
-                'description': expense.description,
-                'amount': float(expense.amount),
-                'category': expense.category,
-                # O modelo usa campo 'date'; expor como 'expense_date' na resposta
-                'expense_date': expense.date.isoformat(),
-                'created_at': expense.created_at.isoformat(),
-                'updated_at': expense.updated_at.isoformat()
-            })
+        result = [expense_dict(expense) for expense in read_models.list_expenses(current_user_id, period_id)]
         
         return jsonify({
             'success': True,
@@ -1583,16 +1917,7 @@ def create_monthly_period_expense(period_id):
         raise e
 
     # Retornar dados da despesa criada
-    result = {
-        'id': expense.id,
-        'monthly_period_id': expense.monthly_period_id,
-        'description': expense.description,
-        'amount': float(expense.amount),
-        'category': expense.category,
-        'expense_date': expense.date.isoformat(),
-        'created_at': expense.created_at.isoformat(),
-        'updated_at': expense.updated_at.isoformat()
-    }
+    result = expense_dict(expense)
 
     return jsonify({
         'success': True,
@@ -1661,18 +1986,7 @@ def update_casual_player_payment_status(period_id, casual_player_id):
         result = {
             'success': True,
             'message': f'Status de pagamento do jogador avulso atualizado para {status}',
-            'data': {
-                'id': casual_player.id,
-                'monthly_period_id': casual_player.monthly_period_id,
-                'player_name': casual_player.player_name,
-                'play_date': casual_player.play_date.isoformat() if casual_player.play_date else None,
-                'invited_by': casual_player.invited_by,
-                'amount': float(casual_player.amount),
-                'status': casual_player.status,
-                'payment_date': casual_player.payment_date.isoformat() if casual_player.payment_date else None,
-                'created_at': casual_player.created_at.isoformat() if casual_player.created_at else None,
-                'updated_at': casual_player.updated_at.isoformat() if casual_player.updated_at else None
-            }
+            'data': casual_player_dict(casual_player)
         }
         
         return jsonify(result), 200
@@ -1684,6 +1998,51 @@ def update_casual_player_payment_status(period_id, casual_player_id):
         return jsonify({'error': f'Erro ao atualizar status de pagamento: {str(e)}'}), 500
 
 
+# ==================== EXPORTAÇÕES (streaming) ====================
+
+@api_bp.route('/export/<resource>', methods=['GET'])
+@jwt_required()
+@handle_api_error
+def export_resource(resource):
+    """
+    Exporta jogadores, mensalidades, despesas ou fluxo de caixa do usuário.
+
+    Query params:
+        format: csv (padrão) ou ndjson
+        year: Filtra pelo ano
+        period_id: Filtra pelo período mensal
+
+    O corpo é gerado em streaming (lotes de EXPORT_YIELD_PER linhas) e
+    comprimido em fluxo quando o cliente aceita gzip (ver services/exports.py).
+    """
+    current_user_id = str(get_jwt_identity())
+    if resource not in exports.EXPORTS:
+        raise ValidationError('Exportação inválida', {'resource': [f"Use um de: {', '.join(exports.EXPORTS)}"]})
+
+    fmt = (request.args.get('format') or 'csv').lower()
+    if fmt not in exports.ENCODERS:
+        raise ValidationError('Formato inválido', {'format': ['Use csv ou ndjson']})
+
+    year = request.args.get('year', type=int)
+    period_id = request.args.get('period_id')
+    if period_id and not read_models.period_exists(current_user_id, period_id):
+        raise ValidationError('Período não encontrado')
+
+    body = exports.export_stream(
+        resource, fmt, current_user_id, year=year, period_id=period_id,
+        yield_per=current_app.config.get('EXPORT_YIELD_PER', exports.DEFAULT_YIELD_PER),
+    )
+    headers = {'Vary': 'Accept-Encoding'}
+    # Gzip aplicado pelo gerador; com Content-Encoding definido o Flask-Compress não bufferiza o corpo
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        body = exports.gzip_stream(body, level=current_app.config.get('COMPRESS_LEVEL', 6))
+        headers['Content-Encoding'] = 'gzip'
+
+    suffix = f"-{year}" if year else ''
+    headers['Content-Disposition'] = f'attachment; filename="{resource}{suffix}.{fmt}"'
+    return Response(stream_with_context(body), mimetype=exports.EXPORT_MIMETYPES[fmt], headers=headers)
+
+
 # ==================== TRATAMENTO DE ERROS ====================
 
 @api_bp.errorhandler(404)
@@ -0,0 +1,93 @@
+"""
+Paginação por cursor (keyset) para listagens grandes
+
+O cursor é um token opaco (base64 de JSON) com os valores da chave de
+ordenação do último item da página. A próxima página filtra "depois desta
+chave" em vez de usar OFFSET e não executa COUNT(*), então o custo de uma
+página profunda é o mesmo da primeira.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Sequence, Tuple
+
+from flask import request
+from sqlalchemy import and_, or_
+
+from .response_utils import ValidationError
+
+
+def cursor_requested() -> bool:
+    """Modo cursor é opcional: ativado pela presença de ``?cursor=`` (vazio = primeira página)"""
+    return 'cursor' in request.args
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Gera o token opaco a partir dos valores da chave de ordenação"""
+    raw = json.dumps(list(values), separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    Decodifica o token do cursor.
+
+    Raises:
+        ValidationError: Se o token for inválido ou não corresponder à chave
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValidationError("Cursor inválido", {'cursor': ['Token de paginação inválido']})
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError("Cursor inválido", {'cursor': ['Token de paginação inválido']})
+    return values
+
+
+def _after_key(keys, values):
+    """
+    Condição "linha vem depois de values" na ordenação das chaves.
+
+    Cada chave é (coluna, descendente); expande a comparação lexicográfica em
+    (a > x) OR (a = x AND b > y) OR ..., que usa os índices compostos.
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        prefix = [keys[j][0] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*prefix, step))
+    return or_(*clauses)
+
+
+def keyset_page(query, keys: Sequence[Tuple[Any, bool]], per_page: int, key_of) -> Tuple[list, dict]:
+    """
+    Busca uma página por cursor.
+
+    Args:
+        query: Query já filtrada (sem ORDER BY)
+        keys: Lista de (coluna, descendente) que define a ordenação total
+        per_page: Tamanho da página
+        key_of: Função item -> valores da chave (para o próximo cursor)
+
+    Returns:
+        Tuple (itens, paginação) com ``next_cursor`` e ``has_next``
+    """
+    # Página vazia não teria chave para o próximo cursor
+    per_page = max(int(per_page), 1)
+    token = request.args.get('cursor') or ''
+    if token:
+        query = query.filter(_after_key(keys, decode_cursor(token, len(keys))))
+
+    order_by = [column.desc() if descending else column.asc() for column, descending in keys]
+    rows = query.order_by(*order_by).limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    pagination = {
+        'per_page': per_page,
+        'cursor': token or None,
+        'next_cursor': encode_cursor(key_of(items[-1])) if has_next else None,
+        'has_next': has_next,
+    }
+    return items, pagination
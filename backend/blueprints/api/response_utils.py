@@ -1,12 +1,17 @@
 """
 Utilitários para padronização de respostas da API
 """
-from flask import jsonify
+import hashlib
+import logging
+from flask import jsonify, make_response, request
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
-import decimal
 from marshmallow import ValidationError as MarshValidationError
 
+from ...services.server_timing import timed
+
+logger = logging.getLogger(__name__)
+
 
 class APIResponse:
     """Classe para padronizar respostas da API"""
@@ -24,9 +29,10 @@ class APIResponse:
         Returns:
             Tuple com (response, status_code)
         """
+        # Decimal/datetime/modelos são convertidos pelo provider JSON (services/json_provider.py)
         response = {
             'success': True,
-            'data': APIResponse._serialize_data(data) if data is not None else None,
+            'data': data,
             'message': message,
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -34,7 +40,8 @@ class APIResponse:
         # Remove campos None para resposta mais limpa
         response = {k: v for k, v in response.items() if v is not None}
         
-        return jsonify(response), status_code
+        with timed('json'):
+            return jsonify(response), status_code
     
     @staticmethod
     def error(message: str, errors: Dict[str, List[str]] = None, status_code: int = 400) -> tuple:
@@ -76,7 +83,7 @@ class APIResponse:
         """
         response = {
             'success': True,
-            'data': APIResponse._serialize_data(data),
+            'data': data,
             'pagination': pagination,
             'message': message,
             'timestamp': datetime.utcnow().isoformat()
@@ -85,36 +92,8 @@ class APIResponse:
         # Remove campos None
         response = {k: v for k, v in response.items() if v is not None}
         
-        return jsonify(response), 200
-    
-    @staticmethod
-    def _serialize_data(data: Any) -> Any:
-        """
-        Serializa dados para JSON, tratando tipos especiais
-        
-        Args:
-            data: Dados a serem serializados
-            
-        Returns:
-            Dados serializados
-        """
-        if isinstance(data, list):
-            return [APIResponse._serialize_data(item) for item in data]
-        
-        if isinstance(data, dict):
-            return {key: APIResponse._serialize_data(value) for key, value in data.items()}
-        
-        if isinstance(data, decimal.Decimal):
-            return float(data)
-        
-        if isinstance(data, datetime):
-            return data.isoformat()
-        
-        # Para objetos SQLAlchemy, usar o método to_dict se disponível
-        if hasattr(data, 'to_dict'):
-            return APIResponse._serialize_data(data.to_dict())
-        
-        return data
+        with timed('json'):
+            return jsonify(response), 200
 
 
 class ValidationError(Exception):
@@ -145,9 +124,62 @@ def handle_api_error(func):
         except ValueError as e:
             return APIResponse.error(f"Erro de validação: {str(e)}", status_code=400)
         except Exception as e:
-            # Log do erro real para debugging
-            import logging
-            logging.error(f"Erro não tratado em {func.__name__}: {str(e)}")
+            # Log do erro real (com traceback e trace id) para debugging
+            logger.exception("Erro não tratado em %s: %s", func.__name__, e)
             return APIResponse.error("Erro interno do servidor", status_code=500)
     
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def _parse_if_none_match(header: str) -> set:
+    """
+    Extrai os valores de If-None-Match, ignorando o prefixo fraco (W/) e o
+    sufixo de codificação que o Flask-Compress acrescenta (ex.: "abc:gzip").
+    """
+    tags = set()
+    for raw in (header or '').split(','):
+        tag = raw.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag:
+            tags.add(tag.split(':', 1)[0])
+    return tags
+
+
+def conditional_get(func):
+    """
+    Decorator de GET condicional baseado na versão dos dados do usuário.
+
+    Gera um ETag a partir de (usuário, versão do tenant, URL com query string)
+    e responde 304 quando o cliente envia um If-None-Match correspondente,
+    sem executar o handler. Deve ser aplicado abaixo de ``@jwt_required()``.
+    """
+    from functools import wraps
+    from flask_jwt_extended import get_jwt_identity
+    from ...services.tenant_versions import get_tenant_version
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        user_id = str(get_jwt_identity())
+        version = get_tenant_version(user_id)
+        etag = hashlib.sha1(
+            f"{user_id}|{version}|{request.full_path}".encode('utf-8')
+        ).hexdigest()
+
+        headers = {
+            'ETag': f'W/"{etag}"',
+            'Cache-Control': 'private, no-cache',
+            'Vary': 'Authorization',
+        }
+        if etag in _parse_if_none_match(request.headers.get('If-None-Match')):
+            response = make_response('', 304)
+            response.headers.update(headers)
+            return response
+
+        response = make_response(func(*args, **kwargs))
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
+
+    return wrapper
@@ -1,7 +1,7 @@
 """
 Schemas de validação para a API usando Marshmallow
 """
-from marshmallow import Schema, fields, validate, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
 from datetime import datetime
 
 
@@ -67,6 +67,40 @@ class MonthlyPaymentCreateSchema(Schema):
             raise ValidationError('Mês deve estar entre 1 e 12')
 
 
+class MonthlyRolloverSchema(Schema):
+    """Schema para abertura de mês copiando o elenco do período anterior"""
+    year = fields.Int(validate=validate.Range(min=2020, max=2050))
+    month = fields.Int(validate=validate.Range(min=1, max=12))
+    source_period_id = fields.Str(allow_none=True)
+    carry_custom_fee = fields.Bool(missing=False)
+
+    @validates('year')
+    def validate_year(self, value):
+        current_year = datetime.now().year
+        if value > current_year + 1:
+            raise ValidationError(f'Ano deve estar entre 2020 e {current_year + 1}')
+
+    @validates_schema
+    def validate_target(self, data, **kwargs):
+        if ('year' in data) != ('month' in data):
+            raise ValidationError('Informe ano e mês juntos (ou nenhum para o mês seguinte ao último período)')
+
+
+class SeasonCreateSchema(Schema):
+    """Schema para pré-criação dos períodos de uma temporada"""
+    year = fields.Int(required=True, validate=validate.Range(min=2020, max=2050))
+    start_month = fields.Int(validate=validate.Range(min=1, max=12))
+    months = fields.Int(validate=validate.Range(min=1, max=24))
+    source_period_id = fields.Str(allow_none=True)
+    carry_custom_fee = fields.Bool(missing=False)
+
+    @validates('year')
+    def validate_year(self, value):
+        current_year = datetime.now().year
+        if value > current_year + 1:
+            raise ValidationError(f'Ano deve estar entre 2020 e {current_year + 1}')
+
+
 class MonthlyPaymentResponseSchema(Schema):
     """Schema para resposta de pagamentos mensais"""
     id = fields.Str()
@@ -0,0 +1,115 @@
+"""
+Comandos de linha de comando (``flask <grupo> <comando>``)
+"""
+import click
+from flask.cli import AppGroup
+
+from .services.db.connection import db
+from .services.db.models import User
+from .services import cashflow_ledger, delinquency, period_totals, player_search
+
+cashflow_cli = AppGroup('cashflow', help='Manutenção do ledger de fluxo de caixa')
+periods_cli = AppGroup('periods', help='Manutenção dos totais dos períodos mensais')
+players_cli = AppGroup('players', help='Manutenção do índice de busca de jogadores')
+debts_cli = AppGroup('debts', help='Manutenção da inadimplência (meses consecutivos em aberto)')
+
+
+def _target_user_ids(user_id):
+    if user_id:
+        return [user_id]
+    return [row.id for row in db.session.query(User.id).order_by(User.id).all()]
+
+
+@cashflow_cli.command('rebuild')
+@click.option('--user-id', default=None, help='Reconstrói apenas este usuário')
+def rebuild_cashflow(user_id):
+    """Reconstrói a tabela cashflow_monthly a partir das tabelas de origem"""
+    total = 0
+    for uid in _target_user_ids(user_id):
+        total += cashflow_ledger.rebuild_user(uid)
+    db.session.commit()
+    click.echo(f'Ledger reconstruído: {total} meses')
+
+
+@cashflow_cli.command('verify')
+@click.option('--user-id', default=None, help='Verifica apenas este usuário')
+def verify_cashflow(user_id):
+    """Compara cashflow_monthly com a agregação ao vivo (exit 1 se divergir)"""
+    problems = []
+    for uid in _target_user_ids(user_id):
+        problems.extend(cashflow_ledger.verify_user(uid))
+
+    for p in problems:
+        click.echo(f"[{p['issue']}] user={p['user_id']} period={p['period'][1]:02d}/{p['period'][0]}"
+                   + (f" {p['field']}: ledger={p['stored']} live={p['live']}" if p['issue'] == 'mismatch' else ''))
+    if problems:
+        click.echo(f'{len(problems)} divergência(s) encontrada(s)')
+        raise SystemExit(1)
+    click.echo('Ledger consistente')
+
+
+@periods_cli.command('reconcile')
+@click.option('--user-id', default=None, help='Reconcilia apenas este usuário')
+@click.option('--repair', is_flag=True, help='Corrige os totais divergentes')
+def reconcile_periods(user_id, repair):
+    """Compara os totais dos períodos com a agregação completa (exit 1 se divergir sem --repair)"""
+    problems = period_totals.reconcile(user_id=user_id, repair=repair)
+    for p in problems:
+        click.echo(f"[drift] user={p['user_id']} period={p['period_id']} "
+                   f"{p['field']}: gravado={p['stored']} real={p['live']}")
+
+    if repair:
+        db.session.commit()
+        click.echo(f'{len(problems)} divergência(s) corrigida(s)' if problems else 'Totais consistentes')
+        return
+    if problems:
+        click.echo(f'{len(problems)} divergência(s) encontrada(s)')
+        raise SystemExit(1)
+    click.echo('Totais consistentes')
+
+
+@players_cli.command('reindex-search')
+def reindex_player_search():
+    """Recalcula o texto de busca dos jogadores (e cria o FTS5 no SQLite)"""
+    conn = db.session.connection()
+    total = player_search.reindex(conn)
+    if db.engine.dialect.name == 'sqlite':
+        player_search.create_sqlite_fts(conn)
+    db.session.commit()
+    click.echo(f'Índice de busca atualizado: {total} jogadores')
+
+
+@debts_cli.command('rebuild')
+@click.option('--user-id', default=None, help='Recalcula apenas este usuário')
+def rebuild_debts(user_id):
+    """Recalcula pending_months_count de todos os jogadores mensais"""
+    conn = db.session.connection()
+    total = 0
+    for uid in _target_user_ids(user_id):
+        total += delinquency.refresh(conn, uid)
+    db.session.commit()
+    click.echo(f'Inadimplência recalculada: {total} registro(s) alterado(s)')
+
+
+@debts_cli.command('verify')
+@click.option('--user-id', default=None, help='Verifica apenas este usuário')
+def verify_debts(user_id):
+    """Compara pending_months_count com o recálculo completo (exit 1 se divergir)"""
+    problems = []
+    for uid in _target_user_ids(user_id):
+        problems.extend(delinquency.verify_user(uid))
+
+    for p in problems:
+        click.echo(f"[drift] monthly_player={p['monthly_player_id']} gravado={p['stored']} real={p['live']}")
+    if problems:
+        click.echo(f'{len(problems)} divergência(s) encontrada(s)')
+        raise SystemExit(1)
+    click.echo('Inadimplência consistente')
+
+
+def register_commands(app):
+    """Registra os grupos de comandos CLI na aplicação"""
+    app.cli.add_command(cashflow_cli)
+    app.cli.add_command(periods_cli)
+    app.cli.add_command(players_cli)
+    app.cli.add_command(debts_cli)
@@ -14,7 +14,8 @@ class BaseConfig:
 
     # Database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_RECORD_QUERIES = True
+    # Consultas são medidas por services/sql_profiler.py (SQL_PROFILER_*)
+    SQLALCHEMY_RECORD_QUERIES = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
         'pool_recycle': 300,
@@ -41,8 +42,42 @@ class BaseConfig:
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
 
-    # Logging
+    # Logging (services/structured_logging.py: fila + listener em segundo plano)
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text | json
+    LOG_FILE = os.environ.get('LOG_FILE')  # arquivo rotativo opcional
+    LOG_DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.1))  # diagnósticos por requisição
+
+    # Perfil de SQL por requisição (X-DB-Queries/X-DB-Time-ms, log de lentas, top-N em /api/admin)
+    SQL_PROFILER_ENABLED = os.environ.get('SQL_PROFILER_ENABLED', 'true').lower() == 'true'
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', 200))
+    SQL_PROFILER_TOP_N = int(os.environ.get('SQL_PROFILER_TOP_N', 20))
+    # Operadores (ids de usuário separados por vírgula) com acesso às estatísticas do processo em /api/admin/sql
+    OPERATOR_USER_IDS = [uid.strip() for uid in os.environ.get('OPERATOR_USER_IDS', '').split(',') if uid.strip()]
+
+    # Métricas em /metrics (snapshots por worker em METRICS_DIR, somados na leitura; vazio = só o processo)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.environ.get(
+        'METRICS_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'metrics')
+    )
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+    # Quem lê /metrics: IPs de origem (atrás de proxy reverso, prefira o token) ou Bearer METRICS_TOKEN
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+                           if ip.strip()]
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # Exportações em streaming (/api/export/*): linhas por lote buscado no banco
+    EXPORT_YIELD_PER = int(os.environ.get('EXPORT_YIELD_PER', 1000))
+
+    # Cache de respostas (simple/lru = memória do processo, sqlite = compartilhado, null = desligado)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', 300))  # 5 minutos
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 500))  # máximo de entradas
+    CACHE_DIR = os.environ.get(
+        'CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+    )
 
     # Configurações específicas do domínio (futebol)
     MAX_PLAYERS_PER_TEAM = 25
@@ -118,6 +153,13 @@ class ProductionConfig(BaseConfig):
 
     # Database (obrigatório via env var)
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    # Pool por worker do gunicorn (conexões no banco = workers × (pool_size + max_overflow))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **BaseConfig.SQLALCHEMY_ENGINE_OPTIONS,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
 
     # Security
     SESSION_COOKIE_SECURE = True
@@ -128,6 +170,17 @@ class ProductionConfig(BaseConfig):
     # HTTPS enforcement
     PREFERRED_URL_SCHEME = 'https'
 
+    # Perfil de SQL desligado por padrão (sem listeners por consulta)
+    SQL_PROFILER_ENABLED = os.environ.get('SQL_PROFILER_ENABLED', 'false').lower() == 'true'
+
+    # Logs em JSON (uma linha por registro) também em arquivo rotativo
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+    LOG_FILE = os.environ.get('LOG_FILE', 'logs/futebol.log')
+
+    # Cache compartilhado entre os workers do gunicorn
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'sqlite')
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 5000))
+
     @classmethod
     def validate(cls):
         """Validate production configuration"""
@@ -145,21 +198,7 @@ class ProductionConfig(BaseConfig):
 
         # Validate configuration
         ProductionConfig.validate()
-
-        import logging
-        from logging.handlers import RotatingFileHandler
-
-        # File logging
-        file_handler = RotatingFileHandler(
-            'logs/futebol.log', maxBytes=10240000, backupCount=10
-        )
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s '
-            '[in %(pathname)s:%(lineno)d]'
-        ))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-        app.logger.setLevel(logging.INFO)
+        # Arquivo de log: LOG_FILE, gravado fora da thread da requisição (init_logging)
 
 
 class TestingConfig(BaseConfig):
@@ -174,6 +213,9 @@ class TestingConfig(BaseConfig):
     # Security (disabled for easier testing)
     WTF_CSRF_ENABLED = False
 
+    # Métricas apenas em memória do processo
+    METRICS_DIR = None
+
     # Smaller limits for tests
     MAX_CONTENT_LENGTH = 1 * 1024 * 1024  # 1MB
     DEFAULT_PAGE_SIZE = 5
@@ -187,6 +229,29 @@ class TestingConfig(BaseConfig):
         logging.disable(logging.CRITICAL)  # Disable logging in tests
 
 
+class BenchmarkConfig(BaseConfig):
+    """Configuração do benchmark (python -m backend.benchmarks)"""
+
+    TESTING = True
+
+    # Banco descartável: recriado a cada execução
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'BENCH_DATABASE_URL',
+        'sqlite:///' + os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'benchmark.db'
+        )
+    )
+
+    # Sem o log [Perf][Request] de cada requisição medida
+    LOG_LEVEL = 'WARNING'
+
+    # Mede o trabalho real (sem cache de respostas) e conta as queries por requisição
+    CACHE_TYPE = 'null'
+    SQL_PROFILER_ENABLED = True
+    METRICS_ENABLED = False
+    METRICS_DIR = None
+
+
 class HomologConfig(BaseConfig):
     """Configuração para homologação/staging"""
 
@@ -221,6 +286,7 @@ config = {
     'production': ProductionConfig,
     'testing': TestingConfig,
     'homolog': HomologConfig,
+    'benchmark': BenchmarkConfig,
     'default': DevelopmentConfig
 }
 
@@ -0,0 +1,232 @@
+"""
+Cache de respostas da API com invalidação por usuário (tenant)
+
+Backends disponíveis (config ``CACHE_TYPE``):
+- ``simple``/``lru``: LRU em memória do processo, limitado por tamanho e TTL
+- ``sqlite``: arquivo SQLite compartilhado entre os workers do gunicorn
+- ``null``: desabilitado
+
+As chaves incluem a versão dos dados do usuário (``tenant_versions``), então
+uma escrita confirmada torna as entradas antigas inalcançáveis em qualquer
+worker. Além disso, um listener ``after_commit`` remove as entradas dos
+usuários afetados (registrados por ``services/tenant_versions.py``) para
+liberar espaço imediatamente.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import event
+
+from .db.connection import db
+from .tenant_versions import TOUCHED_TENANTS_KEY, get_tenant_version
+
+
+class NullCache:
+    """Backend que não armazena nada"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, tenant=None, timeout=None):
+        pass
+
+    def delete_tenant(self, tenant):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCache:
+    """LRU em memória com expiração por TTL (thread-safe)"""
+
+    def __init__(self, max_entries=500, default_timeout=300):
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+        self._entries = OrderedDict()  # key -> (expires_at, tenant, value)
+        self._by_tenant = {}
+        self._lock = threading.Lock()
+
+    def _discard(self, key):
+        expires_at, tenant, _ = self._entries.pop(key)
+        keys = self._by_tenant.get(tenant)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_tenant[tenant]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, tenant=None, timeout=None):
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (time.time() + timeout, tenant, value)
+            self._by_tenant.setdefault(tenant, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def delete_tenant(self, tenant):
+        with self._lock:
+            for key in list(self._by_tenant.get(tenant, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tenant.clear()
+
+
+class SQLiteCache:
+    """Cache em arquivo SQLite local, compartilhado entre processos"""
+
+    def __init__(self, path, max_entries=5000, default_timeout=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                ' key TEXT PRIMARY KEY, tenant TEXT, expires_at REAL NOT NULL, value BLOB NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_tenant ON cache_entries (tenant)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, tenant=None, timeout=None):
+        timeout = self.default_timeout if timeout is None else timeout
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, tenant, expires_at, value) VALUES (?, ?, ?, ?)',
+                (key, tenant, now + timeout, json.dumps(value))
+            )
+            conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+            # Acima do limite, descarta as entradas que expirariam primeiro
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                ' SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def delete_tenant(self, tenant):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM cache_entries WHERE tenant = ?', (tenant,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM cache_entries')
+
+
+def create_cache(config):
+    """Instancia o backend conforme ``CACHE_TYPE``"""
+    cache_type = (config.get('CACHE_TYPE') or 'null').lower()
+    timeout = config.get('CACHE_DEFAULT_TIMEOUT', 300)
+    threshold = config.get('CACHE_THRESHOLD', 500)
+
+    if cache_type in ('simple', 'lru'):
+        return LRUCache(max_entries=threshold, default_timeout=timeout)
+    if cache_type == 'sqlite':
+        path = os.path.join(config.get('CACHE_DIR') or 'instance', 'response_cache.sqlite')
+        return SQLiteCache(path, max_entries=threshold, default_timeout=timeout)
+    return NullCache()
+
+
+def get_cache():
+    return current_app.extensions.get('response_cache') or NullCache()
+
+
+# ==================== INVALIDAÇÃO POR ESCRITA ====================
+
+def _cache_after_commit(session):
+    touched = session.info.pop(TOUCHED_TENANTS_KEY, None)
+    if not touched:
+        return
+    try:
+        cache = get_cache()
+    except RuntimeError:
+        # Fora do contexto da aplicação não há cache para invalidar
+        return
+    for user_id in touched:
+        cache.delete_tenant(user_id)
+
+
+def init_cache(app):
+    """Cria o backend de cache e registra os listeners de invalidação"""
+    app.extensions['response_cache'] = create_cache(app.config)
+
+    if not event.contains(db.session, 'after_commit', _cache_after_commit):
+        event.listen(db.session, 'after_commit', _cache_after_commit)
+
+
+def cached_response(timeout=None):
+    """
+    Decorator que guarda a resposta 200 do handler por usuário.
+
+    A chave combina usuário, versão dos dados, endpoint e URL com query
+    string. Deve ser aplicado abaixo de ``@jwt_required()``.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            from flask_jwt_extended import get_jwt_identity
+
+            cache = get_cache()
+            if isinstance(cache, NullCache):
+                return func(*args, **kwargs)
+
+            user_id = str(get_jwt_identity())
+            version = get_tenant_version(user_id)
+            key = f"{user_id}|{version}|{request.endpoint}|{request.full_path}"
+
+            entry = cache.get(key)
+            if entry is not None:
+                response = make_response(entry['body'], entry['status'])
+                response.mimetype = entry['mimetype']
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = make_response(func(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough:
+                cache.set(key, {
+                    'body': response.get_data(as_text=True),
+                    'status': response.status_code,
+                    'mimetype': response.mimetype,
+                }, tenant=user_id, timeout=timeout)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
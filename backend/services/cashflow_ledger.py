@@ -0,0 +1,353 @@
+"""
+Ledger materializado do fluxo de caixa (tabela ``cashflow_monthly``)
+
+Cada linha guarda os totais de um mês do usuário (previsto, recebido,
+despesas e saldo do mês) e o saldo acumulado até aquele mês, de modo que
+``GET /api/cashflow/summary`` vira uma única leitura por faixa de chave.
+
+A manutenção é incremental: um listener ``after_flush`` coleta os meses
+afetados pelo flush (períodos, jogadores mensais/avulsos, despesas e saldo
+inicial) e recalcula apenas essas linhas na mesma transação, propagando a
+diferença de saldo para os meses seguintes com um único UPDATE.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import and_, event, func, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from .db.connection import db
+from .db.models import (
+    CashflowMonthly, CasualPlayer, Expense, MonthlyPeriod, MonthlyPlayer, User
+)
+
+ledger_table = CashflowMonthly.__table__
+
+# Tolerância usada na verificação contra a agregação ao vivo
+VERIFY_TOLERANCE = Decimal('0.01')
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return Decimal('0')
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _after_key(year: int, month: int):
+    """Condição para meses estritamente posteriores a (year, month)"""
+    return or_(
+        ledger_table.c.year > year,
+        and_(ledger_table.c.year == year, ledger_table.c.month > month)
+    )
+
+
+def _before_key(year: int, month: int):
+    """Condição para meses estritamente anteriores a (year, month)"""
+    return or_(
+        ledger_table.c.year < year,
+        and_(ledger_table.c.year == year, ledger_table.c.month < month)
+    )
+
+
+def _initial_balance(conn, user_id: str) -> Decimal:
+    value = conn.execute(
+        select(User.__table__.c.initial_balance).where(User.__table__.c.id == user_id)
+    ).scalar()
+    return _to_decimal(value)
+
+
+# ==================== MANUTENÇÃO INCREMENTAL ====================
+
+def refresh_month(conn, user_id: str, year: int, month: int) -> None:
+    """
+    Recalcula a linha (user_id, year, month) a partir das tabelas de origem
+    e desloca o saldo acumulado dos meses seguintes pela diferença de "net".
+
+    Args:
+        conn: Conexão da transação corrente
+        user_id: ID do usuário (tenant)
+        year: Ano do mês a recalcular
+        month: Mês a recalcular (1-12)
+    """
+    periods = MonthlyPeriod.__table__
+    expenses = Expense.__table__
+    key = and_(
+        ledger_table.c.user_id == user_id,
+        ledger_table.c.year == year,
+        ledger_table.c.month == month
+    )
+
+    period = conn.execute(
+        select(periods.c.name, periods.c.total_expected, periods.c.total_received).where(and_(
+            periods.c.user_id == user_id, periods.c.year == year, periods.c.month == month
+        ))
+    ).first()
+    existing = conn.execute(select(ledger_table.c.net).where(key)).first()
+    old_net = _to_decimal(existing.net) if existing else Decimal('0')
+
+    # O resumo só lista meses com período cadastrado
+    if period is None:
+        if existing is None:
+            return
+        conn.execute(ledger_table.delete().where(key))
+        new_net = Decimal('0')
+    else:
+        exp = conn.execute(
+            select(
+                func.coalesce(func.sum(expenses.c.amount), 0).label('total'),
+                func.count(expenses.c.id).label('count')
+            ).where(and_(
+                expenses.c.user_id == user_id, expenses.c.year == year, expenses.c.month == month
+            ))
+        ).first()
+        expected = _to_decimal(period.total_expected)
+        received = _to_decimal(period.total_received)
+        expenses_total = _to_decimal(exp.total)
+        new_net = received - expenses_total
+
+        previous = conn.execute(
+            select(ledger_table.c.balance).where(and_(
+                ledger_table.c.user_id == user_id, _before_key(year, month)
+            )).order_by(ledger_table.c.year.desc(), ledger_table.c.month.desc()).limit(1)
+        ).scalar()
+        base = _to_decimal(previous) if previous is not None else _initial_balance(conn, user_id)
+
+        values = {
+            'period_name': period.name,
+            'expected': expected,
+            'received': received,
+            'expenses_total': expenses_total,
+            'expenses_count': int(exp.count or 0),
+            'net': new_net,
+            'balance': base + new_net,
+            'updated_at': datetime.utcnow(),
+        }
+        if existing is None:
+            conn.execute(ledger_table.insert().values(user_id=user_id, year=year, month=month, **values))
+        else:
+            conn.execute(ledger_table.update().where(key).values(**values))
+
+    delta = new_net - old_net
+    if delta:
+        conn.execute(
+            ledger_table.update().where(and_(
+                ledger_table.c.user_id == user_id, _after_key(year, month)
+            )).values(balance=ledger_table.c.balance + delta)
+        )
+
+
+def shift_balances(conn, user_id: str, delta) -> None:
+    """Aplica a variação do saldo inicial a todas as linhas do usuário"""
+    delta = _to_decimal(delta)
+    if not delta:
+        return
+    conn.execute(
+        ledger_table.update().where(ledger_table.c.user_id == user_id)
+        .values(balance=ledger_table.c.balance + delta)
+    )
+
+
+def _old_value(obj, attr):
+    """Valor anterior ao flush de um atributo (ou o atual, se inalterado)"""
+    history = get_history(obj, attr)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _collect_changes(session: Session):
+    """
+    Coleta os meses afetados pelo flush corrente.
+
+    Returns:
+        Tuple (months, period_ids, balance_deltas) onde months é um conjunto
+        de (user_id, year, month), period_ids são períodos a resolver via SQL
+        e balance_deltas mapeia user_id -> variação do saldo inicial
+    """
+    months = set()
+    period_ids = set()
+    balance_deltas = {}
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, MonthlyPeriod):
+            months.add((obj.user_id, obj.year, obj.month))
+            months.add((_old_value(obj, 'user_id'), _old_value(obj, 'year'), _old_value(obj, 'month')))
+        elif isinstance(obj, Expense):
+            months.add((obj.user_id, obj.year, obj.month))
+            months.add((_old_value(obj, 'user_id'), _old_value(obj, 'year'), _old_value(obj, 'month')))
+        elif isinstance(obj, (MonthlyPlayer, CasualPlayer)):
+            period_ids.add(obj.monthly_period_id)
+            period_ids.add(_old_value(obj, 'monthly_period_id'))
+        elif isinstance(obj, User) and obj not in session.new and obj not in session.deleted:
+            history = get_history(obj, 'initial_balance')
+            if history.deleted and history.added:
+                delta = _to_decimal(history.added[0]) - _to_decimal(history.deleted[0])
+                balance_deltas[obj.id] = balance_deltas.get(obj.id, Decimal('0')) + delta
+
+    months = {m for m in months if None not in m}
+    period_ids.discard(None)
+    return months, period_ids, balance_deltas
+
+
+def _ledger_after_flush(session, flush_context):
+    months, period_ids, balance_deltas = _collect_changes(session)
+    if not (months or period_ids or balance_deltas):
+        return
+
+    conn = session.connection()
+    if period_ids:
+        periods = MonthlyPeriod.__table__
+        rows = conn.execute(
+            select(periods.c.user_id, periods.c.year, periods.c.month)
+            .where(periods.c.id.in_(period_ids))
+        ).all()
+        months.update((r.user_id, r.year, r.month) for r in rows)
+
+    for user_id, delta in balance_deltas.items():
+        shift_balances(conn, user_id, delta)
+
+    for user_id, year, month in sorted(months):
+        refresh_month(conn, user_id, year, month)
+
+
+def register_ledger_events() -> None:
+    """Registra o listener de manutenção do ledger (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _ledger_after_flush):
+        event.listen(db.session, 'after_flush', _ledger_after_flush)
+
+
+# ==================== LEITURA, RECONSTRUÇÃO E VERIFICAÇÃO ====================
+
+def ledger_rows(user_id: str, year: int = None, month: int = None):
+    """Linhas do ledger do usuário em ordem (year, month) ascendente"""
+    query = db.session.query(CashflowMonthly).filter(CashflowMonthly.user_id == user_id)
+    if year:
+        query = query.filter(CashflowMonthly.year == year)
+    if month:
+        query = query.filter(CashflowMonthly.month == month)
+    return query.order_by(CashflowMonthly.year.asc(), CashflowMonthly.month.asc()).all()
+
+
+def live_month_totals(user_id: str, year: int = None, month: int = None):
+    """
+    Agregação ao vivo (sem ledger): totais por mês calculados a partir de
+    ``monthly_periods`` e de um GROUP BY sobre ``expenses``.
+
+    Returns:
+        Lista de dicts {year, month, name, expected, received, expenses_total,
+        expenses_count, net} em ordem (year, month) ascendente
+    """
+    periods_q = db.session.query(MonthlyPeriod).filter(MonthlyPeriod.user_id == user_id)
+    if year:
+        periods_q = periods_q.filter(MonthlyPeriod.year == year)
+    if month:
+        periods_q = periods_q.filter(MonthlyPeriod.month == month)
+    periods = periods_q.order_by(MonthlyPeriod.year.asc(), MonthlyPeriod.month.asc()).all()
+
+    expenses_q = db.session.query(
+        Expense.year.label('year'),
+        Expense.month.label('month'),
+        func.coalesce(func.sum(Expense.amount), 0).label('total'),
+        func.count(Expense.id).label('count')
+    ).filter(Expense.user_id == user_id)
+    if year:
+        expenses_q = expenses_q.filter(Expense.year == year)
+    if month:
+        expenses_q = expenses_q.filter(Expense.month == month)
+    expenses_q = expenses_q.group_by(Expense.year, Expense.month)
+    expenses_agg = {(row.year, row.month): row for row in expenses_q.all()}
+
+    result = []
+    for p in periods:
+        exp = expenses_agg.get((p.year, p.month))
+        received = _to_decimal(p.total_received)
+        expenses_total = _to_decimal(exp.total) if exp else Decimal('0')
+        result.append({
+            'year': p.year,
+            'month': p.month,
+            'name': p.name,
+            'expected': _to_decimal(p.total_expected),
+            'received': received,
+            'expenses_total': expenses_total,
+            'expenses_count': int(exp.count) if exp else 0,
+            'net': received - expenses_total,
+        })
+    return result
+
+
+def rebuild_user(user_id: str) -> int:
+    """
+    Reconstrói do zero o ledger de um usuário (não faz commit).
+
+    Returns:
+        Quantidade de linhas gravadas
+    """
+    conn = db.session.connection()
+    conn.execute(ledger_table.delete().where(ledger_table.c.user_id == user_id))
+
+    balance = _initial_balance(conn, user_id)
+    rows = []
+    for item in live_month_totals(user_id):
+        balance += item['net']
+        rows.append({
+            'user_id': user_id,
+            'year': item['year'],
+            'month': item['month'],
+            'period_name': item['name'],
+            'expected': item['expected'],
+            'received': item['received'],
+            'expenses_total': item['expenses_total'],
+            'expenses_count': item['expenses_count'],
+            'net': item['net'],
+            'balance': balance,
+            'updated_at': datetime.utcnow(),
+        })
+    if rows:
+        conn.execute(ledger_table.insert(), rows)
+    return len(rows)
+
+
+def verify_user(user_id: str):
+    """
+    Compara o ledger do usuário com a agregação ao vivo.
+
+    Returns:
+        Lista de divergências (vazia se o ledger estiver consistente)
+    """
+    problems = []
+    stored = {(r.year, r.month): r for r in ledger_rows(user_id)}
+    balance = _initial_balance(db.session.connection(), user_id)
+
+    for item in live_month_totals(user_id):
+        key = (item['year'], item['month'])
+        balance += item['net']
+        row = stored.pop(key, None)
+        if row is None:
+            problems.append({'user_id': user_id, 'period': key, 'issue': 'missing'})
+            continue
+        expected_values = {
+            'expected': item['expected'],
+            'received': item['received'],
+            'expenses_total': item['expenses_total'],
+            'expenses_count': item['expenses_count'],
+            'net': item['net'],
+            'balance': balance,
+        }
+        for field, live_value in expected_values.items():
+            stored_value = getattr(row, field)
+            if abs(_to_decimal(stored_value) - _to_decimal(live_value)) > VERIFY_TOLERANCE:
+                problems.append({
+                    'user_id': user_id,
+                    'period': key,
+                    'issue': 'mismatch',
+                    'field': field,
+                    'stored': float(_to_decimal(stored_value)),
+                    'live': float(_to_decimal(live_value)),
+                })
+
+    for key in stored:
+        problems.append({'user_id': user_id, 'period': key, 'issue': 'orphan'})
+    return problems
@@ -0,0 +1,34 @@
+"""
+Funções SQL portáveis usadas nas escritas em lote (INSERT ... SELECT)
+"""
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class new_uuid(FunctionElement):
+    """UUID v4 em texto gerado pelo banco, um valor por linha do SELECT"""
+    type = String(36)
+    name = 'new_uuid'
+    inherit_cache = True
+
+
+@compiles(new_uuid)
+def _new_uuid_default(element, compiler, **kw):
+    # MySQL/MariaDB
+    return 'UUID()'
+
+
+@compiles(new_uuid, 'postgresql')
+def _new_uuid_postgresql(element, compiler, **kw):
+    return 'CAST(gen_random_uuid() AS VARCHAR(36))'
+
+
+@compiles(new_uuid, 'sqlite')
+def _new_uuid_sqlite(element, compiler, **kw):
+    # xxxxxxxx-xxxx-4xxx-[89ab]xxx-xxxxxxxxxxxx a partir de randomblob()
+    return (
+        "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || "
+        "substr(hex(randomblob(2)), 2) || '-' || substr('89ab', 1 + (abs(random()) % 4), 1) || "
+        "substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))"
+    )
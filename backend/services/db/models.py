@@ -10,7 +10,7 @@ from sqlalchemy import (
     Boolean, Column, DateTime, ForeignKey, Integer, 
     Numeric, String, Text, Date, func, UniqueConstraint, ForeignKeyConstraint
 )
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import column_property, relationship, validates
 from sqlalchemy import and_
 import uuid
 
@@ -52,6 +52,8 @@ class Player(db.Model):
     monthly_fee = Column(Numeric(10, 2), nullable=False, default=100.00)
     is_active = Column(Boolean, nullable=False, default=True)
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
+    # Nome/telefone/e-mail normalizados para busca (services/player_search.py)
+    search_text = Column(String(300), nullable=True)
     
     # Timestamps
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -163,8 +165,12 @@ class MonthlyPlayer(db.Model):
     )
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    player_id = Column(String(36), ForeignKey('players.id'), nullable=False)
-    monthly_period_id = Column(String(36), ForeignKey('monthly_periods.id'), nullable=False)
+    # active_history: valor anterior carregado mesmo com o atributo expirado,
+    # para os totais do período e a inadimplência calcularem o estado antigo
+    player_id = column_property(Column(String(36), ForeignKey('players.id'), nullable=False), active_history=True)
+    monthly_period_id = column_property(
+        Column(String(36), ForeignKey('monthly_periods.id'), nullable=False), active_history=True
+    )
     user_id = Column(String(36), ForeignKey('users.id'), nullable=False)
     
     # Dados do jogador no momento (snapshot)
@@ -172,12 +178,15 @@ class MonthlyPlayer(db.Model):
     position = Column(String(50), nullable=False)
     phone = Column(String(20), nullable=False)
     email = Column(String(100), nullable=False)
-    monthly_fee = Column(Numeric(10, 2), nullable=False)  # Taxa padrão do jogador
-    custom_monthly_fee = Column(Numeric(10, 2), nullable=True)  # Taxa customizada para este mês específico
+    monthly_fee = column_property(Column(Numeric(10, 2), nullable=False), active_history=True)  # Taxa padrão do jogador
+    # Taxa customizada para este mês específico
+    custom_monthly_fee = column_property(Column(Numeric(10, 2), nullable=True), active_history=True)
     join_date = Column(Date, nullable=False)
     
     # Status do pagamento
-    status = Column(String(20), nullable=False, default=PaymentStatus.PENDING.value)
+    status = column_property(
+        Column(String(20), nullable=False, default=PaymentStatus.PENDING.value), active_history=True
+    )
     payment_date = Column(DateTime, nullable=True)
     pending_months_count = Column(Integer, nullable=False, default=0)
     
@@ -300,6 +309,50 @@ class Expense(db.Model):
         return f"<Expense(id={self.id}, description='{self.description}', amount={self.amount})>"
 
 
+class CashflowMonthly(db.Model):
+    """Ledger materializado do fluxo de caixa (uma linha por usuário/mês)
+
+    Mantido incrementalmente por ``services/cashflow_ledger.py`` a cada flush
+    que altera períodos, pagamentos, despesas ou o saldo inicial do usuário.
+    """
+    __tablename__ = 'cashflow_monthly'
+
+    user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)  # 1-12
+    period_name = Column(String(50), nullable=False)
+
+    # Totais do mês
+    expected = Column(Numeric(12, 2), nullable=False, default=0)
+    received = Column(Numeric(12, 2), nullable=False, default=0)
+    expenses_total = Column(Numeric(12, 2), nullable=False, default=0)
+    expenses_count = Column(Integer, nullable=False, default=0)
+    net = Column(Numeric(12, 2), nullable=False, default=0)
+    # Saldo acumulado: saldo inicial do usuário + soma dos "net" até este mês
+    balance = Column(Numeric(12, 2), nullable=False, default=0)
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CashflowMonthly(user_id={self.user_id}, {self.month:02d}/{self.year}, balance={self.balance})>"
+
+
+class TenantVersion(db.Model):
+    """Contador de versão dos dados de cada usuário (tenant)
+
+    Incrementado a cada flush que toca linhas do usuário; usado para gerar
+    ETags e responder GETs condicionais sem consultar as tabelas de dados.
+    """
+    __tablename__ = 'tenant_versions'
+
+    user_id = Column(String(36), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TenantVersion(user_id={self.user_id}, version={self.version})>"
+
+
 # Índices compostos para performance
 from sqlalchemy import Index
 
@@ -309,6 +362,9 @@ Index('idx_monthly_players_period', MonthlyPlayer.monthly_period_id, MonthlyPlay
 # Índice para buscar jogadores casuais por período
 Index('idx_casual_players_period', CasualPlayer.monthly_period_id, CasualPlayer.status)
 
+# Histórico do jogador: jogos avulsos pelo nome dentro do usuário
+Index('idx_casual_players_user_name', CasualPlayer.user_id, CasualPlayer.player_name)
+
 # Índice para buscar despesas por período
 Index('idx_expenses_period', Expense.monthly_period_id, Expense.month, Expense.year)
 
@@ -319,6 +375,18 @@ Index('idx_monthly_periods_unique', MonthlyPeriod.month, MonthlyPeriod.year, Mon
 Index('idx_expenses_user_year_month', Expense.user_id, Expense.year, Expense.month)
 Index('idx_monthly_periods_user_year_month', MonthlyPeriod.user_id, MonthlyPeriod.year, MonthlyPeriod.month)
 
+# Paginação por cursor de jogadores: chave (name, id) dentro do usuário
+Index('idx_players_user_name_id', Player.user_id, Player.name, Player.id)
+
+# Meses em aberto por jogador (débitos/inadimplência): índice parcial só com as
+# linhas não pagas; o predicado é o mesmo de delinquency.UNPAID_STATUSES
+Index(
+    'idx_monthly_players_unpaid',
+    MonthlyPlayer.user_id, MonthlyPlayer.player_id, MonthlyPlayer.monthly_period_id,
+    postgresql_where=MonthlyPlayer.status.in_(('pending', 'overdue')),
+    sqlite_where=MonthlyPlayer.status.in_(('pending', 'overdue')),
+)
+
 class User(db.Model):
     """Modelo de usuário para autenticação e perfil"""
     __tablename__ = 'users'
@@ -0,0 +1,287 @@
+"""
+Inadimplência: meses consecutivos em aberto e débitos por jogador
+
+``monthly_players.pending_months_count`` guarda, em cada mês do jogador,
+quantos meses seguidos ele está em aberto até aquele mês (inclusive): zero
+se pagou, 1 no primeiro mês em aberto após um pagamento, 2 no seguinte etc.
+
+O valor é calculado por funções de janela sobre o histórico do jogador em
+ordem (year, month) — um ``SUM`` acumulado dos meses pagos separa as
+sequências ("gaps and islands") e um segundo ``SUM`` conta os meses em aberto
+dentro de cada sequência — e gravado por um único ``UPDATE ... FROM``.
+
+A manutenção é incremental: um listener ``after_flush`` recalcula apenas os
+jogadores cujos meses foram inseridos, removidos ou mudaram de status no
+flush (um novo mês ou um pagamento antigo altera a contagem dos meses
+seguintes). Escritas em lote feitas fora do ORM (UPDATE/INSERT via Core)
+chamam ``refresh`` explicitamente.
+
+``outstanding_debts`` lista os devedores (quantidade de meses e valor em
+aberto) a partir do índice parcial ``idx_monthly_players_unpaid``.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, event, func, or_, select, true, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from .db.connection import db
+from .db.models import MonthlyPeriod, MonthlyPlayer, Player
+
+monthly_players = MonthlyPlayer.__table__
+periods_table = MonthlyPeriod.__table__
+
+# Status de um mês em aberto (mesmo predicado do índice parcial)
+UNPAID_STATUSES = ('pending', 'overdue')
+
+# Atributos de MonthlyPlayer que alteram a contagem
+TRACKED_ATTRIBUTES = ('status', 'monthly_period_id', 'player_id')
+
+
+class DebtRow(NamedTuple):
+    player_id: str
+    name: str
+    position: str
+    phone: str
+    status: str
+    unpaid_months: int
+    consecutive_unpaid_months: int
+    outstanding_amount: Decimal
+    oldest_unpaid: int
+    latest_unpaid: int
+
+
+def unpaid_condition(table=monthly_players):
+    return table.c.status.in_(UNPAID_STATUSES)
+
+
+def _history_order():
+    return periods_table.c.year, periods_table.c.month
+
+
+def _player_scope(player_ids: Optional[Iterable[str]], period_ids: Optional[Iterable[str]]):
+    """Jogadores a recalcular: os informados e/ou os presentes nos períodos (padrão: todos)"""
+    conditions = []
+    if player_ids is not None:
+        conditions.append(monthly_players.c.player_id.in_(list(player_ids)))
+    if period_ids is not None:
+        enrolled = monthly_players.alias('enrolled')
+        conditions.append(monthly_players.c.player_id.in_(
+            select(enrolled.c.player_id).where(enrolled.c.monthly_period_id.in_(list(period_ids)))
+        ))
+    return or_(*conditions) if conditions else true()
+
+
+def streaks_query(user_id: str, player_ids: Optional[Iterable[str]] = None,
+                  period_ids: Optional[Iterable[str]] = None):
+    """
+    SELECT (id, streak) com a contagem de meses consecutivos em aberto de
+    cada jogador mensal do escopo, calculada sobre o histórico completo.
+    """
+    paid_so_far = func.sum(case((unpaid_condition(), 0), else_=1)).over(
+        partition_by=monthly_players.c.player_id, order_by=_history_order(), rows=(None, 0)
+    )
+    ordered = select(
+        monthly_players.c.id,
+        monthly_players.c.player_id,
+        periods_table.c.year,
+        periods_table.c.month,
+        case((unpaid_condition(), 1), else_=0).label('unpaid'),
+        paid_so_far.label('run'),
+    ).select_from(
+        monthly_players.join(periods_table, periods_table.c.id == monthly_players.c.monthly_period_id)
+    ).where(and_(
+        monthly_players.c.user_id == user_id,
+        _player_scope(player_ids, period_ids),
+    )).subquery('ordered')
+
+    # Cada mês pago abre uma sequência nova: conta os meses em aberto dentro dela
+    streak = func.sum(ordered.c.unpaid).over(
+        partition_by=(ordered.c.player_id, ordered.c.run),
+        order_by=(ordered.c.year, ordered.c.month),
+        rows=(None, 0),
+    )
+    return select(ordered.c.id, streak.label('streak'))
+
+
+def refresh(conn, user_id: str, player_ids: Optional[Iterable[str]] = None,
+            period_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recalcula ``pending_months_count`` dos jogadores do escopo com um único
+    ``UPDATE ... FROM`` (só as linhas cujo valor mudou são escritas).
+
+    Args:
+        conn: Conexão da transação corrente
+        user_id: ID do usuário (tenant)
+        player_ids: Jogadores a recalcular
+        period_ids: Recalcula os jogadores presentes nestes períodos
+            (sem ``player_ids`` nem ``period_ids``: todos os do usuário)
+
+    Returns:
+        Quantidade de jogadores mensais alterados
+    """
+    if player_ids is not None and not player_ids and not period_ids:
+        return 0
+    streaks = streaks_query(user_id, player_ids, period_ids).subquery('streaks')
+    result = conn.execute(
+        update(monthly_players)
+        .where(and_(
+            monthly_players.c.id == streaks.c.id,
+            monthly_players.c.pending_months_count != streaks.c.streak,
+        ))
+        # Contador derivado: não altera updated_at (onupdate da coluna)
+        .values(pending_months_count=streaks.c.streak, updated_at=monthly_players.c.updated_at)
+    )
+    return result.rowcount
+
+
+# ==================== MANUTENÇÃO INCREMENTAL ====================
+
+def _old_value(obj, attr):
+    history = get_history(obj, attr)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _collect_changes(session: Session) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """
+    Jogadores e períodos afetados pelo flush corrente, por usuário.
+
+    Returns:
+        Tuple (players, periods): user_id -> ids de jogadores a recalcular e
+        user_id -> ids de períodos que mudaram de mês (afetam a ordem)
+    """
+    players: Dict[str, Set[str]] = {}
+    periods: Dict[str, Set[str]] = {}
+
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, MonthlyPlayer):
+            players.setdefault(obj.user_id, set()).add(obj.player_id)
+    for obj in session.dirty:
+        if isinstance(obj, MonthlyPlayer) and obj not in session.deleted:
+            if any(get_history(obj, attr).has_changes() for attr in TRACKED_ATTRIBUTES):
+                players.setdefault(obj.user_id, set()).update((obj.player_id, _old_value(obj, 'player_id')))
+        elif isinstance(obj, MonthlyPeriod) and obj not in session.deleted:
+            if get_history(obj, 'year').has_changes() or get_history(obj, 'month').has_changes():
+                periods.setdefault(obj.user_id, set()).add(obj.id)
+
+    for ids in players.values():
+        ids.discard(None)
+    players.pop(None, None)
+    periods.pop(None, None)
+    return players, periods
+
+
+def _delinquency_after_flush(session, flush_context):
+    players, periods = _collect_changes(session)
+    if not (players or periods):
+        return
+    conn = session.connection()
+    for user_id in sorted(set(players) | set(periods)):
+        refresh(conn, user_id, players.get(user_id, set()), periods.get(user_id))
+
+
+def register_delinquency_events() -> None:
+    """Registra o listener de manutenção da inadimplência (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _delinquency_after_flush):
+        event.listen(db.session, 'after_flush', _delinquency_after_flush)
+
+
+# ==================== DÉBITOS E VERIFICAÇÃO ====================
+
+def outstanding_debts(user_id: str, min_consecutive: int = 0, limit: Optional[int] = None) -> List[DebtRow]:
+    """
+    Jogadores com meses em aberto, do maior valor devido para o menor.
+
+    Args:
+        user_id: ID do usuário (tenant)
+        min_consecutive: Mínimo de meses consecutivos em aberto no mês mais
+            recente do jogador (0: qualquer débito)
+        limit: Máximo de jogadores retornados
+
+    Returns:
+        Lista de ``DebtRow``; ``oldest_unpaid``/``latest_unpaid`` no formato
+        ``year * 100 + month``
+    """
+    effective_fee = func.coalesce(monthly_players.c.custom_monthly_fee, monthly_players.c.monthly_fee)
+    month_key = periods_table.c.year * 100 + periods_table.c.month
+    joined = monthly_players.join(periods_table, periods_table.c.id == monthly_players.c.monthly_period_id)
+
+    # Agregação dos meses em aberto (índice parcial por usuário/jogador)
+    debts = select(
+        monthly_players.c.player_id,
+        func.count().label('unpaid_months'),
+        func.sum(effective_fee).label('outstanding_amount'),
+        func.min(month_key).label('oldest_unpaid'),
+        func.max(month_key).label('latest_unpaid'),
+    ).select_from(joined).where(and_(
+        monthly_players.c.user_id == user_id, unpaid_condition()
+    )).group_by(monthly_players.c.player_id).subquery('debts')
+
+    # Contagem gravada no mês mais recente de cada devedor
+    recency = func.row_number().over(
+        partition_by=monthly_players.c.player_id,
+        order_by=(periods_table.c.year.desc(), periods_table.c.month.desc()),
+    )
+    latest = select(
+        monthly_players.c.player_id,
+        monthly_players.c.pending_months_count,
+        recency.label('recency'),
+    ).select_from(joined).where(and_(
+        monthly_players.c.user_id == user_id,
+        monthly_players.c.player_id.in_(select(debts.c.player_id)),
+    )).subquery('latest')
+
+    players = Player.__table__
+    stmt = select(
+        debts.c.player_id, players.c.name, players.c.position, players.c.phone, players.c.status,
+        debts.c.unpaid_months, latest.c.pending_months_count, debts.c.outstanding_amount,
+        debts.c.oldest_unpaid, debts.c.latest_unpaid,
+    ).select_from(
+        debts.join(players, players.c.id == debts.c.player_id)
+        .join(latest, and_(latest.c.player_id == debts.c.player_id, latest.c.recency == 1))
+    ).order_by(debts.c.outstanding_amount.desc(), players.c.name, debts.c.player_id)
+    if min_consecutive:
+        stmt = stmt.where(latest.c.pending_months_count >= min_consecutive)
+    if limit:
+        stmt = stmt.limit(limit)
+    return [DebtRow._make(row) for row in db.session.execute(stmt)]
+
+
+def _month_label(key: int) -> str:
+    return f"{key % 100:02d}/{key // 100}"
+
+
+def debt_dict(row: DebtRow) -> dict:
+    return {
+        'player_id': row.player_id,
+        'player_name': row.name,
+        'position': row.position,
+        'phone': row.phone or '',
+        'player_status': row.status,
+        'unpaid_months': int(row.unpaid_months),
+        'consecutive_unpaid_months': int(row.consecutive_unpaid_months),
+        'outstanding_amount': float(row.outstanding_amount or 0),
+        'oldest_unpaid_period': _month_label(row.oldest_unpaid),
+        'latest_unpaid_period': _month_label(row.latest_unpaid),
+    }
+
+
+def verify_user(user_id: str) -> List[dict]:
+    """
+    Compara ``pending_months_count`` gravado com o recálculo completo.
+
+    Returns:
+        Lista de divergências {monthly_player_id, stored, live}
+    """
+    live = {row.id: int(row.streak) for row in db.session.execute(streaks_query(user_id))}
+    stored = db.session.execute(
+        select(monthly_players.c.id, monthly_players.c.pending_months_count)
+        .where(monthly_players.c.user_id == user_id)
+    )
+    return [
+        {'monthly_player_id': row.id, 'stored': row.pending_months_count, 'live': live.get(row.id, 0)}
+        for row in stored if row.pending_months_count != live.get(row.id, 0)
+    ]
@@ -0,0 +1,201 @@
+"""
+Exportações em streaming (CSV e NDJSON) do histórico do usuário
+
+Cada recurso (jogadores, mensalidades, despesas e fluxo de caixa) é um SELECT
+de colunas lido com ``yield_per``: o driver entrega as linhas em lotes
+(cursor do lado do servidor no PostgreSQL via ``stream_results``) e cada lote
+é codificado e enviado antes do próximo ser buscado. O worker nunca guarda o
+resultado inteiro, então a memória não cresce com anos de histórico.
+
+Com gzip o corpo é comprimido em fluxo (``zlib``) pelo próprio gerador; a
+resposta já sai com ``Content-Encoding`` e o Flask-Compress não a bufferiza.
+"""
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import and_, select
+
+from .db.connection import db
+from .db.models import CashflowMonthly, Expense, MonthlyPeriod, MonthlyPlayer, Player
+
+# Linhas buscadas do banco por lote (e por pedaço enviado ao cliente)
+DEFAULT_YIELD_PER = 1000
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class ExportQuery(NamedTuple):
+    """SELECT de um recurso e os nomes das colunas na ordem do arquivo"""
+    columns: Sequence[str]
+    statement: object
+
+
+# ==================== CONSULTAS POR RECURSO ====================
+
+def _players(user_id: str, year: Optional[int], period_id: Optional[str]) -> ExportQuery:
+    stmt = select(
+        Player.id, Player.name, Player.position, Player.phone, Player.email,
+        Player.monthly_fee, Player.status, Player.join_date, Player.created_at,
+    ).where(Player.user_id == user_id)
+    if period_id:
+        # Jogadores inscritos no período
+        stmt = stmt.where(Player.id.in_(
+            select(MonthlyPlayer.player_id).where(and_(
+                MonthlyPlayer.monthly_period_id == period_id, MonthlyPlayer.user_id == user_id
+            ))
+        ))
+    if year:
+        stmt = stmt.where(Player.join_date >= date(year, 1, 1), Player.join_date <= date(year, 12, 31))
+    stmt = stmt.order_by(Player.name, Player.id)
+    return ExportQuery(
+        ('id', 'name', 'position', 'phone', 'email', 'monthly_fee', 'status', 'join_date', 'created_at'),
+        stmt,
+    )
+
+
+def _monthly_payments(user_id: str, year: Optional[int], period_id: Optional[str]) -> ExportQuery:
+    stmt = select(
+        MonthlyPeriod.year, MonthlyPeriod.month, MonthlyPlayer.player_id, MonthlyPlayer.player_name,
+        MonthlyPlayer.position, MonthlyPlayer.phone, MonthlyPlayer.monthly_fee,
+        MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.status, MonthlyPlayer.payment_date,
+        MonthlyPlayer.pending_months_count,
+    ).join(MonthlyPeriod, MonthlyPeriod.id == MonthlyPlayer.monthly_period_id).where(
+        MonthlyPlayer.user_id == user_id
+    )
+    if year:
+        stmt = stmt.where(MonthlyPeriod.year == year)
+    if period_id:
+        stmt = stmt.where(MonthlyPlayer.monthly_period_id == period_id)
+    stmt = stmt.order_by(MonthlyPeriod.year, MonthlyPeriod.month, MonthlyPlayer.player_name, MonthlyPlayer.id)
+    return ExportQuery(
+        ('year', 'month', 'player_id', 'player_name', 'position', 'phone', 'monthly_fee',
+         'custom_monthly_fee', 'status', 'payment_date', 'pending_months_count'),
+        stmt,
+    )
+
+
+def _expenses(user_id: str, year: Optional[int], period_id: Optional[str]) -> ExportQuery:
+    stmt = select(
+        Expense.year, Expense.month, Expense.id, Expense.date, Expense.description,
+        Expense.category, Expense.amount,
+    ).where(Expense.user_id == user_id)
+    if year:
+        stmt = stmt.where(Expense.year == year)
+    if period_id:
+        stmt = stmt.where(Expense.monthly_period_id == period_id)
+    # Ordem do índice idx_expenses_user_year_month
+    stmt = stmt.order_by(Expense.year, Expense.month, Expense.date, Expense.id)
+    return ExportQuery(('year', 'month', 'id', 'expense_date', 'description', 'category', 'amount'), stmt)
+
+
+def _cashflow(user_id: str, year: Optional[int], period_id: Optional[str]) -> ExportQuery:
+    ledger = CashflowMonthly
+    stmt = select(
+        ledger.year, ledger.month, ledger.period_name, ledger.expected, ledger.received,
+        ledger.expenses_total, ledger.expenses_count, ledger.net, ledger.balance,
+    ).where(ledger.user_id == user_id)
+    if year:
+        stmt = stmt.where(ledger.year == year)
+    if period_id:
+        stmt = stmt.join(MonthlyPeriod, and_(
+            MonthlyPeriod.user_id == ledger.user_id,
+            MonthlyPeriod.year == ledger.year,
+            MonthlyPeriod.month == ledger.month,
+        )).where(MonthlyPeriod.id == period_id)
+    stmt = stmt.order_by(ledger.year, ledger.month)
+    return ExportQuery(
+        ('year', 'month', 'period_name', 'expected', 'received', 'expenses_total',
+         'expenses_count', 'net', 'balance'),
+        stmt,
+    )
+
+
+EXPORTS: Dict[str, Callable[[str, Optional[int], Optional[str]], ExportQuery]] = {
+    'players': _players,
+    'monthly-payments': _monthly_payments,
+    'expenses': _expenses,
+    'cashflow': _cashflow,
+}
+
+
+# ==================== LEITURA E CODIFICAÇÃO ====================
+
+def iter_batches(statement, yield_per: int = DEFAULT_YIELD_PER) -> Iterator[list]:
+    """Executa ``statement`` em streaming e devolve as linhas em lotes de até ``yield_per``"""
+    result = db.session.execute(statement.execution_options(yield_per=yield_per, stream_results=True))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(columns: Sequence[str], batches: Iterable[list]) -> Iterator[bytes]:
+    """Cabeçalho e um pedaço de bytes por lote (``Decimal`` mantém as casas decimais)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def encode_ndjson(columns: Sequence[str], batches: Iterable[list]) -> Iterator[bytes]:
+    """Um objeto JSON por linha, com os tipos das respostas da API (provider ``app.json``)"""
+    dumps = current_app.json.dumps
+    for batch in batches:
+        lines = [dumps(dict(zip(columns, row)), sort_keys=False) for row in batch]
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+ENCODERS = {
+    'csv': encode_csv,
+    'ndjson': encode_ndjson,
+}
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Comprime os pedaços em fluxo no formato gzip (memória limitada à janela do zlib)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(resource: str, fmt: str, user_id: str, year: Optional[int] = None,
+                  period_id: Optional[str] = None, yield_per: int = DEFAULT_YIELD_PER) -> Iterator[bytes]:
+    """
+    Gerador com o arquivo de ``resource`` do usuário no formato ``fmt``.
+
+    Args:
+        resource: Chave de ``EXPORTS``
+        fmt: Chave de ``ENCODERS`` (csv ou ndjson)
+        user_id: ID do usuário (tenant)
+        year: Filtra pelo ano (mês de referência; jogadores: ano de entrada)
+        period_id: Filtra pelo período mensal
+        yield_per: Linhas por lote buscado no banco
+    """
+    query = EXPORTS[resource](user_id, year, period_id)
+    return ENCODERS[fmt](query.columns, iter_batches(query.statement, yield_per))
@@ -0,0 +1,89 @@
+"""
+Provider JSON da aplicação (``app.json``): serialização em uma passada
+
+Todo ``jsonify`` (``APIResponse`` e handlers que montam o dict à mão) passa
+por aqui. Tipos que a API devolve são tratados direto no encoder, sem
+percorrer o payload antes:
+- ``Decimal`` → número (float);
+- ``datetime``/``date``/``time`` → ISO 8601;
+- objetos com ``to_dict()`` (modelos) → o dict;
+- dataclasses, ``UUID`` e conjuntos.
+
+Com ``orjson`` instalado a codificação é feita por ele (ordem de chaves e
+indentação do Flask preservadas); sem ele, ou para valores que o orjson
+não aceita (ex.: inteiros acima de 64 bits), usa ``json`` da biblioteca
+padrão com o mesmo ``default``. O tempo de codificação entra na fase
+``serialize`` do Server-Timing.
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+from .server_timing import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+
+def _default(o):
+    """Conversão dos tipos não nativos do JSON"""
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if hasattr(o, 'to_dict'):
+        return o.to_dict()
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` com ``_default`` acima e caminho rápido via orjson"""
+
+    default = staticmethod(_default)
+    # UTF-8 direto (igual ao orjson): payloads menores que com escapes \\uXXXX
+    ensure_ascii = False
+
+    def _encode(self, obj, pretty: bool) -> bytes:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=_default, option=option)
+            except (orjson.JSONEncodeError, TypeError):
+                pass  # cai no encoder da biblioteca padrão (mesmo erro se o tipo não for suportado)
+
+        if pretty:
+            return json.dumps(obj, default=_default, ensure_ascii=self.ensure_ascii,
+                              sort_keys=self.sort_keys, indent=2).encode()
+        return json.dumps(obj, default=_default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(',', ':')).encode()
+
+    def response(self, *args, **kwargs):
+        """Como o do Flask, mas codifica direto em bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        with timed('serialize'):
+            body = self._encode(obj, pretty)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def init_json_provider(app) -> None:
+    """Instala o provider em ``app.json``"""
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,459 @@
+"""
+Métricas de requisições e do pool de conexões (``GET /metrics``)
+
+Cada worker do gunicorn acumula contadores e histogramas em memória e grava
+periodicamente um snapshot em ``METRICS_DIR/<pid>.json`` (escrita atômica,
+no máximo a cada ``METRICS_FLUSH_INTERVAL`` segundos; uma thread em segundo
+plano grava o que ficou pendente num worker ocioso e o ``atexit`` grava o
+resto quando o worker encerra). O ``/metrics`` soma
+os arquivos de todos os workers, então qualquer worker responde com os
+números do servidor inteiro. Snapshots de workers encerrados (reciclados
+por ``--max-requests``) são incorporados a ``archive.json`` para os
+contadores continuarem cumulativos sem acumular arquivos.
+
+Sem ``METRICS_DIR`` as métricas são só do processo (dev/testes).
+
+Métricas:
+- ``http_requests_total{method,endpoint,status}``
+- ``http_request_duration_seconds{method,endpoint}`` (histograma)
+- ``db_pool_checkouts_total`` / ``db_pool_connections_total``
+- ``db_pool_checkout_wait_seconds`` (histograma)
+
+Formato texto do Prometheus (p95/p99 via ``histogram_quantile``) ou
+``/metrics?format=json`` com os percentis estimados por rota.
+
+Acesso: endereços em ``METRICS_ALLOWED_IPS`` (padrão só loopback) ou
+``Authorization: Bearer <METRICS_TOKEN>``; os demais recebem 403.
+"""
+import atexit
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from flask import Response, current_app, g, jsonify, request
+from sqlalchemy import event
+
+from .db.connection import db
+
+try:  # Trava de arquivo para compactar snapshots (indisponível no Windows)
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Chave em ``app.extensions``
+EXTENSION_KEY = 'metrics'
+
+ARCHIVE_FILE = 'archive.json'
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+HELP = {
+    'http_requests_total': ('counter', 'Requisições HTTP por rota, método e status'),
+    'http_request_duration_seconds': ('histogram', 'Duração das requisições HTTP'),
+    'db_pool_checkouts_total': ('counter', 'Conexões retiradas do pool'),
+    'db_pool_connections_total': ('counter', 'Conexões DBAPI abertas pelo pool'),
+    'db_pool_checkout_wait_seconds': ('histogram', 'Espera para obter uma conexão do pool'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _key(name: str, labels: Labels) -> str:
+    return json.dumps([name, [list(pair) for pair in labels]], separators=(',', ':'))
+
+
+def _parse_key(key: str) -> Tuple[str, Labels]:
+    name, labels = json.loads(key)
+    return name, tuple(tuple(pair) for pair in labels)
+
+
+class MetricsRegistry:
+    """Contadores e histogramas do processo com snapshot em arquivo por pid"""
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+        self._flusher_pid = None
+        self._stopped = threading.Event()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _registries.add(self)
+
+    # ---------- registro ----------
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name: str, value: float, buckets, labels: Labels = ()) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = {
+                    'le': list(buckets), 'counts': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0
+                }
+            hist['counts'][bisect_left(hist['le'], value)] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+            self._dirty = True
+
+    def on_checkout(self, *args) -> None:
+        self.inc('db_pool_checkouts_total')
+
+    def on_connect(self, *args) -> None:
+        self.inc('db_pool_connections_total')
+
+    # ---------- snapshot entre processos ----------
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'histograms': {k: dict(v, counts=list(v['counts'])) for k, v in self._histograms.items()},
+            }
+
+    def flush(self, force: bool = False) -> None:
+        """Grava o snapshot do processo (respeitando o intervalo, salvo ``force``)"""
+        if not self.directory:
+            return
+        self._ensure_flusher()
+        if not self._dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        with self._flush_lock:
+            # Snapshot e escrita juntos: um snapshot antigo não sobrescreve um novo
+            self._last_flush = now
+            self._dirty = False
+            path = os.path.join(self.directory, f'{os.getpid()}.json')
+            _write_json(path, self._snapshot())
+
+    def _ensure_flusher(self) -> None:
+        """Inicia a thread de gravação periódica (uma por processo: threads não sobrevivem ao fork)"""
+        pid = os.getpid()
+        if self._flusher_pid == pid or self._stopped.is_set():
+            return
+        self._flusher_pid = pid
+        self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        # Sem requisições novas o after_request não grava: o pendente sai por aqui
+        while not self._stopped.wait(max(self.flush_interval, 0.05)):
+            self.flush(force=True)
+
+    def close(self) -> None:
+        """Para a thread de gravação e grava o que estiver pendente"""
+        self._stopped.set()
+        self.flush(force=True)
+
+    def _reset_after_fork(self) -> None:
+        # O worker começa vazio: o que o master registrou fica só no snapshot do master
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self._flusher = None
+        self._flusher_pid = None
+
+    def collect(self) -> dict:
+        """Snapshot agregado de todos os processos"""
+        if not self.directory:
+            return self._snapshot()
+
+        self.flush(force=True)
+        self._compact_dead_workers()
+        total = {'counters': {}, 'histograms': {}}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            snapshot = _read_json(path)
+            if snapshot:
+                _merge(total, snapshot)
+        return total
+
+    def _compact_dead_workers(self) -> None:
+        """Incorpora a ``archive.json`` os snapshots de pids que não existem mais"""
+        if fcntl is None:
+            return
+        lock_path = os.path.join(self.directory, '.lock')
+        with open(lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            archive = None
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                pid = os.path.basename(path)[:-len('.json')]
+                if not pid.isdigit() or _pid_alive(int(pid)):
+                    continue
+                snapshot = _read_json(path)
+                if archive is None:
+                    archive = _read_json(archive_path) or {'counters': {}, 'histograms': {}}
+                if snapshot:
+                    _merge(archive, snapshot)
+                # Grava o arquivo antes de remover o snapshot: nada é contado duas vezes nem perdido
+                _write_json(archive_path, archive)
+                os.remove(path)
+
+
+# Registries vivos do processo (gravação final no atexit, reinício no fork)
+_registries = weakref.WeakSet()
+
+
+def _flush_all_at_exit() -> None:
+    """Grava os snapshots pendentes ao encerrar o processo (ex.: worker reciclado por --max-requests)"""
+    for registry in list(_registries):
+        registry.close()
+
+
+def _reset_all_in_child() -> None:
+    for registry in list(_registries):
+        registry._reset_after_fork()
+
+
+atexit.register(_flush_all_at_exit)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_all_in_child)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(data, fh, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(total: dict, snapshot: dict) -> None:
+    for key, value in snapshot.get('counters', {}).items():
+        total['counters'][key] = total['counters'].get(key, 0) + value
+    for key, hist in snapshot.get('histograms', {}).items():
+        current = total['histograms'].get(key)
+        if current is None:
+            total['histograms'][key] = dict(hist, counts=list(hist['counts']))
+        else:
+            current['counts'] = [a + b for a, b in zip(current['counts'], hist['counts'])]
+            current['sum'] += hist['sum']
+            current['count'] += hist['count']
+
+
+# ==================== EXPOSIÇÃO ====================
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        f'{k}="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for k, v in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """Formato texto de exposição do Prometheus"""
+    series: Dict[str, List[str]] = {}
+    for key, value in sorted(snapshot['counters'].items()):
+        name, labels = _parse_key(key)
+        series.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value:g}')
+    for key, hist in sorted(snapshot['histograms'].items()):
+        name, labels = _parse_key(key)
+        lines = series.setdefault(name, [])
+        cumulative = 0
+        for le, count in zip(list(hist['le']) + ['+Inf'], hist['counts']):
+            cumulative += count
+            lines.append(f'{name}_bucket{_format_labels(labels, (("le", f"{le:g}" if le != "+Inf" else le),))} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {hist["sum"]:.6f}')
+        lines.append(f'{name}_count{_format_labels(labels)} {hist["count"]}')
+
+    output = []
+    for name, lines in series.items():
+        kind, help_text = HELP.get(name, ('untyped', name))
+        output.append(f'# HELP {name} {help_text}')
+        output.append(f'# TYPE {name} {kind}')
+        output.extend(lines)
+    return '\n'.join(output) + '\n'
+
+
+def histogram_quantile(q: float, hist: dict) -> Optional[float]:
+    """Percentil estimado por interpolação linear dentro do bucket (como no Prometheus)"""
+    if not hist['count']:
+        return None
+    rank = q * hist['count']
+    cumulative, lower = 0, 0.0
+    for upper, count in zip(hist['le'], hist['counts']):
+        if cumulative + count >= rank:
+            if count == 0:
+                return upper
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+        lower = upper
+    # Caiu no bucket +Inf: o melhor limite conhecido é o último bucket finito
+    return hist['le'][-1]
+
+
+def summarize(snapshot: dict) -> dict:
+    """Resumo JSON: contagem, status e p50/p95/p99 (ms) por rota, mais o pool"""
+    routes: Dict[Tuple[str, str], dict] = {}
+    pool = {'checkouts': 0, 'connections': 0}
+    for key, value in snapshot['counters'].items():
+        name, labels = _parse_key(key)
+        labels = dict(labels)
+        if name == 'http_requests_total':
+            route = routes.setdefault((labels['method'], labels['endpoint']), {'statuses': {}})
+            route['statuses'][labels['status']] = route['statuses'].get(labels['status'], 0) + int(value)
+        elif name == 'db_pool_checkouts_total':
+            pool['checkouts'] += int(value)
+        elif name == 'db_pool_connections_total':
+            pool['connections'] += int(value)
+
+    def _percentiles(hist):
+        return {
+            'count': hist['count'],
+            'avg_ms': round(hist['sum'] / hist['count'] * 1000, 3) if hist['count'] else None,
+            **{f'p{int(q * 100)}_ms': (round(v * 1000, 3) if v is not None else None)
+               for q in (0.5, 0.95, 0.99) for v in [histogram_quantile(q, hist)]},
+        }
+
+    for key, hist in snapshot['histograms'].items():
+        name, labels = _parse_key(key)
+        labels = dict(labels)
+        if name == 'http_request_duration_seconds':
+            routes.setdefault((labels['method'], labels['endpoint']), {'statuses': {}}).update(_percentiles(hist))
+        elif name == 'db_pool_checkout_wait_seconds':
+            pool['checkout_wait'] = _percentiles(hist)
+
+    return {
+        'routes': [
+            {'method': method, 'endpoint': endpoint, **data}
+            for (method, endpoint), data in sorted(routes.items(), key=lambda item: (item[0][1], item[0][0]))
+        ],
+        'db_pool': pool,
+    }
+
+
+# ==================== INTEGRAÇÃO ====================
+
+def get_registry() -> Optional[MetricsRegistry]:
+    return current_app.extensions.get(EXTENSION_KEY)
+
+
+def _instrument_pool(engine, registry: MetricsRegistry) -> None:
+    """Conta checkouts/conexões e mede a espera em ``pool.connect()``"""
+    pool = engine.pool
+    if getattr(pool, '_metrics_instrumented', False):
+        return
+    original_connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return original_connect()
+        finally:
+            registry.observe('db_pool_checkout_wait_seconds', time.perf_counter() - start, POOL_WAIT_BUCKETS)
+
+    pool.connect = timed_connect
+    pool._metrics_instrumented = True
+
+    # Listeners do pool são copiados por pool.recreate(): registrar uma vez só
+    if not event.contains(pool, 'checkout', registry.on_checkout):
+        event.listen(pool, 'checkout', registry.on_checkout)
+        event.listen(pool, 'connect', registry.on_connect)
+
+
+def metrics_access_allowed() -> bool:
+    """Origem em METRICS_ALLOWED_IPS ou token METRICS_TOKEN válido"""
+    if request.remote_addr in current_app.config.get('METRICS_ALLOWED_IPS', ()):
+        return True
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        return False
+    scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip(), token)
+
+
+def init_metrics(app) -> None:
+    """
+    Registra a coleta por requisição, a instrumentação do pool e ``GET /metrics``.
+
+    Deve ser chamado antes de ``compress.init_app`` para que a duração inclua a compressão.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    registry = MetricsRegistry(
+        directory=app.config.get('METRICS_DIR') or None,
+        flush_interval=float(app.config.get('METRICS_FLUSH_INTERVAL', 1.0)),
+    )
+    app.extensions[EXTENSION_KEY] = registry
+
+    with app.app_context():
+        engine = db.engine
+    _instrument_pool(engine, registry)
+    # engine.dispose() recria o pool: instrumentar o novo
+    event.listen(engine, 'engine_disposed', lambda eng: _instrument_pool(eng, registry))
+
+    @app.before_request
+    def _metrics_request_start():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _metrics_request_end(response):
+        start = getattr(g, '_metrics_start', None)
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+            registry.inc('http_requests_total', (
+                ('method', request.method), ('endpoint', endpoint), ('status', str(response.status_code))
+            ))
+            registry.observe(
+                'http_request_duration_seconds', time.perf_counter() - start, REQUEST_BUCKETS,
+                (('method', request.method), ('endpoint', endpoint))
+            )
+            registry.flush()
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Métricas agregadas de todos os workers (texto Prometheus ou ?format=json)"""
+        if not metrics_access_allowed():
+            return jsonify({'error': 'Acesso às métricas não permitido'}), 403
+        snapshot = registry.collect()
+        if request.args.get('format') == 'json':
+            return jsonify(summarize(snapshot)), 200
+        return Response(render_prometheus(snapshot), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,280 @@
+"""
+Elenco dos períodos em lote: rollover, pré-criação de temporada e inclusão
+
+Abrir um mês cria o período e copia o elenco de um período anterior com um
+único ``INSERT ... SELECT`` (snapshot dos dados atuais dos jogadores ainda
+ativos), sem instanciar um ``MonthlyPlayer`` por jogador. O número de idas ao
+banco não depende do tamanho do elenco nem da quantidade de meses abertos
+(só a manutenção do ledger, no flush, é feita mês a mês):
+
+1. SELECT dos meses já existentes;
+2. agregação do elenco de origem (totais dos períodos novos);
+3. INSERT dos períodos (flush do ORM: ledger e versão do tenant);
+4. INSERT ... SELECT do elenco para todos os períodos novos.
+
+Os totais (previsto e quantidade; recebido começa em zero) são agregados
+do elenco de origem antes e gravados no próprio INSERT dos períodos, pois o
+INSERT via Core não passa pelo hook de ``period_totals``. Nada é commitado.
+
+Incluir jogadores em um período existente (``add_players``) segue a mesma
+ideia: um ``INSERT ... SELECT`` a partir de ``players`` com ``ON CONFLICT DO
+NOTHING`` na unique do elenco, e os totais ajustados pelas linhas devolvidas
+no ``RETURNING``, no mesmo flush do commit.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, exists, func, insert, literal, null, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from . import delinquency
+from .db.connection import db
+from .db.functions import new_uuid
+from .db.models import MonthlyPeriod, MonthlyPlayer, PaymentStatus, Player, PlayerStatus
+from .period_totals import aggregate_totals
+from .tenant_versions import mark_tenant_written
+
+# Colunas preenchidas pelo INSERT ... SELECT do elenco
+ROSTER_COLUMNS = (
+    'id', 'player_id', 'monthly_period_id', 'user_id', 'player_name', 'position', 'phone', 'email',
+    'monthly_fee', 'custom_monthly_fee', 'join_date', 'status', 'payment_date', 'pending_months_count',
+    'created_at', 'updated_at',
+)
+
+
+def next_month(year: int, month: int) -> Tuple[int, int]:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def season_months(year: int, start_month: int, months: int) -> List[Tuple[int, int]]:
+    """``months`` meses consecutivos a partir de (year, start_month)"""
+    result = [(year, start_month)]
+    while len(result) < months:
+        result.append(next_month(*result[-1]))
+    return result
+
+
+def latest_period(user_id: str, before: Optional[Tuple[int, int]] = None) -> Optional[MonthlyPeriod]:
+    """Período mais recente do usuário (estritamente antes de ``before``, se informado)"""
+    query = MonthlyPeriod.query.filter(MonthlyPeriod.user_id == user_id)
+    if before is not None:
+        year, month = before
+        query = query.filter(or_(
+            MonthlyPeriod.year < year,
+            and_(MonthlyPeriod.year == year, MonthlyPeriod.month < month)
+        ))
+    return query.order_by(MonthlyPeriod.year.desc(), MonthlyPeriod.month.desc()).first()
+
+
+def _snapshot_columns(players, period_id, user_id: str, custom_fee, now: datetime) -> list:
+    """Valores de ``ROSTER_COLUMNS`` para um jogador mensal pendente com os dados atuais de ``players``"""
+    return [
+        new_uuid(),
+        players.c.id,
+        period_id,
+        literal(user_id),
+        players.c.name,
+        players.c.position,
+        func.coalesce(players.c.phone, ''),
+        func.coalesce(players.c.email, ''),
+        players.c.monthly_fee,
+        custom_fee,
+        players.c.join_date,
+        literal(PaymentStatus.PENDING.value),
+        null(),
+        literal(0),
+        literal(now, MonthlyPlayer.created_at.type),
+        literal(now, MonthlyPlayer.updated_at.type),
+    ]
+
+
+def _roster_query(source_period_id: str, user_id: str, carry_custom_fee: bool):
+    """Elenco de origem: jogadores do período que continuam ativos (FROM/WHERE compartilhados)"""
+    source = MonthlyPlayer.__table__
+    players = Player.__table__
+    fee = func.coalesce(source.c.custom_monthly_fee, players.c.monthly_fee) if carry_custom_fee \
+        else players.c.monthly_fee
+    joined = source.join(players, and_(players.c.id == source.c.player_id, players.c.user_id == source.c.user_id))
+    where = and_(
+        source.c.monthly_period_id == source_period_id,
+        source.c.user_id == user_id,
+        players.c.status == PlayerStatus.ACTIVE.value,
+    )
+    return source, players, joined, where, fee
+
+
+def roster_totals(source_period_id: str, user_id: str, carry_custom_fee: bool = False) -> Tuple[Decimal, int]:
+    """(previsto, jogadores) de um período aberto com o elenco de ``source_period_id``"""
+    _, _, joined, where, fee = _roster_query(source_period_id, user_id, carry_custom_fee)
+    expected, count = db.session.execute(
+        select(func.coalesce(func.sum(fee), 0), func.count()).select_from(joined).where(where)
+    ).one()
+    return Decimal(str(expected)), int(count)
+
+
+def copy_roster(source_period_id: str, target_period_ids: Sequence[str], user_id: str,
+                carry_custom_fee: bool = False) -> int:
+    """
+    Copia o elenco de ``source_period_id`` para todos os ``target_period_ids``
+    em um único ``INSERT ... SELECT``.
+
+    Entram os jogadores do período de origem que continuam ativos, com nome,
+    posição, contato e mensalidade atuais; o status volta a pendente. Os
+    totais dos períodos de destino não são alterados (ver ``roster_totals``).
+
+    Args:
+        source_period_id: Período de origem do elenco
+        target_period_ids: Períodos de destino (vazios)
+        user_id: ID do usuário (tenant)
+        carry_custom_fee: Mantém a mensalidade customizada da origem
+
+    Returns:
+        Quantidade de jogadores mensais criados
+    """
+    if not target_period_ids:
+        return 0
+    source, players, joined, where, _ = _roster_query(source_period_id, user_id, carry_custom_fee)
+    targets = MonthlyPeriod.__table__.alias('target')
+    now = datetime.utcnow()
+
+    roster = select(
+        *_snapshot_columns(players, targets.c.id, user_id,
+                           source.c.custom_monthly_fee if carry_custom_fee else null(), now)
+    ).select_from(
+        # Um elenco por período de destino
+        joined.join(targets, and_(targets.c.id.in_(list(target_period_ids)), targets.c.user_id == source.c.user_id))
+    ).where(where)
+
+    result = db.session.execute(insert(source).from_select(list(ROSTER_COLUMNS), roster))
+    # INSERT via Core não passa pelo hook de inadimplência
+    delinquency.refresh(db.session.connection(), user_id, period_ids=list(target_period_ids))
+    return result.rowcount
+
+
+def open_periods(user_id: str, months: Sequence[Tuple[int, int]], source_period_id: Optional[str] = None,
+                 carry_custom_fee: bool = False) -> Dict:
+    """
+    Cria os períodos de ``months`` que ainda não existem e copia para eles o
+    elenco de ``source_period_id`` (se informado). Não faz commit.
+
+    Os totais vêm de ``roster_totals`` e são gravados já no INSERT dos
+    períodos, então ledger e versão do tenant são atualizados uma vez por mês.
+
+    Returns:
+        Dict com ``periods`` (criados, em ordem), ``skipped`` ((year, month)
+        já existentes) e ``copied`` (jogadores mensais criados)
+    """
+    existing = {
+        (row.year, row.month) for row in db.session.query(MonthlyPeriod.year, MonthlyPeriod.month).filter(
+            MonthlyPeriod.user_id == user_id,
+            tuple_(MonthlyPeriod.year, MonthlyPeriod.month).in_(list(months))
+        )
+    }
+    missing = [(year, month) for year, month in months if (year, month) not in existing]
+    result = {'periods': [], 'skipped': [m for m in months if m in existing], 'copied': 0}
+    if not missing:
+        return result
+
+    expected, count = roster_totals(source_period_id, user_id, carry_custom_fee) if source_period_id \
+        else (Decimal('0'), 0)
+    periods = [
+        MonthlyPeriod(
+            id=str(uuid.uuid4()),
+            year=year,
+            month=month,
+            name=f"{month:02d}/{year}",
+            total_expected=expected,
+            total_received=0,
+            players_count=count,
+            is_active=True,
+            user_id=user_id,
+        )
+        for year, month in missing
+    ]
+    db.session.add_all(periods)
+    db.session.flush()
+
+    if count:
+        # INSERT via Core não passa pelos hooks de flush
+        result['copied'] = copy_roster(source_period_id, [p.id for p in periods], user_id, carry_custom_fee)
+        mark_tenant_written(db.session, user_id)
+    result['periods'] = periods
+    return result
+
+
+# ==================== INCLUSÃO EM LOTE ====================
+
+# Chave da unique uq_monthly_players_user_player_period (alvo do ON CONFLICT)
+ROSTER_CONFLICT_KEY = ('user_id', 'player_id', 'monthly_period_id')
+
+
+def _insert_ignoring_duplicates(rows_select):
+    """
+    ``INSERT ... SELECT`` em ``monthly_players`` que ignora jogadores já no
+    período: ``ON CONFLICT DO NOTHING`` na unique (PostgreSQL/SQLite) ou,
+    nos demais bancos, ``NOT EXISTS`` no próprio SELECT.
+    """
+    target = MonthlyPlayer.__table__
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        return dialect_insert(target).from_select(list(ROSTER_COLUMNS), rows_select) \
+            .on_conflict_do_nothing(index_elements=list(ROSTER_CONFLICT_KEY))
+
+    inner = rows_select.selected_columns
+    existing = target.alias('existing')
+    rows_select = rows_select.where(~exists().where(and_(
+        existing.c.user_id == inner[3], existing.c.player_id == inner[1], existing.c.monthly_period_id == inner[2]
+    )))
+    return insert(target).from_select(list(ROSTER_COLUMNS), rows_select)
+
+
+def add_players(period: MonthlyPeriod, user_id: str, player_ids: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Inclui jogadores em ``period`` com um único ``INSERT ... SELECT`` a partir
+    de ``players`` (snapshot de nome, posição, contato, mensalidade e data de
+    entrada). Jogadores que já estão no período são ignorados. Não faz commit.
+
+    Args:
+        period: Período de destino (entidade carregada)
+        user_id: ID do usuário (tenant)
+        player_ids: Jogadores a incluir; ``None`` inclui todos os ativos
+
+    Returns:
+        Dict com ``added`` (quantidade) e ``expected_increase`` (soma das
+        mensalidades incluídas)
+    """
+    players = Player.__table__
+    now = datetime.utcnow()
+    condition = players.c.id.in_(list(player_ids)) if player_ids is not None \
+        else players.c.status == PlayerStatus.ACTIVE.value
+    rows_select = select(*_snapshot_columns(players, literal(period.id), user_id, null(), now)) \
+        .where(and_(players.c.user_id == user_id, condition))
+    stmt = _insert_ignoring_duplicates(rows_select)
+
+    if db.engine.dialect.insert_returning:
+        # Só as linhas de fato inseridas voltam: os totais andam pelo delta
+        table = MonthlyPlayer.__table__
+        inserted = db.session.execute(stmt.returning(table.c.player_id, table.c.monthly_fee)).all()
+        added, increase = len(inserted), sum((Decimal(str(row.monthly_fee)) for row in inserted), Decimal('0'))
+        if added:
+            period.total_expected = MonthlyPeriod.total_expected + increase
+            period.players_count = MonthlyPeriod.players_count + added
+        scope = {'player_ids': [row.player_id for row in inserted]}
+    else:
+        added = db.session.execute(stmt).rowcount
+        expected_before = Decimal(str(period.total_expected or 0))
+        if added:
+            expected, received, count = aggregate_totals([period.id], user_id)[period.id]
+            period.total_expected, period.total_received, period.players_count = expected, received, count
+        increase = Decimal(str(period.total_expected or 0)) - expected_before
+        scope = {'period_ids': [period.id]}
+
+    if added:
+        # INSERT via Core não passa pelos hooks de flush
+        delinquency.refresh(db.session.connection(), user_id, **scope)
+        period.updated_at = now
+        mark_tenant_written(db.session, user_id)
+    return {'added': added, 'expected_increase': increase}
@@ -0,0 +1,240 @@
+"""
+Manutenção incremental dos totais em cache de ``monthly_periods``
+
+``total_expected``, ``total_received`` e ``players_count`` são mantidos por
+um listener ``before_flush``: para cada ``MonthlyPlayer`` inserido, alterado
+ou removido no flush, a contribuição antiga (período, mensalidade efetiva e
+status anteriores, via histórico de atributos) é subtraída e a nova somada.
+O ajuste é gravado como ``coluna = coluna + delta``, sem reagregar o período.
+
+Escritas em lote feitas fora do ORM (UPDATE/INSERT via Core) não passam pelo
+hook e devem recalcular os totais explicitamente. ``reconcile`` compara os
+valores gravados com a agregação completa e corrige divergências
+(``flask periods reconcile``).
+"""
+from decimal import Decimal
+
+from sqlalchemy import case, event, func
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql.expression import ClauseElement
+
+from .db.connection import db
+from .db.models import MonthlyPeriod, MonthlyPlayer
+
+periods_table = MonthlyPeriod.__table__
+
+# Atributos de MonthlyPlayer que afetam os totais do período (active_history no modelo)
+TRACKED_ATTRIBUTES = ('monthly_period_id', 'monthly_fee', 'custom_monthly_fee', 'status')
+
+# Tolerância usada na reconciliação
+RECONCILE_TOLERANCE = Decimal('0.01')
+
+
+def _to_decimal(value) -> Decimal:
+    if value is None:
+        return Decimal('0')
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def _contribution(fee, custom_fee, status):
+    """(previsto, recebido, jogadores) de um jogador mensal"""
+    effective = _to_decimal(custom_fee if custom_fee is not None else fee)
+    return effective, (effective if status == 'paid' else Decimal('0')), 1
+
+
+def _old_state(obj):
+    """Valores dos atributos rastreados antes do flush"""
+    state = {}
+    for attr in TRACKED_ATTRIBUTES:
+        history = get_history(obj, attr)
+        if history.deleted:
+            state[attr] = history.deleted[0]
+        elif history.added:
+            # Valor anterior nulo (atributo não carregado não chega aqui: active_history)
+            state[attr] = None
+        else:
+            state[attr] = getattr(obj, attr)
+    return state
+
+
+def _new_state(obj):
+    return {attr: getattr(obj, attr) for attr in TRACKED_ATTRIBUTES}
+
+
+def _has_changes(obj):
+    return any(get_history(obj, attr).has_changes() for attr in TRACKED_ATTRIBUTES)
+
+
+def collect_deltas(session: Session):
+    """
+    Variações de totais por período causadas pelos jogadores mensais pendentes.
+
+    Returns:
+        Dict period_id -> [delta_expected, delta_received, delta_count]
+    """
+    deltas = {}
+
+    def add(state, sign):
+        period_id = state['monthly_period_id']
+        if period_id is None:
+            return
+        expected, received, count = _contribution(
+            state['monthly_fee'], state['custom_monthly_fee'], state['status']
+        )
+        entry = deltas.setdefault(period_id, [Decimal('0'), Decimal('0'), 0])
+        entry[0] += sign * expected
+        entry[1] += sign * received
+        entry[2] += sign * count
+
+    for obj in session.new:
+        if isinstance(obj, MonthlyPlayer):
+            add(_new_state(obj), 1)
+    for obj in session.dirty:
+        if isinstance(obj, MonthlyPlayer) and obj not in session.deleted and _has_changes(obj):
+            add(_old_state(obj), -1)
+            add(_new_state(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, MonthlyPlayer):
+            add(_old_state(obj), -1)
+
+    return {pid: d for pid, d in deltas.items() if d[0] or d[1] or d[2]}
+
+
+def _session_period(session: Session, period_id, new_periods):
+    """Período já presente na sessão (pendente de inserção ou carregado), se houver"""
+    period = new_periods.get(period_id)
+    if period is None:
+        # Busca pela chave: não percorre o identity map inteiro a cada flush
+        period = session.identity_map.get(identity_key(MonthlyPeriod, period_id))
+    return period
+
+
+def _shift_attribute(period, attr, delta):
+    """Soma delta ao atributo, preservando um valor já atribuído no flush"""
+    history = get_history(period, attr)
+    if history.added:
+        current = history.added[0]
+        setattr(period, attr, current + delta if isinstance(current, ClauseElement) else _to_decimal(current) + delta)
+    else:
+        setattr(period, attr, getattr(MonthlyPeriod, attr) + delta)
+
+
+def apply_deltas(session: Session, deltas) -> None:
+    """Aplica as variações aos períodos (objetos da sessão ou UPDATE direto)"""
+    if not deltas:
+        return
+    new_periods = {obj.id: obj for obj in session.new if isinstance(obj, MonthlyPeriod) and obj.id is not None}
+    conn = None
+
+    for period_id, (d_expected, d_received, d_count) in deltas.items():
+        period = _session_period(session, period_id, new_periods)
+        if period is not None and period in session.deleted:
+            continue
+        if period is not None and period in session.new:
+            # Período inserido neste flush: soma em Python sobre o valor inicial
+            period.total_expected = _to_decimal(period.total_expected) + d_expected
+            period.total_received = _to_decimal(period.total_received) + d_received
+            period.players_count = (period.players_count or 0) + d_count
+        elif period is not None:
+            _shift_attribute(period, 'total_expected', d_expected)
+            _shift_attribute(period, 'total_received', d_received)
+            _shift_attribute(period, 'players_count', d_count)
+        else:
+            conn = conn or session.connection()
+            conn.execute(
+                periods_table.update().where(periods_table.c.id == period_id).values(
+                    total_expected=periods_table.c.total_expected + d_expected,
+                    total_received=periods_table.c.total_received + d_received,
+                    players_count=periods_table.c.players_count + d_count,
+                )
+            )
+
+
+def _period_totals_before_flush(session, flush_context, instances):
+    apply_deltas(session, collect_deltas(session))
+
+
+def register_period_totals_events() -> None:
+    """Registra o listener de manutenção dos totais (idempotente)"""
+    if not event.contains(db.session, 'before_flush', _period_totals_before_flush):
+        event.listen(db.session, 'before_flush', _period_totals_before_flush)
+
+
+# ==================== RECONCILIAÇÃO ====================
+
+def aggregate_totals(period_ids=None, user_id: str = None):
+    """
+    Agregação completa dos totais a partir de ``monthly_players``.
+
+    Returns:
+        Dict period_id -> (expected, received, players_count)
+    """
+    effective_fee = func.coalesce(MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.monthly_fee)
+    query = db.session.query(
+        MonthlyPlayer.monthly_period_id,
+        func.coalesce(func.sum(effective_fee), 0),
+        func.coalesce(func.sum(case((MonthlyPlayer.status == 'paid', effective_fee), else_=0)), 0),
+        func.count(MonthlyPlayer.id)
+    )
+    if period_ids is not None:
+        query = query.filter(MonthlyPlayer.monthly_period_id.in_(period_ids))
+    if user_id:
+        query = query.filter(MonthlyPlayer.user_id == user_id)
+    return {
+        pid: (_to_decimal(expected), _to_decimal(received), int(count))
+        for pid, expected, received, count in query.group_by(MonthlyPlayer.monthly_period_id)
+    }
+
+
+def reconcile(user_id: str = None, repair: bool = False):
+    """
+    Compara os totais gravados dos períodos com a agregação completa.
+
+    Args:
+        user_id: Restringe a um usuário (padrão: todos)
+        repair: Corrige as divergências encontradas (não faz commit)
+
+    Returns:
+        Lista de divergências {period_id, user_id, field, stored, live}
+    """
+    query = db.session.query(
+        periods_table.c.id, periods_table.c.user_id, periods_table.c.total_expected,
+        periods_table.c.total_received, periods_table.c.players_count
+    )
+    if user_id:
+        query = query.filter(periods_table.c.user_id == user_id)
+    live = aggregate_totals(user_id=user_id)
+
+    problems = []
+    for row in query.order_by(periods_table.c.user_id, periods_table.c.year, periods_table.c.month):
+        expected, received, count = live.get(row.id, (Decimal('0'), Decimal('0'), 0))
+        stored = {
+            'total_expected': (_to_decimal(row.total_expected), expected),
+            'total_received': (_to_decimal(row.total_received), received),
+            'players_count': (Decimal(row.players_count or 0), Decimal(count)),
+        }
+        diverged = False
+        for field, (stored_value, live_value) in stored.items():
+            if abs(stored_value - live_value) > RECONCILE_TOLERANCE:
+                diverged = True
+                problems.append({
+                    'period_id': row.id,
+                    'user_id': row.user_id,
+                    'field': field,
+                    'stored': float(stored_value),
+                    'live': float(live_value),
+                })
+        if diverged and repair:
+            # Via ORM para que ledger e versão do tenant acompanhem a correção
+            period = db.session.get(MonthlyPeriod, row.id)
+            period.total_expected = expected
+            period.total_received = received
+            period.players_count = count
+
+    if repair:
+        db.session.flush()
+    return problems
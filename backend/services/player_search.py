@@ -0,0 +1,200 @@
+"""
+Busca de jogadores por nome, telefone e e-mail
+
+Cada jogador guarda em ``players.search_text`` um texto normalizado (sem
+acentos, minúsculo, telefone só com dígitos), mantido por um listener
+``before_flush`` (escritas via Core devem usar ``build_search_text``).
+
+Backends:
+- PostgreSQL: índice GIN ``pg_trgm`` sobre ``search_text``; ILIKE '%termo%'
+  usa o índice e o resultado é ordenado por ``similarity()``
+- SQLite: tabela virtual FTS5 ``players_fts`` (tokenizer trigram) com o
+  texto e ``id UNINDEXED``, mantida por triggers e ligada a ``players`` pelo
+  id (não pelo rowid implícito, que um ``batch_alter_table`` renumera);
+  ordenação por ``bm25()``
+- Sem índice (ex.: banco criado com ``create_all``): LIKE sobre o texto
+  normalizado, ainda insensível a acentos
+
+Índices, triggers e backfill são criados pelas migrações
+``d8b3f6a2c417_add_player_search_index`` e ``b7e3c9a1d5f2_rekey_players_fts_on_id``.
+No SQLite, um ``batch_alter_table`` em ``players`` recria a tabela e descarta
+os triggers: a migração que o fizer deve chamar ``create_sqlite_fts`` (ou
+rodar ``flask players reindex-search`` depois).
+"""
+import re
+import unicodedata
+import weakref
+
+from sqlalchemy import bindparam, column, event, func, literal_column, table, text
+
+from .db.connection import db
+from .db.models import Player
+
+SQLITE_FTS_TABLE = 'players_fts'
+
+# O tokenizer trigram do FTS5 só casa termos com 3+ caracteres
+MIN_FTS_TERM_LENGTH = 3
+
+# Disponibilidade da tabela FTS5 por engine (SQLite)
+_fts_available = weakref.WeakKeyDictionary()
+
+# Tabela FTS5 (externa ao ORM) para montar o JOIN
+players_fts = table(SQLITE_FTS_TABLE, column('id'))
+
+# DDL do FTS5 (a migração b7e3c9a1d5f2 usa as mesmas instruções)
+SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5(id UNINDEXED, search_text, tokenize='trigram')",
+    f"CREATE TRIGGER players_fts_ai AFTER INSERT ON players BEGIN"
+    f" INSERT INTO {SQLITE_FTS_TABLE}(id, search_text) VALUES (new.id, new.search_text); END",
+    f"CREATE TRIGGER players_fts_ad AFTER DELETE ON players BEGIN"
+    f" DELETE FROM {SQLITE_FTS_TABLE} WHERE id = old.id; END",
+    f"CREATE TRIGGER players_fts_au AFTER UPDATE OF id, search_text ON players BEGIN"
+    f" DELETE FROM {SQLITE_FTS_TABLE} WHERE id = old.id;"
+    f" INSERT INTO {SQLITE_FTS_TABLE}(id, search_text) VALUES (new.id, new.search_text); END",
+    f"INSERT INTO {SQLITE_FTS_TABLE}(id, search_text) SELECT id, search_text FROM players",
+)
+SQLITE_FTS_TRIGGERS = ('players_fts_ai', 'players_fts_ad', 'players_fts_au')
+
+
+def normalize(value) -> str:
+    """Remove acentos, converte para minúsculas e compacta espaços"""
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def _digits(value) -> str:
+    return re.sub(r'\D', '', value or '')
+
+
+def build_search_text(name, phone=None, email=None) -> str:
+    """Texto indexado de um jogador: nome normalizado, dígitos do telefone e e-mail"""
+    return ' '.join(part for part in (normalize(name), _digits(phone), (email or '').strip().lower()) if part)
+
+
+def normalize_term(term) -> str:
+    """Normaliza o termo digitado; termos só numéricos viram apenas dígitos (telefone)"""
+    normalized = normalize(term)
+    if normalized and not re.search(r'[a-z@]', normalized) and re.search(r'\d', normalized):
+        return _digits(normalized)
+    return normalized
+
+
+def _escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+# ==================== MANUTENÇÃO DO TEXTO DE BUSCA ====================
+
+def _search_text_before_flush(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Player):
+            continue
+        value = build_search_text(obj.name, obj.phone, obj.email)
+        if obj.search_text != value:
+            obj.search_text = value
+
+
+def register_player_search_events() -> None:
+    """Registra o listener que mantém ``players.search_text`` (idempotente)"""
+    if not event.contains(db.session, 'before_flush', _search_text_before_flush):
+        event.listen(db.session, 'before_flush', _search_text_before_flush)
+
+
+# ==================== CONSULTA ====================
+
+def sqlite_fts_available() -> bool:
+    """Indica se a tabela FTS5 existe no banco SQLite corrente (memorizado por engine)"""
+    engine = db.engine
+    if engine not in _fts_available:
+        found = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {'name': SQLITE_FTS_TABLE}
+        ).first()
+        _fts_available[engine] = found is not None
+    return _fts_available[engine]
+
+
+def drop_sqlite_fts(conn) -> None:
+    """Remove a tabela FTS5 e os triggers de sincronização (SQLite)"""
+    for trigger in SQLITE_FTS_TRIGGERS:
+        conn.execute(text(f'DROP TRIGGER IF EXISTS {trigger}'))
+    conn.execute(text(f'DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}'))
+    _fts_available.pop(db.engine, None)
+
+
+def create_sqlite_fts(conn) -> None:
+    """
+    (Re)cria a tabela FTS5 e os triggers de sincronização e indexa as linhas
+    existentes (SQLite). Para bancos criados com ``create_all`` e para
+    restaurar o índice depois de um ``batch_alter_table`` em ``players``.
+    """
+    drop_sqlite_fts(conn)
+    for statement in SQLITE_FTS_DDL:
+        conn.execute(text(statement))
+    _fts_available.pop(db.engine, None)
+
+
+def reindex(conn) -> int:
+    """
+    Recalcula ``search_text`` de todos os jogadores (não faz commit).
+
+    Returns:
+        Quantidade de jogadores atualizados
+    """
+    players = Player.__table__
+    rows = conn.execute(
+        players.select().with_only_columns(players.c.id, players.c.name, players.c.phone, players.c.email)
+    ).all()
+    if rows:
+        conn.execute(
+            players.update().where(players.c.id == bindparam('player_id')).values(search_text=bindparam('value')),
+            [{'player_id': r.id, 'value': build_search_text(r.name, r.phone, r.email)} for r in rows]
+        )
+    return len(rows)
+
+
+def apply_search(query, term, ranked: bool = True):
+    """
+    Filtra a query de jogadores pelo termo (nome, telefone ou e-mail).
+
+    Args:
+        query: Query sobre Player
+        term: Termo digitado pelo usuário
+        ranked: Ordena por relevância (desligar quando a ordenação é fixa,
+            como na paginação por cursor)
+
+    Returns:
+        Query filtrada (e ordenada por relevância, se ranked)
+    """
+    normalized = normalize_term(term)
+    if not normalized:
+        return query
+
+    dialect = db.engine.dialect.name
+    pattern = f'%{_escape_like(normalized)}%'
+
+    if dialect == 'postgresql':
+        # ILIKE com curinga inicial é atendido pelo índice GIN pg_trgm
+        query = query.filter(Player.search_text.ilike(pattern, escape='\\'))
+        if ranked:
+            query = query.order_by(func.similarity(Player.search_text, normalized).desc(), Player.name.asc())
+        return query
+
+    if dialect == 'sqlite' and len(normalized) >= MIN_FTS_TERM_LENGTH and sqlite_fts_available():
+        phrase = '"' + normalized.replace('"', '""') + '"'
+        fts = literal_column(SQLITE_FTS_TABLE)
+        query = query.join(players_fts, players_fts.c.id == Player.id) \
+            .filter(fts.op('MATCH')(phrase))
+        if ranked:
+            query = query.order_by(func.bm25(fts).asc(), Player.name.asc())
+        return query
+
+    query = query.filter(Player.search_text.like(pattern, escape='\\'))
+    if ranked:
+        # Sem índice de relevância: nomes que começam com o termo primeiro
+        starts = Player.search_text.like(f'{_escape_like(normalized)}%', escape='\\')
+        query = query.order_by(starts.desc(), Player.name.asc())
+    return query
@@ -0,0 +1,314 @@
+"""
+Read models das listagens: só as colunas da resposta, sem entidades ORM
+
+As rotas de leitura selecionam as colunas de cada recurso em tuplas
+(``NamedTuple``) em vez de hidratar entidades: sem identity map, sem
+instrumentação de atributos e sem ``@validates`` por linha. Cada recurso tem
+um único serializador (``period_dict``, ``expense_dict``, ...), que aceita
+tanto a tupla quanto a entidade ORM (mesmos nomes de atributo), usado também
+pelas rotas de escrita que devolvem o registro.
+
+O histórico de pagamentos de um jogador junta mensalidades e jogos avulsos
+em um único ``UNION ALL`` ordenado por (year, month), paginado por cursor.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import and_, exists, func, literal, null, select, type_coerce, union_all
+
+from .db.connection import db
+from .db.models import CasualPlayer, Expense, MonthlyPeriod, MonthlyPlayer, Player
+from .player_search import apply_search
+
+
+class PeriodRow(NamedTuple):
+    id: str
+    month: int
+    year: int
+    name: str
+    is_active: bool
+    total_expected: Decimal
+    total_received: Decimal
+    players_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class ExpenseRow(NamedTuple):
+    id: str
+    monthly_period_id: str
+    description: str
+    amount: Decimal
+    category: str
+    date: date
+    created_at: datetime
+    updated_at: datetime
+
+
+class CasualPlayerRow(NamedTuple):
+    id: str
+    monthly_period_id: str
+    player_name: str
+    play_date: date
+    invited_by: str
+    amount: Decimal
+    status: str
+    payment_date: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+
+class AvailablePlayerRow(NamedTuple):
+    id: str
+    name: str
+    position: str
+    phone: str
+    email: Optional[str]
+    monthly_fee: Decimal
+    join_date: Optional[date]
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+
+def _select(row_type, model):
+    """SELECT das colunas de ``model`` com os mesmos nomes dos campos da tupla"""
+    return select(*(getattr(model, name) for name in row_type._fields))
+
+
+def _fetch(row_type, stmt) -> list:
+    return [row_type._make(row) for row in db.session.execute(stmt)]
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _float(value, default=None):
+    return float(value) if value is not None else default
+
+
+# ==================== PERÍODOS ====================
+
+def list_periods(user_id: str, year: Optional[int] = None, month: Optional[int] = None) -> List[PeriodRow]:
+    """Períodos do usuário, do mais recente para o mais antigo"""
+    stmt = _select(PeriodRow, MonthlyPeriod).where(MonthlyPeriod.user_id == user_id)
+    if year:
+        stmt = stmt.where(MonthlyPeriod.year == year)
+    if month:
+        stmt = stmt.where(MonthlyPeriod.month == month)
+    return _fetch(PeriodRow, stmt.order_by(MonthlyPeriod.year.desc(), MonthlyPeriod.month.desc()))
+
+
+def get_period(user_id: str, period_id: str) -> Optional[PeriodRow]:
+    rows = _fetch(PeriodRow, _select(PeriodRow, MonthlyPeriod).where(
+        and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == user_id)
+    ))
+    return rows[0] if rows else None
+
+
+def period_exists(user_id: str, period_id: str) -> bool:
+    """Verifica se o período pertence ao usuário (só a chave)"""
+    return db.session.execute(
+        select(MonthlyPeriod.id).where(and_(MonthlyPeriod.id == period_id, MonthlyPeriod.user_id == user_id))
+    ).first() is not None
+
+
+def period_dict(period) -> dict:
+    """Período na resposta da API (tupla ou entidade)"""
+    return {
+        'id': period.id,
+        'month': period.month,
+        'year': period.year,
+        'name': period.name,
+        'is_active': period.is_active if period.is_active is not None else True,
+        'total_expected': _float(period.total_expected, 0.0),
+        'total_received': _float(period.total_received, 0.0),
+        'players_count': period.players_count,
+        'created_at': _iso(period.created_at),
+        'updated_at': _iso(period.updated_at),
+    }
+
+
+# ==================== DESPESAS ====================
+
+def list_expenses(user_id: str, period_id: str) -> List[ExpenseRow]:
+    return _fetch(ExpenseRow, _select(ExpenseRow, Expense).where(
+        and_(Expense.monthly_period_id == period_id, Expense.user_id == user_id)
+    ))
+
+
+def expense_dict(expense) -> dict:
+    return {
+        'id': expense.id,
+        'monthly_period_id': expense.monthly_period_id,
+        'description': expense.description,
+        'amount': _float(expense.amount),
+        'category': expense.category,
+        # O modelo usa campo 'date'; expor como 'expense_date' na resposta
+        'expense_date': _iso(expense.date),
+        'created_at': _iso(expense.created_at),
+        'updated_at': _iso(expense.updated_at),
+    }
+
+
+# ==================== AVULSOS ====================
+
+def list_casual_players(user_id: str, *period_ids: str) -> List[CasualPlayerRow]:
+    """Avulsos de um ou mais períodos do usuário"""
+    return _fetch(CasualPlayerRow, _select(CasualPlayerRow, CasualPlayer).where(
+        and_(CasualPlayer.monthly_period_id.in_(period_ids), CasualPlayer.user_id == user_id)
+    ))
+
+
+def casual_player_dict(casual_player) -> dict:
+    return {
+        'id': casual_player.id,
+        'monthly_period_id': casual_player.monthly_period_id,
+        'player_name': casual_player.player_name,
+        'play_date': _iso(casual_player.play_date),
+        'invited_by': casual_player.invited_by,
+        'amount': _float(casual_player.amount),
+        'status': casual_player.status,
+        'payment_date': _iso(casual_player.payment_date),
+        'created_at': _iso(casual_player.created_at),
+        'updated_at': _iso(casual_player.updated_at),
+    }
+
+
+# ==================== JOGADORES DISPONÍVEIS ====================
+
+def available_players_query(user_id: str, period_id: str, position: Optional[str] = None):
+    """
+    Jogadores ativos do usuário que ainda não estão no período (sem ORDER BY).
+
+    Anti-join ``NOT EXISTS`` resolvido no banco (atendido pela unique
+    ``(user_id, player_id, monthly_period_id)`` de ``monthly_players``): nada
+    do elenco do período passa pelo Python nem vira lista de parâmetros.
+    Devolve uma ``Query`` de colunas para receber busca e paginação por cursor.
+    """
+    enrolled = exists().where(and_(
+        MonthlyPlayer.player_id == Player.id,
+        MonthlyPlayer.monthly_period_id == period_id,
+        MonthlyPlayer.user_id == user_id,
+    ))
+    query = db.session.query(*(getattr(Player, name) for name in AvailablePlayerRow._fields)).filter(
+        Player.user_id == user_id, Player.status == 'active', ~enrolled
+    )
+    if position:
+        query = query.filter(Player.position == position)
+    return query
+
+
+def list_available_players(user_id: str, period_id: str, position: Optional[str] = None,
+                           search: Optional[str] = None) -> List[AvailablePlayerRow]:
+    """Todos os jogadores disponíveis para o período (por relevância da busca, depois nome)"""
+    query = available_players_query(user_id, period_id, position)
+    if search:
+        query = apply_search(query, search)
+    return [AvailablePlayerRow._make(row) for row in query.order_by(Player.name, Player.id)]
+
+
+def available_player_dict(player) -> dict:
+    # Campos do Player no formato esperado pelo frontend
+    return {
+        'id': player.id,
+        'name': player.name,
+        'position': player.position,
+        'phone': player.phone or '',
+        'email': player.email or '',
+        'monthly_fee': _float(player.monthly_fee, 0.0),
+        'join_date': _iso(player.join_date),
+        'status': player.status,
+        'created_at': _iso(player.created_at),
+        'updated_at': _iso(player.updated_at),
+    }
+
+
+# ==================== HISTÓRICO DO JOGADOR ====================
+
+def player_exists(user_id: str, player_id: str) -> bool:
+    """Verifica se o jogador pertence ao usuário (só a chave)"""
+    return db.session.execute(
+        select(Player.id).where(and_(Player.id == player_id, Player.user_id == user_id))
+    ).first() is not None
+
+
+# Ordem do histórico: mês mais recente primeiro; no mesmo mês, a mensalidade antes dos avulsos
+HISTORY_KEYS = ('year', 'month', 'kind', 'id')
+
+
+def player_history_query(user_id: str, player_id: str):
+    """
+    Mensalidades e jogos avulsos do jogador em todos os períodos (sem ORDER BY).
+
+    Um único ``UNION ALL``: mensalidades pela unique ``(user_id, player_id,
+    monthly_period_id)`` de ``monthly_players`` e avulsos pelo índice
+    ``(user_id, player_name)`` de ``casual_players`` (o avulso não tem
+    ``player_id``; vale o nome igual ao do cadastro). Ano e mês vêm do join
+    com ``monthly_periods``.
+
+    Returns:
+        Tuple (``Query`` sobre o ``UNION``, subquery com as colunas de
+        ``HISTORY_KEYS`` para a paginação por cursor)
+    """
+    monthly = select(
+        literal('monthly').label('kind'),
+        MonthlyPlayer.id.label('id'),
+        MonthlyPeriod.year.label('year'),
+        MonthlyPeriod.month.label('month'),
+        MonthlyPeriod.id.label('monthly_period_id'),
+        MonthlyPeriod.name.label('period_name'),
+        func.coalesce(MonthlyPlayer.custom_monthly_fee, MonthlyPlayer.monthly_fee).label('amount'),
+        MonthlyPlayer.status.label('status'),
+        MonthlyPlayer.payment_date.label('payment_date'),
+        # Tipos do primeiro SELECT valem para o UNION inteiro (conversão do resultado)
+        type_coerce(null(), CasualPlayer.play_date.type).label('play_date'),
+        type_coerce(null(), CasualPlayer.invited_by.type).label('invited_by'),
+        MonthlyPlayer.pending_months_count.label('pending_months_count'),
+    ).join(MonthlyPeriod, MonthlyPeriod.id == MonthlyPlayer.monthly_period_id).where(and_(
+        MonthlyPlayer.user_id == user_id, MonthlyPlayer.player_id == player_id
+    ))
+
+    casual = select(
+        literal('casual'),
+        CasualPlayer.id,
+        MonthlyPeriod.year,
+        MonthlyPeriod.month,
+        MonthlyPeriod.id,
+        MonthlyPeriod.name,
+        CasualPlayer.amount,
+        CasualPlayer.status,
+        CasualPlayer.payment_date,
+        CasualPlayer.play_date,
+        CasualPlayer.invited_by,
+        null(),
+    ).join(
+        MonthlyPeriod, MonthlyPeriod.id == CasualPlayer.monthly_period_id
+    ).join(
+        Player, and_(Player.id == player_id, Player.user_id == CasualPlayer.user_id,
+                     Player.name == CasualPlayer.player_name)
+    ).where(CasualPlayer.user_id == user_id)
+
+    history = union_all(monthly, casual).subquery('history')
+    return db.session.query(history), history
+
+
+def history_entry_dict(row) -> dict:
+    return {
+        'kind': row.kind,
+        'id': row.id,
+        'monthly_period_id': row.monthly_period_id,
+        'period_name': row.period_name,
+        'year': row.year,
+        'month': row.month,
+        'amount': _float(row.amount, 0.0),
+        'status': row.status,
+        'payment_date': _iso(row.payment_date),
+        'play_date': _iso(row.play_date),
+        'invited_by': row.invited_by,
+        'pending_months_count': row.pending_months_count,
+        # Avulso sem player_id: vinculado ao jogador pelo nome (ver player_history_query)
+        'matched_by': 'name' if row.kind == 'casual' else 'player_id',
+    }
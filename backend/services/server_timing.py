@@ -0,0 +1,120 @@
+"""
+Tempo por fase da requisição (header ``Server-Timing``)
+
+Handlers e utilitários de resposta registram fases com ``timed('dump')``;
+os tempos se acumulam por nome em ``g`` durante a requisição. No fim (depois
+da compressão) a aplicação emite:
+- ``Server-Timing: db;dur=..;desc="N queries", dump;dur=.., ..., total;dur=..``
+- o log ``[Perf][Request]`` com as fases como campos (``extra``), indexado
+  pelo trace id.
+
+Fases usadas hoje: ``db`` (profiler de SQL), ``dump`` (schemas Marshmallow),
+``serialize`` (codificação no provider JSON), ``json`` (``jsonify`` em
+``APIResponse``, inclui ``serialize``) e ``compress`` (Flask-Compress).
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from flask import g, has_request_context, request
+from flask_compress import Compress
+
+from .sql_profiler import get_profiler, request_db_metrics
+
+# Ordem das fases no header (as demais vêm em seguida)
+PHASE_ORDER = ('db', 'dump', 'serialize', 'json', 'compress')
+
+
+def _phases() -> Dict[str, float]:
+    phases = getattr(g, '_timing_phases', None)
+    if phases is None:
+        phases = g._timing_phases = {}
+    return phases
+
+
+def record(phase: str, duration_ms: float) -> None:
+    """Soma a duração à fase (ignorado fora de requisição)"""
+    if has_request_context():
+        phases = _phases()
+        phases[phase] = phases.get(phase, 0.0) + duration_ms
+
+
+@contextmanager
+def timed(phase: str):
+    """Mede o bloco e acumula na fase informada"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, (time.perf_counter() - start) * 1000)
+
+
+def start_request() -> None:
+    """Zera as fases no início da requisição"""
+    g._timing_phases = {}
+    g._timing_start = time.perf_counter()
+
+
+def request_timings() -> Dict[str, float]:
+    """Fases da requisição corrente (inclui ``db`` e ``total``)"""
+    timings = dict(getattr(g, '_timing_phases', None) or {})
+    if get_profiler() is not None:
+        timings['db'] = request_db_metrics()[1]
+    start = getattr(g, '_timing_start', None)
+    if start is not None:
+        timings['total'] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def format_header(timings: Dict[str, float], db_queries: int = None) -> str:
+    """Monta o valor do header Server-Timing"""
+    names = [p for p in PHASE_ORDER if p in timings]
+    names += sorted(p for p in timings if p not in PHASE_ORDER and p != 'total')
+    if 'total' in timings:
+        names.append('total')
+
+    metrics = []
+    for name in names:
+        metric = f"{name};dur={timings[name]:.1f}"
+        if name == 'db' and db_queries is not None:
+            metric += f';desc="{db_queries} queries"'
+        metrics.append(metric)
+    return ', '.join(metrics)
+
+
+class TimedCompress(Compress):
+    """Flask-Compress medindo a compressão como fase ``compress``"""
+
+    def after_request(self, response):
+        with timed('compress'):
+            return super().after_request(response)
+
+
+def init_server_timing(app) -> None:
+    """
+    Registra o início/fim da medição.
+
+    Deve ser chamado antes de ``compress.init_app``: os ``after_request`` rodam
+    em ordem inversa de registro, então o header é montado depois da compressão.
+    """
+    @app.before_request
+    def _server_timing_start():
+        start_request()
+
+    @app.after_request
+    def _server_timing_end(response):
+        try:
+            timings = request_timings()
+            db_queries = request_db_metrics()[0] if get_profiler() is not None else None
+            response.headers['Server-Timing'] = format_header(timings, db_queries)
+
+            trace_id = getattr(g, '_trace_id', None)
+            fields = {name: round(value, 1) for name, value in timings.items()}
+            app.logger.info(
+                f"[Perf][Request] trace={trace_id or '-'} {request.method} {request.path} -> "
+                f"{response.status_code} " + ' '.join(f"{k}={v}" for k, v in fields.items()),
+                extra={'trace_id': trace_id, 'timings': fields, 'db_queries': db_queries}
+            )
+        except Exception:
+            pass
+        return response
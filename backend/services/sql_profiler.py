@@ -0,0 +1,172 @@
+"""
+Perfil de SQL por requisição e log de consultas lentas
+
+Listeners ``before_cursor_execute``/``after_cursor_execute`` no engine medem
+cada statement e:
+- acumulam quantidade e tempo de banco da requisição corrente em ``g``
+  (expostos como ``X-DB-Queries``/``X-DB-Time-ms``);
+- registram em log (com o ``X-Trace-Id``) statements acima de
+  ``SQL_SLOW_QUERY_MS``;
+- mantêm as estatísticas por statement normalizado (literais viram ``?``)
+  para o top-N dos mais lentos (``GET /api/admin/sql/slow-queries``).
+
+Com ``SQL_PROFILER_ENABLED`` desligado nenhum listener é registrado, então
+não há custo por consulta.
+"""
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event
+
+from .db.connection import db
+
+# Chave em ``app.extensions``
+EXTENSION_KEY = 'sql_profiler'
+
+# Limite de statements distintos acompanhados (o menos lento é descartado)
+MAX_TRACKED_STATEMENTS = 500
+
+# Tamanho máximo do statement no log de consultas lentas
+LOG_STATEMENT_MAX_LENGTH = 1000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_NAMED_PARAM = re.compile(r'%\(\w+\)s|:\w+\b|\$\d+|%s')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_statement(statement: str) -> str:
+    """Remove literais e parâmetros para agrupar statements equivalentes"""
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _NAMED_PARAM.sub('?', normalized)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (?)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+class SQLProfiler:
+    """Estatísticas por statement normalizado (thread-safe)"""
+
+    def __init__(self, slow_query_ms: float = 200, top_n: int = 20):
+        self.slow_query_ms = slow_query_ms
+        self.top_n = top_n
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._normalized: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _normalize(self, statement: str) -> str:
+        # Statements parametrizados se repetem: normaliza cada texto uma vez
+        normalized = self._normalized.get(statement)
+        if normalized is None:
+            normalized = normalize_statement(statement)
+            if len(self._normalized) < MAX_TRACKED_STATEMENTS * 4:
+                self._normalized[statement] = normalized
+        return normalized
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        normalized = self._normalize(statement)
+        with self._lock:
+            entry = self._stats.get(normalized)
+            if entry is None:
+                if len(self._stats) >= MAX_TRACKED_STATEMENTS:
+                    fastest = min(self._stats, key=lambda k: self._stats[k]['max_ms'])
+                    if self._stats[fastest]['max_ms'] >= elapsed_ms:
+                        return
+                    del self._stats[fastest]
+                entry = self._stats[normalized] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['last_ms'] = elapsed_ms
+
+    def slowest(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Top-N statements ordenados pelo maior tempo observado"""
+        with self._lock:
+            items = [(statement, dict(entry)) for statement, entry in self._stats.items()]
+        items.sort(key=lambda item: item[1]['max_ms'], reverse=True)
+        return [
+            {
+                'statement': statement,
+                'count': entry['count'],
+                'max_ms': round(entry['max_ms'], 3),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 3),
+                'total_ms': round(entry['total_ms'], 3),
+                'last_ms': round(entry['last_ms'], 3),
+            }
+            for statement, entry in items[:limit or self.top_n]
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def get_profiler() -> Optional[SQLProfiler]:
+    """Profiler da aplicação corrente (None se desligado)"""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
+
+
+# ==================== LISTENERS ====================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_profiler_start', None)
+    if start is None:
+        return
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    profiler = get_profiler()
+    if profiler is None:
+        return
+
+    trace_id = None
+    if has_request_context():
+        g._db_queries = getattr(g, '_db_queries', 0) + 1
+        g._db_time_ms = getattr(g, '_db_time_ms', 0.0) + elapsed_ms
+        trace_id = getattr(g, '_trace_id', None)
+
+    profiler.record(statement, elapsed_ms)
+
+    if elapsed_ms >= profiler.slow_query_ms:
+        current_app.logger.warning(
+            "[Perf][SlowQuery] %.1fms trace=%s %s",
+            elapsed_ms, trace_id or '-', _WHITESPACE.sub(' ', statement)[:LOG_STATEMENT_MAX_LENGTH]
+        )
+
+
+def reset_request_db_metrics() -> None:
+    """Zera os contadores no início da requisição (``g`` pode ser compartilhado com um app context externo)"""
+    g._db_queries = 0
+    g._db_time_ms = 0.0
+
+
+def request_db_metrics():
+    """(quantidade, tempo em ms) de SQL da requisição corrente"""
+    return getattr(g, '_db_queries', 0), getattr(g, '_db_time_ms', 0.0)
+
+
+def init_sql_profiler(app) -> None:
+    """Registra os listeners no engine da aplicação se ``SQL_PROFILER_ENABLED``"""
+    if not app.config.get('SQL_PROFILER_ENABLED', False):
+        return
+
+    app.extensions[EXTENSION_KEY] = SQLProfiler(
+        slow_query_ms=float(app.config.get('SQL_SLOW_QUERY_MS', 200)),
+        top_n=int(app.config.get('SQL_PROFILER_TOP_N', 20)),
+    )
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,149 @@
+"""
+Estatísticas por agregação condicional
+
+Cada endpoint de estatísticas resolve em uma única consulta: as contagens e
+somas por status viram colunas ``SUM(CASE WHEN ... THEN ... ELSE 0 END)``
+do mesmo SELECT, e o resultado é lido como linhas (sem carregar objetos do
+ORM). Novas métricas entram como mais uma ``Metric`` na lista e novas
+dimensões como ``group_by``/filtros, sem acrescentar idas ao banco.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from .db.connection import db
+from .db.models import MonthlyPeriod, MonthlyPlayer, Player, PlayerStatus
+
+# Status de jogador contados em /stats/players
+PLAYER_STATUSES = tuple(s.value for s in PlayerStatus)
+
+# Status de pagamento contados em /stats/payments ('partial' mantido por compatibilidade)
+PAYMENT_STATUSES = ('paid', 'partial', 'pending')
+
+
+@dataclass(frozen=True)
+class Metric:
+    """Uma coluna agregada do resultado"""
+    name: str
+    expression: ColumnElement
+
+
+def count_where(condition) -> ColumnElement:
+    """COUNT condicional portável: SUM(CASE WHEN cond THEN 1 ELSE 0 END)"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def sum_where(column, condition) -> ColumnElement:
+    """Soma condicional: SUM(CASE WHEN cond THEN coluna ELSE 0 END)"""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def status_counts(column, statuses: Sequence[str]) -> List[Metric]:
+    """Uma métrica de contagem por valor de status"""
+    return [Metric(status, count_where(column == status)) for status in statuses]
+
+
+def month_range(start: Tuple[int, int], end: Tuple[int, int]) -> ColumnElement:
+    """Condição (ano, mês) entre start e end, inclusive, sobre MonthlyPeriod"""
+    return and_(
+        MonthlyPeriod.year.between(start[0], end[0]),
+        or_(MonthlyPeriod.year > start[0], MonthlyPeriod.month >= start[1]),
+        or_(MonthlyPeriod.year < end[0], MonthlyPeriod.month <= end[1])
+    )
+
+
+def aggregate(select_from, metrics: Sequence[Metric], filters: Sequence[Any] = (),
+              group_by: Sequence[Any] = (), order_by: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+    """
+    Executa um único SELECT com as métricas (e as colunas de agrupamento).
+
+    Args:
+        select_from: Tabela/entidade (ou join) de origem
+        metrics: Colunas agregadas
+        filters: Condições WHERE
+        group_by: Colunas de agrupamento (também retornadas)
+        order_by: Ordenação das linhas
+
+    Returns:
+        Lista de dicionários, uma entrada por grupo
+    """
+    stmt = (
+        select(*group_by, *(m.expression.label(m.name) for m in metrics))
+        .select_from(select_from)
+        .where(*filters)
+    )
+    if group_by:
+        stmt = stmt.group_by(*group_by)
+    if order_by:
+        stmt = stmt.order_by(*order_by)
+    return [dict(row._mapping) for row in db.session.execute(stmt)]
+
+
+# ==================== ESTATÍSTICAS ====================
+
+def player_stats(user_id: str, position: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Contagem de jogadores por status e por posição.
+
+    Agrupa por posição (poucas linhas) e soma os grupos para os totais.
+    """
+    metrics = [Metric('total', func.count(Player.id)), *status_counts(Player.status, PLAYER_STATUSES)]
+    filters = [Player.user_id == user_id]
+    if position:
+        filters.append(Player.position == position)
+
+    rows = aggregate(Player, metrics, filters, group_by=[Player.position])
+
+    stats = {m.name: 0 for m in metrics}
+    by_position = {}
+    for row in rows:
+        for m in metrics:
+            stats[m.name] += int(row[m.name])
+        by_position[row['position']] = int(row['total'])
+    stats['by_position'] = by_position
+    return stats
+
+
+def payment_stats(user_id: str, *period_filters) -> List[Dict[str, Any]]:
+    """
+    Estatísticas de pagamento por período (ordenadas por ano/mês).
+
+    Os totais financeiros vêm das colunas mantidas em ``monthly_periods``;
+    as contagens por status, da agregação dos jogadores do período.
+    """
+    metrics = [
+        Metric('total_players', func.count(MonthlyPlayer.id)),
+        *status_counts(MonthlyPlayer.status, PAYMENT_STATUSES),
+    ]
+    source = MonthlyPeriod.__table__.outerjoin(
+        MonthlyPlayer.__table__,
+        and_(MonthlyPlayer.monthly_period_id == MonthlyPeriod.id, MonthlyPlayer.user_id == user_id)
+    )
+    period_columns = [
+        MonthlyPeriod.id, MonthlyPeriod.year, MonthlyPeriod.month,
+        MonthlyPeriod.total_expected, MonthlyPeriod.total_received,
+    ]
+    rows = aggregate(
+        source, metrics,
+        filters=[MonthlyPeriod.user_id == user_id, *period_filters],
+        group_by=period_columns,
+        order_by=[MonthlyPeriod.year.asc(), MonthlyPeriod.month.asc()]
+    )
+
+    results = []
+    for row in rows:
+        expected = row['total_expected'] or 0
+        received = row['total_received'] or 0
+        results.append({
+            'period_id': row['id'],
+            'year': row['year'],
+            'month': row['month'],
+            'total_players': int(row['total_players']),
+            **{status: int(row[status]) for status in PAYMENT_STATUSES},
+            'total_expected': expected,
+            'total_received': received,
+            'collection_rate': (received / expected * 100) if expected > 0 else 0,
+        })
+    return results
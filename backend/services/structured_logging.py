@@ -0,0 +1,197 @@
+"""
+Logging estruturado e não bloqueante
+
+O ``app.logger`` (logger ``backend``, pai de todos os ``logging.getLogger(__name__)``
+do pacote) recebe um único ``QueueHandler``: a thread da requisição só
+enfileira o registro, e um ``QueueListener`` em segundo plano formata e grava
+em stderr e, se ``LOG_FILE``, no arquivo rotativo. Threads não sobrevivem ao
+fork: cada processo filho (workers do gunicorn com ``--preload-app``) sobe o
+seu próprio listener.
+
+- ``LOG_LEVEL``: nível do logger (registros abaixo nem são criados);
+- ``LOG_FORMAT``: ``json`` (uma linha por registro, campos do ``extra`` no
+  topo) ou ``text``;
+- ``LOG_DEBUG_SAMPLE_RATE``: fração dos eventos de diagnóstico registrados
+  por ``debug_sampled`` (volume alto, ex.: por requisição);
+- todo registro leva o ``trace_id`` da requisição (``X-Trace-Id``).
+
+Diagnósticos caros devem ficar atrás de ``debug_sampled(logger)``: com DEBUG
+desligado (ou fora da amostra) nada é consultado nem formatado.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+from flask.logging import default_handler
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s'
+
+# Atributos padrão do LogRecord (o resto veio de ``extra``)
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'trace_id'}
+
+# Listener do processo (um por vez; recriado a cada ``init_logging`` e em cada fork)
+_listener: Optional[QueueListener] = None
+# Fila e fábrica de handlers do listener corrente (para recriá-lo no processo filho)
+_queue: Optional[queue.SimpleQueue] = None
+_handler_factory: Optional[Callable[[], list]] = None
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id da requisição corrente (None fora de requisição)"""
+    if has_request_context():
+        return getattr(g, '_trace_id', None)
+    return None
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro: ts, level, logger, message, trace_id, campos extras e exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'trace_id': getattr(record, 'trace_id', None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        elif record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    Enfileira o registro sem formatar.
+
+    Roda na thread da requisição: é aqui que o trace id é capturado e o
+    traceback vira texto (o listener não tem contexto nem ``exc_info``).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if not hasattr(record, 'trace_id'):
+            record.trace_id = current_trace_id()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _TraceDefault(logging.Filter):
+    # Formato texto: registros sem requisição mostram '-'
+    def filter(self, record):
+        if getattr(record, 'trace_id', None) is None:
+            record.trace_id = '-'
+        return True
+
+
+def debug_sampled(logger: logging.Logger, rate: Optional[float] = None) -> bool:
+    """
+    True se um evento de diagnóstico deve ser registrado: DEBUG habilitado no
+    logger e sorteado dentro de ``rate`` (padrão ``LOG_DEBUG_SAMPLE_RATE``).
+    Avaliar antes de montar dados caros.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    if rate is None:
+        rate = float(current_app.config.get('LOG_DEBUG_SAMPLE_RATE', 1.0)) if has_app_context() else 1.0
+    return rate >= 1 or random.random() < rate
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields) -> None:
+    """Registra ``event`` com ``fields`` como campos estruturados (nível checado antes)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={'event': event, **fields})
+
+
+def _build_handlers(app):
+    fmt = (app.config.get('LOG_FORMAT') or 'text').lower()
+    formatter = JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler()]
+    log_file = app.config.get('LOG_FILE')
+    if log_file:
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+        handlers.append(RotatingFileHandler(
+            log_file,
+            maxBytes=int(app.config.get('LOG_FILE_MAX_BYTES', 10 * 1024 * 1024)),
+            backupCount=int(app.config.get('LOG_FILE_BACKUP_COUNT', 10)),
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        if fmt != 'json':
+            handler.addFilter(_TraceDefault())
+    return handlers
+
+
+def stop_logging() -> None:
+    """Esvazia a fila e para o listener (também registrado no atexit)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_queue, *_handler_factory(), respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_in_child() -> None:
+    """
+    Após o fork (ex.: gunicorn ``--preload-app``) a thread do listener não
+    existe no filho: sem isso a fila cresceria sem ninguém para gravar.
+    Descarta o listener herdado (sem ``stop``, cujo sentinela pararia o novo)
+    e os registros que o pai ainda vai gravar, e sobe um listener próprio.
+    """
+    global _listener
+    if _listener is None:
+        return
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    while not _queue.empty():
+        _queue.get_nowait()
+    _start_listener()
+
+
+def init_logging(app) -> None:
+    """Troca os handlers do ``app.logger`` pelo par QueueHandler/QueueListener"""
+    global _queue, _handler_factory
+    stop_logging()
+
+    log_queue = queue.SimpleQueue()
+    _queue, _handler_factory = log_queue, (lambda: _build_handlers(app))
+    _start_listener()
+
+    logger = app.logger
+    logger.removeHandler(default_handler)
+    for handler in list(logger.handlers):
+        if isinstance(handler, RequestQueueHandler):
+            logger.removeHandler(handler)
+    logger.addHandler(RequestQueueHandler(log_queue))
+    logger.setLevel((app.config.get('LOG_LEVEL') or 'INFO').upper())
+    # Um único caminho de saída (sem repetir no root)
+    logger.propagate = False
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_in_child)
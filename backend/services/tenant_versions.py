@@ -0,0 +1,133 @@
+"""
+Versão dos dados por usuário (tenant)
+
+Um listener ``after_flush`` incrementa ``tenant_versions.version`` para cada
+usuário cujas linhas foram inseridas, alteradas ou removidas no flush. A
+versão é gravada na mesma transação da escrita, então é compartilhada entre
+todos os workers e só avança quando a escrita é confirmada.
+
+Escritas feitas fora do ORM (UPDATE/INSERT em lote) devem chamar
+``mark_tenant_written`` explicitamente.
+"""
+from datetime import datetime
+
+from flask import has_request_context, request
+from sqlalchemy import event, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+from .db.connection import db
+from .db.models import TenantVersion, User
+
+versions_table = TenantVersion.__table__
+
+# Memo da versão por requisição (no environ, não em ``g``, que pode ser
+# compartilhado entre requisições quando o app context já está ativo)
+_MEMO_KEY = 'futebol.tenant_versions'
+
+# Usuários escritos na transação corrente (consumido no commit, ex.: pelo cache)
+TOUCHED_TENANTS_KEY = 'touched_tenants'
+
+
+def touch_tenant(conn, user_id: str) -> None:
+    """
+    Incrementa a versão do usuário na transação da conexão informada.
+
+    Upsert em um único comando (``ON CONFLICT``/``ON DUPLICATE KEY``): na
+    primeira escrita do usuário, duas requisições concorrentes não disputam
+    o INSERT da linha (que violaria a PK dentro do hook de flush).
+    """
+    if has_request_context():
+        request.environ.get(_MEMO_KEY, {}).pop(user_id, None)
+    now = datetime.utcnow()
+    bumped = {'version': versions_table.c.version + 1, 'updated_at': now}
+    dialect = conn.dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        conn.execute(
+            dialect_insert(versions_table).values(user_id=user_id, version=1, updated_at=now)
+            .on_conflict_do_update(index_elements=['user_id'], set_=bumped)
+        )
+    elif dialect in ('mysql', 'mariadb'):
+        conn.execute(
+            mysql.insert(versions_table).values(user_id=user_id, version=1, updated_at=now)
+            .on_duplicate_key_update(**bumped)
+        )
+    else:
+        result = conn.execute(
+            versions_table.update().where(versions_table.c.user_id == user_id).values(**bumped)
+        )
+        if result.rowcount == 0:
+            conn.execute(versions_table.insert().values(user_id=user_id, version=1, updated_at=now))
+
+
+def mark_tenant_written(session, user_id: str) -> None:
+    """
+    Registra uma escrita feita fora do ORM (Core/em lote) para o usuário:
+    incrementa a versão na transação e agenda a invalidação no commit.
+    """
+    touch_tenant(session.connection(), user_id)
+    session.info.setdefault(TOUCHED_TENANTS_KEY, set()).add(user_id)
+
+
+def get_tenant_version(user_id: str) -> int:
+    """
+    Versão atual dos dados do usuário (0 se nunca houve escrita).
+
+    Memorizada por requisição para que ETag e cache leiam a tabela uma vez.
+    """
+    memo = None
+    if has_request_context():
+        memo = request.environ.setdefault(_MEMO_KEY, {})
+        if user_id in memo:
+            return memo[user_id]
+
+    value = db.session.execute(
+        select(versions_table.c.version).where(versions_table.c.user_id == user_id)
+    ).scalar()
+    version = int(value or 0)
+    if memo is not None:
+        memo[user_id] = version
+    return version
+
+
+def collect_touched_tenants(session):
+    """IDs de usuário afetados pelo flush corrente"""
+    touched = set()
+    removed_users = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TenantVersion):
+            continue
+        if isinstance(obj, User):
+            if obj in session.deleted:
+                removed_users.add(obj.id)
+            else:
+                touched.add(obj.id)
+            continue
+        user_id = getattr(obj, 'user_id', None)
+        if user_id:
+            touched.add(user_id)
+    touched.discard(None)
+    return touched - removed_users
+
+
+def _tenant_versions_after_flush(session, flush_context):
+    touched = collect_touched_tenants(session)
+    if not touched:
+        return
+    session.info.setdefault(TOUCHED_TENANTS_KEY, set()).update(touched)
+    conn = session.connection()
+    for user_id in sorted(touched):
+        touch_tenant(conn, user_id)
+
+
+def _tenant_versions_after_rollback(session):
+    session.info.pop(TOUCHED_TENANTS_KEY, None)
+
+
+def register_tenant_version_events() -> None:
+    """Registra o listener de versionamento por tenant (idempotente)"""
+    if not event.contains(db.session, 'after_flush', _tenant_versions_after_flush):
+        event.listen(db.session, 'after_flush', _tenant_versions_after_flush)
+    if not event.contains(db.session, 'after_rollback', _tenant_versions_after_rollback):
+        event.listen(db.session, 'after_rollback', _tenant_versions_after_rollback)
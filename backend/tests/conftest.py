@@ -342,6 +342,27 @@ def sample_monthly_players(app, db_session, sample_players, sample_monthly_perio
     return monthly_players
 
 
+# ==================== APLICAÇÃO REAL (create_app) ====================
+
+@pytest.fixture(scope='function')
+def api_app():
+    """Aplicação real (create_app('testing')) com banco em memória recriado a cada teste"""
+    from backend import create_app
+    from backend.services.db.connection import db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture(scope='function')
+def api_client(api_app):
+    """Cliente de teste da aplicação real (usuários: tests.fixtures.api.register_user)"""
+    return api_app.test_client()
+
+
 # Configurações adicionais para pytest
 def pytest_configure(config):
     """Configuração adicional do pytest"""
@@ -0,0 +1,34 @@
+"""
+Helpers dos testes de API sobre a aplicação real (``create_app("testing")``)
+
+As fixtures ``api_app`` e ``api_client`` ficam em ``tests/conftest.py``.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from backend.services.db.connection import db
+
+
+def register_user(client, username="api_tester"):
+    """Registra um usuário pela API e retorna (access_token, user_id)"""
+    payload = {"username": username, "email": f"{username}@example.com", "password": "secret123"}
+    resp = client.post("/api/auth/register", json=payload)
+    assert resp.status_code in (200, 201)
+    data = resp.get_json()
+    return data["access_token"], data["user"]["id"]
+
+
+@contextmanager
+def count_queries():
+    """Statements SQL executados dentro do bloco (requer app context)"""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,76 @@
+from backend.services import period_totals
+from backend.services.cashflow_ledger import verify_user
+from backend.services.db.connection import db
+from backend.services.db.models import MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_client, headers, count):
+    players = [{"name": f"Jogador {i:02d}", "position": "forward", "phone": f"1197777{i:04d}", "monthly_fee": 50 + i}
+               for i in range(count)]
+    ids = [r["id"] for r in api_client.post("/api/players/bulk", json={"players": players},
+                                            headers=headers).get_json()["data"]["results"]]
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 4},
+                                headers=headers).get_json()["period_id"]
+    return period_id, ids
+
+
+def test_add_players_skips_enrolled_and_keeps_totals(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, ids = _seed(api_client, headers, 4)
+    url = f"/api/monthly-periods/{period_id}/players"
+
+    r = api_client.post(url, json={"player_ids": ids[:2]}, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["data"] == {"added_players": 2, "skipped_players": 0, "total_expected_increase": 101.0}
+
+    # ids[1] já está no período: é ignorado, os demais entram
+    r = api_client.post(url, json={"player_ids": ids[1:]}, headers=headers)
+    assert r.get_json()["data"] == {"added_players": 2, "skipped_players": 1, "total_expected_increase": 105.0}
+
+    period = db.session.get(MonthlyPeriod, period_id)
+    assert (float(period.total_expected), period.players_count) == (206.0, 4)
+    rows = MonthlyPlayer.query.filter_by(monthly_period_id=period_id).order_by(MonthlyPlayer.player_name).all()
+    assert [(mp.player_id, mp.status, mp.phone) for mp in rows] == \
+        [(pid, "pending", f"1197777{i:04d}") for i, pid in enumerate(ids)]
+    assert period_totals.reconcile(user_id=user_id) == []
+    assert verify_user(user_id) == []
+
+    # Id desconhecido: nada é gravado
+    r = api_client.post(url, json={"player_ids": ["nao-existe"]}, headers=headers)
+    assert r.status_code == 400
+    assert "não foram encontrados" in r.get_json()["message"]
+    assert MonthlyPlayer.query.filter_by(monthly_period_id=period_id).count() == 4
+
+
+def test_add_all_active_players(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, ids = _seed(api_client, headers, 5)
+    assert api_client.patch(f"/api/players/{ids[4]}/deactivate", headers=headers).status_code == 200
+    url = f"/api/monthly-periods/{period_id}/players"
+    api_client.post(url, json={"player_ids": [ids[0]]}, headers=headers)
+
+    r = api_client.post(url, json={"all_active": True}, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["data"]["added_players"] == 3
+    assert MonthlyPlayer.query.filter_by(monthly_period_id=period_id).count() == 4
+    assert period_totals.reconcile(user_id=user_id) == []
+    assert verify_user(user_id) == []
+
+    r = api_client.post(url, json={"all_active": True}, headers=headers)
+    assert r.get_json()["data"]["added_players"] == 0
+    assert api_client.post(url, json={}, headers=headers).status_code == 400
+
+
+def test_add_players_uses_constant_queries(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, ids = _seed(api_client, headers, 41)
+    url = f"/api/monthly-periods/{period_id}/players"
+
+    small = api_client.post(url, json={"player_ids": ids[:1]}, headers=headers)
+    large = api_client.post(url, json={"player_ids": ids[1:]}, headers=headers)
+    assert large.get_json()["data"]["added_players"] == 40
+    assert small.headers["X-DB-Queries"] == large.headers["X-DB-Queries"]
@@ -0,0 +1,86 @@
+from sqlalchemy import event
+
+from backend.services import player_search
+from backend.services.db.connection import db
+from backend.services.db.models import Player
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_client, headers, user_id):
+    """12 jogadores ativos (4 já no período), 1 inativo e 1 de outro usuário"""
+    positions = ["goalkeeper", "defender", "midfielder", "forward"]
+    db.session.add_all(
+        [Player(user_id=user_id, name=f"Jogador {i:02d}", position=positions[i % 4], phone=f"119000000{i:02d}")
+         for i in range(12)]
+        + [Player(user_id=user_id, name="Inativo", position="forward", phone="11900000099", status="inactive")]
+    )
+    db.session.commit()
+    ids = [p.id for p in Player.query.filter_by(user_id=user_id).order_by(Player.name)]
+
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 5},
+                                headers=headers).get_json()["period_id"]
+    # Jogador 00, 03, 06 e 09 já no período
+    r = api_client.post(f"/api/monthly-periods/{period_id}/players", json={"player_ids": ids[1:13:3]}, headers=headers)
+    assert r.status_code == 200
+    return period_id
+
+
+def _available(api_client, headers, period_id, **params):
+    r = api_client.get(f"/api/monthly-periods/{period_id}/available-players", query_string=params, headers=headers)
+    assert r.status_code == 200
+    return r.get_json()
+
+
+def test_available_players_anti_join_with_filters(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id = _seed(api_client, headers, user_id)
+
+    statements = []
+    listener = lambda conn, cursor, statement, params, context, many: statements.append((statement, params))
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        names = [p["name"] for p in _available(api_client, headers, period_id)["data"]]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+
+    assert names == [f"Jogador {i:02d}" for i in range(12) if i % 3]
+    # Elenco do período resolvido no banco: NOT EXISTS, sem lista de ids como parâmetros
+    sql, params = next((s, p) for s, p in statements if "FROM players" in s)
+    assert "NOT (EXISTS" in sql and " IN (" not in sql
+    assert len(params) < 10
+
+    defenders = _available(api_client, headers, period_id, position="defender")["data"]
+    assert [p["name"] for p in defenders] == ["Jogador 01", "Jogador 05"]
+
+    assert [p["name"] for p in _available(api_client, headers, period_id, search="dor 1")["data"]] == \
+        ["Jogador 10", "Jogador 11"]
+
+    player_search.create_sqlite_fts(db.session.connection())
+    db.session.commit()
+    assert [p["name"] for p in _available(api_client, headers, period_id, search="jogador 0")["data"]] == \
+        [f"Jogador {i:02d}" for i in (1, 2, 4, 5, 7, 8)]
+
+
+def test_available_players_keyset_pagination(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id = _seed(api_client, headers, user_id)
+
+    pages, cursor = [], ""
+    while True:
+        body = _available(api_client, headers, period_id, cursor=cursor, per_page=3)
+        pages.append([p["name"] for p in body["data"]])
+        cursor = body["pagination"]["next_cursor"]
+        if not body["pagination"]["has_next"]:
+            break
+    assert pages == [["Jogador 01", "Jogador 02", "Jogador 04"], ["Jogador 05", "Jogador 07", "Jogador 08"],
+                     ["Jogador 10", "Jogador 11"]]
+
+    body = _available(api_client, headers, period_id, cursor="", per_page=2, search="jogador", position="midfielder")
+    assert [p["name"] for p in body["data"]] == ["Jogador 02", "Jogador 10"]
+    assert body["pagination"]["has_next"] is False
+
+    # per_page fora do intervalo ou inválido: limitado a 1..100 / padrão
+    assert len(_available(api_client, headers, period_id, cursor="", per_page=0)["data"]) == 1
+    assert len(_available(api_client, headers, period_id, cursor="", per_page="abc")["data"]) == 8
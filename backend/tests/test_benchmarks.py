@@ -0,0 +1,80 @@
+import copy
+
+from backend import create_app
+from backend.benchmarks import datagen
+from backend.benchmarks.compare import compare
+from backend.benchmarks.runner import run
+from backend.services.db.connection import db
+from backend.services.db.models import MonthlyPeriod, Player
+
+TINY = datagen.TenantSize(players=6, periods=3, expenses_per_month=2, casual_per_month=1)
+
+
+def test_datagen_is_deterministic():
+    app = create_app("testing")
+    snapshots = []
+    for _ in range(2):
+        with app.app_context():
+            db.create_all()
+            tenant = datagen.generate(TINY, tenants=2, seed=7)[0]
+            players = sorted((p.id, p.name, p.phone, str(p.monthly_fee)) for p in Player.query.all())
+            totals = sorted(
+                (p.id, p.year, p.month, str(p.total_expected), str(p.total_received))
+                for p in MonthlyPeriod.query.all()
+            )
+            snapshots.append((tenant.user_id, tenant.period_ids, players, totals))
+            db.session.remove()
+            db.drop_all()
+
+    assert snapshots[0] == snapshots[1]
+    assert len(snapshots[0][2]) == 2 * TINY.players
+    assert [m for _, _, m, _, _ in snapshots[0][3]].count(12) == 2
+
+
+def test_benchmark_run_covers_every_api_endpoint():
+    app = create_app("testing")
+    result = run(size=TINY, iterations=1, warmup=0, app=app)
+
+    assert result["uncovered"] == []
+    assert result["meta"]["dialect"] == "sqlite"
+    api_endpoints = {r.endpoint for r in app.url_map.iter_rules() if r.endpoint.startswith("api.")}
+    assert set(result["results"]) == api_endpoints
+    for endpoint, measured in result["results"].items():
+        assert all(status < 500 for status in measured["status"]), endpoint
+        assert measured["samples"] == 1
+        assert measured["latency_ms"]["min"] <= measured["latency_ms"]["median"] <= measured["latency_ms"]["max"]
+
+    # Leituras relevantes batem no banco e são contadas pelo profiler
+    assert result["results"]["api.get_players"]["queries"] >= 1
+    assert result["results"]["api.get_monthly_period_players"]["status"] == [200]
+
+
+def _result(median_ms=10.0, queries=3, peak_kb=100.0, status=(200,)):
+    return {
+        "meta": {"dialect": "sqlite", "size": {}, "tenants": 1, "seed": 42},
+        "results": {
+            "api.get_players": {
+                "status": list(status),
+                "latency_ms": {"median": median_ms},
+                "queries": queries,
+                "peak_memory_kb": peak_kb,
+            }
+        },
+    }
+
+
+def test_compare_flags_regressions():
+    baseline = _result()
+    assert compare(baseline, copy.deepcopy(baseline)) == []
+
+    # Ruído pequeno (relativo ou absoluto) não é regressão
+    assert compare(baseline, _result(median_ms=11.5)) == []
+    assert compare(_result(median_ms=1.0), _result(median_ms=2.0)) == []
+
+    regressions = compare(baseline, _result(median_ms=20.0, queries=4, peak_kb=400.0, status=(500,)))
+    assert {r["metric"] for r in regressions} == {"latency", "queries", "memory", "status"}
+    latency = next(r for r in regressions if r["metric"] == "latency")
+    assert latency["change"] == 1.0
+
+    missing = compare(baseline, {"meta": baseline["meta"], "results": {}})
+    assert [r["metric"] for r in missing] == ["missing"]
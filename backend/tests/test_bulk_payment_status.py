@@ -0,0 +1,94 @@
+from datetime import date
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import count_queries, register_user
+
+
+def _seed_period(api_app, user_id: str, n_players: int):
+    with api_app.app_context():
+        players = [
+            Player(user_id=user_id, name=f"Jogador {i:02d}", position="forward",
+                   phone=f"1196666{i:04d}", monthly_fee=100.0)
+            for i in range(n_players)
+        ]
+        db.session.add_all(players)
+        period = MonthlyPeriod(user_id=user_id, month=5, year=2024, name="05/2024")
+        db.session.add(period)
+        db.session.flush()
+        db.session.add_all([
+            MonthlyPlayer(
+                player_id=player.id,
+                monthly_period_id=period.id,
+                user_id=user_id,
+                player_name=player.name,
+                position=player.position,
+                phone=player.phone,
+                email="",
+                monthly_fee=100.0,
+                custom_monthly_fee=60.0 if i == 0 else None,
+                join_date=date(2024, 1, 1),
+                status="pending",
+            )
+            for i, player in enumerate(players)
+        ])
+        db.session.commit()
+        return period.id, [p.id for p in players]
+
+
+def test_bulk_payment_status_single_update(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, player_ids = _seed_period(api_app, user_id, n_players=30)
+
+    payments = [{"player_id": pid, "status": "paid", "payment_date": "2024-05-10T20:00:00Z"} for pid in player_ids[:29]]
+    payments.append({"player_id": player_ids[29], "status": "overdue"})
+
+    with count_queries() as statements:
+        r = api_client.patch(f"/api/monthly-periods/{period_id}/players/payments", json={"payments": payments},
+                             headers=headers)
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    assert data["period"]["total_received"] == 60.0 + 28 * 100.0
+    assert len(data["players"]) == 30
+    by_player = {p["player_id"]: p for p in data["players"]}
+    assert by_player[player_ids[0]]["payment_date"].startswith("2024-05-10T20:00:00")
+    assert by_player[player_ids[29]]["status"] == "overdue"
+    assert by_player[player_ids[29]]["payment_date"] is None
+
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE MONTHLY_PLAYERS")]
+    # Um UPDATE de status para todos e um de pending_months_count (inadimplência)
+    assert len(updates) == 2
+    assert [("SET status=" in s, "SET pending_months_count=" in s) for s in updates] == [(True, False), (False, True)]
+
+    with api_app.app_context():
+        assert MonthlyPlayer.query.filter_by(monthly_period_id=period_id, status="paid").count() == 29
+        period = db.session.get(MonthlyPeriod, period_id)
+        assert float(period.total_received) == 2860.0
+
+
+def test_bulk_payment_status_validation(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, player_ids = _seed_period(api_app, user_id, n_players=2)
+    url = f"/api/monthly-periods/{period_id}/players/payments"
+
+    r = api_client.patch(url, json={"payments": [{"player_id": player_ids[0], "status": "done"}]}, headers=headers)
+    assert r.status_code == 400
+
+    r = api_client.patch(url, json={"payments": [
+        {"player_id": player_ids[0], "status": "paid"},
+        {"player_id": player_ids[0], "status": "pending"},
+    ]}, headers=headers)
+    assert r.status_code == 400
+
+    r = api_client.patch(url, json={"payments": [{"player_id": "desconhecido", "status": "paid"}]}, headers=headers)
+    assert r.status_code == 404
+
+    r = api_client.patch("/api/monthly-periods/nao-existe/players/payments",
+                         json={"payments": [{"player_id": player_ids[0], "status": "paid"}]}, headers=headers)
+    assert r.status_code == 404
+
+    # Nada foi alterado pelas requisições rejeitadas
+    with api_app.app_context():
+        assert MonthlyPlayer.query.filter_by(monthly_period_id=period_id, status="paid").count() == 0
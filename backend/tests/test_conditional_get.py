@@ -0,0 +1,80 @@
+import pytest
+
+from backend.services.db.connection import db
+from backend.tests.fixtures.api import register_user
+
+
+@pytest.mark.parametrize("path", ["/api/players", "/api/monthly-periods", "/api/cashflow/summary"])
+def test_etag_roundtrip_returns_304(api_client, path):
+    headers = {"Authorization": f"Bearer {register_user(api_client)[0]}"}
+
+    r = api_client.get(path, headers=headers)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    r = api_client.get(path, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert r.data == b""
+
+    # sufixo adicionado pelo Flask-Compress continua válido
+    r = api_client.get(path, headers={**headers, "If-None-Match": etag[:-1] + ':gzip"'})
+    assert r.status_code == 304
+
+
+def test_etag_changes_after_tenant_write(api_client):
+    headers = {"Authorization": f"Bearer {register_user(api_client)[0]}"}
+    etag = api_client.get("/api/monthly-periods", headers=headers).headers["ETag"]
+
+    r = api_client.post("/api/monthly-payments", json={"year": 2024, "month": 5}, headers=headers)
+    assert r.status_code == 201
+
+    r = api_client.get("/api/monthly-periods", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert len(r.get_json()) == 1
+
+
+def test_etag_isolated_between_tenants(api_client):
+    headers_a = {"Authorization": f"Bearer {register_user(api_client, 'tenant_a')[0]}"}
+    headers_b = {"Authorization": f"Bearer {register_user(api_client, 'tenant_b')[0]}"}
+    etag_a = api_client.get("/api/monthly-periods", headers=headers_a).headers["ETag"]
+
+    r = api_client.post("/api/monthly-payments", json={"year": 2024, "month": 6}, headers=headers_b)
+    assert r.status_code == 201
+
+    # escrita de outro usuário não invalida o ETag
+    r = api_client.get("/api/monthly-periods", headers={**headers_a, "If-None-Match": etag_a})
+    assert r.status_code == 304
+    # e o ETag não é reaproveitável entre usuários
+    r = api_client.get("/api/monthly-periods", headers={**headers_b, "If-None-Match": etag_a})
+    assert r.status_code == 200
+
+
+def test_touch_tenant_is_a_single_upsert(api_app):
+    from sqlalchemy import event
+
+    from backend.services.db.models import User
+    from backend.services.tenant_versions import get_tenant_version, touch_tenant
+
+    user = User(username="upsert_tester", email="upsert_tester@example.com")
+    user.set_password("secret123")
+    db.session.add(user)
+    db.session.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        # Linha ausente (primeira escrita concorrente) e linha existente: um comando cada
+        db.session.execute(db.text("DELETE FROM tenant_versions"))
+        touch_tenant(db.session.connection(), user.id)
+        touch_tenant(db.session.connection(), user.id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    db.session.commit()
+
+    upserts = [s for s in statements if "tenant_versions" in s and "DELETE" not in s]
+    assert len(upserts) == 2 and all("ON CONFLICT" in s for s in upserts)
+    assert get_tenant_version(user.id) == 2
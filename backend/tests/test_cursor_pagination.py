@@ -0,0 +1,72 @@
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod
+from backend.tests.fixtures.api import register_user
+
+
+def _walk(api_client, url, headers):
+    """Percorre todas as páginas seguindo next_cursor"""
+    items, cursor, pages = [], "", 0
+    while True:
+        sep = "&" if "?" in url else "?"
+        r = api_client.get(f"{url}{sep}cursor={cursor}", headers=headers)
+        assert r.status_code == 200
+        body = r.get_json()
+        assert "total" not in body["pagination"]
+        items.extend(body["data"])
+        pages += 1
+        cursor = body["pagination"]["next_cursor"]
+        if not cursor:
+            assert body["pagination"]["has_next"] is False
+            return items, pages
+
+
+def test_players_cursor_pagination(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    with api_app.app_context():
+        # Nomes repetidos exercitam o desempate por id
+        db.session.add_all([
+            Player(user_id=user_id, name=f"Jogador {i % 4}", position="forward", phone=f"1194444{i:04d}")
+            for i in range(11)
+        ])
+        db.session.commit()
+        expected = [p.id for p in Player.query.filter_by(user_id=user_id).order_by(Player.name, Player.id)]
+
+    items, pages = _walk(api_client, "/api/players?per_page=3", headers)
+    assert [p["id"] for p in items] == expected
+    assert pages == 4
+
+    r = api_client.get("/api/players?cursor=nao-e-um-cursor", headers=headers)
+    assert r.status_code == 400
+
+    # per_page < 1 vira 1 (sem IndexError na chave do próximo cursor)
+    r = api_client.get("/api/players?cursor=&per_page=0", headers=headers)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [p["id"] for p in body["data"]] == expected[:1]
+    assert body["pagination"]["per_page"] == 1 and body["pagination"]["has_next"] is True
+
+
+def test_monthly_payments_cursor_pagination(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    with api_app.app_context():
+        db.session.add_all([
+            MonthlyPeriod(user_id=user_id, month=m, year=y, name=f"{m:02d}/{y}")
+            for y in (2024, 2025) for m in (1, 6, 11)
+        ])
+        db.session.commit()
+
+    items, pages = _walk(api_client, "/api/monthly-payments?per_page=4", headers)
+    assert [(i["period"]["year"], i["period"]["month"]) for i in items] == [
+        (2025, 11), (2025, 6), (2025, 1), (2024, 11), (2024, 6), (2024, 1)
+    ]
+    assert pages == 2
+
+    # Filtros continuam valendo no modo cursor
+    items, _ = _walk(api_client, "/api/monthly-payments?per_page=2&year=2024", headers)
+    assert [i["period"]["month"] for i in items] == [11, 6, 1]
+
+    # Sem cursor o modo por página (com total) continua igual
+    r = api_client.get("/api/monthly-payments?per_page=4", headers=headers)
+    assert r.get_json()["pagination"]["total"] == 6
@@ -0,0 +1,99 @@
+from backend.services import delinquency
+from backend.services.db.connection import db
+from backend.services.db.models import MonthlyPlayer
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_client, headers, months):
+    """Ana (R$ 100) e Bruno (R$ 80) inscritos nos meses de 2025 informados, todos pendentes"""
+    players = [{"name": "Ana", "position": "defender", "phone": "11999990001", "monthly_fee": 100},
+               {"name": "Bruno", "position": "forward", "phone": "11999990002", "monthly_fee": 80}]
+    ids = [r["id"] for r in api_client.post("/api/players/bulk", json={"players": players},
+                                            headers=headers).get_json()["data"]["results"]]
+    periods = {}
+    for month in months:
+        periods[month] = _open_month(api_client, headers, 2025, month, ids)
+    return ids, periods
+
+
+def _open_month(api_client, headers, year, month, player_ids):
+    period_id = api_client.post("/api/monthly-payments", json={"year": year, "month": month},
+                                headers=headers).get_json()["period_id"]
+    assert api_client.post(f"/api/monthly-periods/{period_id}/players", json={"player_ids": player_ids},
+                           headers=headers).status_code == 200
+    return period_id
+
+
+def _pay(api_client, headers, period_id, player_id, status="paid"):
+    r = api_client.patch(f"/api/monthly-periods/{period_id}/players/{player_id}/payment", json={"status": status},
+                         headers=headers)
+    assert r.status_code == 200
+    return r.get_json()["data"]
+
+
+def _streaks(player_id, periods):
+    counts = dict(db.session.query(MonthlyPlayer.monthly_period_id, MonthlyPlayer.pending_months_count)
+                  .filter_by(player_id=player_id))
+    return [counts[pid] for pid in periods]
+
+
+def test_consecutive_unpaid_months_follow_status_changes(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    (ana, bruno), periods = _seed(api_client, headers, (2, 3, 4))
+    feb, mar, apr = periods[2], periods[3], periods[4]
+    assert _streaks(ana, [feb, mar, apr]) == [1, 2, 3]
+
+    # Pagar março quebra a sequência: abril volta a 1
+    assert _pay(api_client, headers, mar, ana)["pending_months_count"] == 0
+    assert _streaks(ana, [feb, mar, apr]) == [1, 0, 1]
+    assert _pay(api_client, headers, mar, ana, "pending")["pending_months_count"] == 2
+    assert _streaks(ana, [feb, mar, apr]) == [1, 2, 3]
+
+    # Mês anterior incluído depois desloca a contagem dos seguintes
+    _open_month(api_client, headers, 2025, 1, [ana])
+    assert _streaks(ana, [feb, mar, apr]) == [2, 3, 4]
+
+    # Alteração em lote (UPDATE via Core) e rollover (INSERT ... SELECT)
+    r = api_client.patch(f"/api/monthly-periods/{feb}/players/payments",
+                         json={"payments": [{"player_id": ana, "status": "paid"},
+                                            {"player_id": bruno, "status": "paid"}]}, headers=headers)
+    assert r.status_code == 200
+    assert {p["player_id"]: p["pending_months_count"] for p in r.get_json()["data"]["players"]} == {ana: 0, bruno: 0}
+    assert _streaks(ana, [feb, mar, apr]) == [0, 1, 2]
+    may = api_client.post("/api/monthly-periods/rollover", headers=headers).get_json()["data"]["period"]["id"]
+    assert _streaks(ana, [apr, may]) == [2, 3]
+    assert _streaks(bruno, [feb, mar, apr, may]) == [0, 1, 2, 3]
+    assert delinquency.verify_user(user_id) == []
+
+
+def test_outstanding_debts_endpoint(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    (ana, bruno), periods = _seed(api_client, headers, (1, 2, 3))
+    _pay(api_client, headers, periods[1], ana)
+    _pay(api_client, headers, periods[3], ana)
+    for month in (1, 2, 3):
+        _pay(api_client, headers, periods[month], bruno, "paid" if month == 1 else "pending")
+    monthly_player_id = MonthlyPlayer.query.filter_by(monthly_period_id=periods[2], player_id=bruno).one().id
+    api_client.put(f"/api/monthly-players/{monthly_player_id}/custom-fee", json={"custom_monthly_fee": 60},
+                   headers=headers)
+
+    r = api_client.get("/api/debts", headers=headers)
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    assert data["debtors"] == 2
+    assert data["total_outstanding"] == 240.0
+    assert data["players"] == [
+        {"player_id": bruno, "player_name": "Bruno", "position": "forward", "phone": "11999990002",
+         "player_status": "active", "unpaid_months": 2, "consecutive_unpaid_months": 2,
+         "outstanding_amount": 140.0, "oldest_unpaid_period": "02/2025", "latest_unpaid_period": "03/2025"},
+        {"player_id": ana, "player_name": "Ana", "position": "defender", "phone": "11999990001",
+         "player_status": "active", "unpaid_months": 1, "consecutive_unpaid_months": 0,
+         "outstanding_amount": 100.0, "oldest_unpaid_period": "02/2025", "latest_unpaid_period": "02/2025"},
+    ]
+
+    r = api_client.get("/api/debts?min_months=2", headers=headers)
+    assert [p["player_id"] for p in r.get_json()["data"]["players"]] == [bruno]
+    assert api_client.get("/api/debts?min_months=-1", headers=headers).status_code == 400
+    assert delinquency.verify_user(user_id) == []
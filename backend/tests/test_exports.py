@@ -0,0 +1,106 @@
+import csv
+import gzip
+import io
+import json
+
+from backend.services import exports
+from backend.services.db.connection import db
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_client, headers):
+    players = [{"name": f"Jogador {i:02d}", "position": "midfielder", "phone": f"1199999{i:04d}", "monthly_fee": 80}
+               for i in range(7)]
+    r = api_client.post("/api/players/bulk", json={"players": players}, headers=headers)
+    assert r.get_json()["data"]["created"] == 7
+    period_ids = {}
+    for year, month in ((2024, 12), (2025, 1)):
+        period_id = api_client.post("/api/monthly-payments", json={"year": year, "month": month},
+                                    headers=headers).get_json()["period_id"]
+        available = api_client.get(f"/api/monthly-periods/{period_id}/available-players",
+                                   headers=headers).get_json()["data"]
+        r = api_client.post(f"/api/monthly-periods/{period_id}/players",
+                            json={"player_ids": [p["id"] for p in available]}, headers=headers)
+        assert r.status_code in (200, 201)
+        r = api_client.post(f"/api/monthly-periods/{period_id}/expenses",
+                            json={"description": "Campo", "amount": 150.25, "category": "equipment",
+                                  "expense_date": f"{year}-{month:02d}-10"}, headers=headers)
+        assert r.status_code == 201
+        period_ids[year] = period_id
+    return period_ids
+
+
+def _csv_rows(body):
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8"))))
+
+
+def test_exports_stream_every_resource_in_batches(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_client, headers)
+    api_app.config["EXPORT_YIELD_PER"] = 3
+
+    r = api_client.get("/api/export/players", headers=headers)
+    assert r.status_code == 200
+    assert r.is_streamed
+    assert r.mimetype == "text/csv"
+    assert r.headers["Content-Disposition"] == 'attachment; filename="players.csv"'
+    assert "Content-Encoding" not in r.headers
+    # Um pedaço por lote de 3 linhas (o cabeçalho vai no primeiro)
+    chunks = list(r.iter_encoded())
+    assert len(chunks) == 3
+    rows = _csv_rows(b"".join(chunks))
+    assert [row["name"] for row in rows] == [f"Jogador {i:02d}" for i in range(7)]
+    assert rows[0]["monthly_fee"] == "80.00"
+
+    payments = _csv_rows(api_client.get("/api/export/monthly-payments", headers=headers).get_data())
+    assert len(payments) == 14
+    assert (payments[0]["year"], payments[-1]["year"]) == ("2024", "2025")
+
+    r = api_client.get("/api/export/expenses?format=ndjson", headers=headers)
+    assert r.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+    assert [(e["year"], e["month"], e["amount"], e["expense_date"]) for e in lines] == [
+        (2024, 12, 150.25, "2024-12-10"), (2025, 1, 150.25, "2025-01-10")]
+
+    cashflow = _csv_rows(api_client.get("/api/export/cashflow", headers=headers).get_data())
+    assert [(row["year"], row["month"]) for row in cashflow] == [("2024", "12"), ("2025", "1")]
+
+
+def test_exports_filter_by_year_and_period(api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_ids = _seed(api_client, headers)
+
+    r = api_client.get("/api/export/monthly-payments?year=2025", headers=headers)
+    assert r.headers["Content-Disposition"] == 'attachment; filename="monthly-payments-2025.csv"'
+    assert {row["year"] for row in _csv_rows(r.get_data())} == {"2025"}
+
+    r = api_client.get(f"/api/export/cashflow?format=ndjson&period_id={period_ids[2024]}", headers=headers)
+    assert [json.loads(line)["month"] for line in r.get_data(as_text=True).splitlines()] == [12]
+
+    assert api_client.get("/api/export/players?period_id=nao-existe", headers=headers).status_code == 400
+    assert api_client.get("/api/export/players?format=xml", headers=headers).status_code == 400
+    assert api_client.get("/api/export/users", headers=headers).status_code == 400
+
+
+def test_exports_gzip_streaming(api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_client, headers)
+
+    r = api_client.get("/api/export/monthly-payments", headers={**headers, "Accept-Encoding": "gzip, deflate"})
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.is_streamed
+    assert len(_csv_rows(gzip.decompress(r.get_data()))) == 14
+
+
+def test_iter_batches_uses_yield_per(api_app, api_client):
+    token, user_id = register_user(api_client)
+    _seed(api_client, {"Authorization": f"Bearer {token}"})
+
+    query = exports.EXPORTS["monthly-payments"](user_id, None, None)
+    batches = list(exports.iter_batches(query.statement, yield_per=4))
+    assert [len(batch) for batch in batches] == [4, 4, 4, 2]
+    assert len(db.session.identity_map) == 0
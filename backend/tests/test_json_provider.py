@@ -0,0 +1,97 @@
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flask import jsonify
+
+from backend import create_app
+from backend.blueprints.api.response_utils import APIResponse
+from backend.services import json_provider
+from backend.services.json_provider import FastJSONProvider
+
+
+@dataclass
+class _Point:
+    x: int
+    y: int
+
+
+class _Model:
+    def to_dict(self):
+        return {"id": "m1", "created_at": datetime(2025, 1, 2, 3, 4, 5)}
+
+
+PAYLOAD = {
+    "zeta": Decimal("100.50"),
+    "alpha": {
+        "when": datetime(2025, 3, 1, 12, 30, 0, 250),
+        "day": date(2025, 3, 1),
+        "model": _Model(),
+        "point": _Point(1, 2),
+        "uid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    },
+    "name": "João",
+    "counts": {1: "um"},
+}
+
+EXPECTED = {
+    "alpha": {
+        "day": "2025-03-01",
+        "model": {"created_at": "2025-01-02T03:04:05", "id": "m1"},
+        "point": {"x": 1, "y": 2},
+        "uid": "12345678-1234-5678-1234-567812345678",
+        "when": "2025-03-01T12:30:00.000250",
+    },
+    "counts": {"1": "um"},
+    "name": "João",
+    "zeta": 100.5,
+}
+
+
+@pytest.fixture(scope="function")
+def app():
+    return create_app("testing")
+
+
+@pytest.mark.parametrize("fast", [True, False], ids=["orjson", "stdlib"])
+def test_provider_serializes_api_types(app, monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson não instalado")
+    assert isinstance(app.json, FastJSONProvider)
+
+    app.debug = False
+    with app.test_request_context():
+        body = jsonify(PAYLOAD).get_data()
+    assert json.loads(body) == EXPECTED
+    # Chaves ordenadas, saída compacta e UTF-8 (sem ã)
+    assert body.startswith(b'{"alpha":{"day":"2025-03-01"')
+    assert "João".encode() in body
+
+    app.debug = True
+    with app.test_request_context():
+        pretty = jsonify(PAYLOAD).get_data(as_text=True)
+    assert json.loads(pretty) == EXPECTED
+    assert '\n  "alpha": {' in pretty
+
+
+def test_provider_falls_back_for_values_orjson_rejects(app):
+    huge = 2 ** 70
+    with app.test_request_context():
+        assert json.loads(jsonify({"n": huge}).get_data()) == {"n": huge}
+        with pytest.raises(TypeError):
+            jsonify({"x": object()})
+    assert json.loads(app.json.dumps({"d": Decimal("1.25")})) == {"d": 1.25}
+
+
+def test_api_response_uses_single_pass(app):
+    with app.test_request_context():
+        response, status = APIResponse.success({"fee": Decimal("80.00"), "when": date(2025, 5, 1)})
+        paged, _ = APIResponse.paginated([_Model()], {"page": 1})
+    assert status == 200
+    assert response.get_json()["data"] == {"fee": 80.0, "when": "2025-05-01"}
+    assert paged.get_json()["data"] == [{"created_at": "2025-01-02T03:04:05", "id": "m1"}]
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from backend import create_app
+from backend.benchmarks.loadtest import DASHBOARD_MIX, format_load_report, run_load
+from backend.config import TestingConfig
+from backend.services.db.connection import db
+
+
+@pytest.fixture(scope="function")
+def live_server(tmp_path, monkeypatch):
+    # Banco em arquivo: o servidor atende cada requisição em uma thread
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'load.db'}")
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def test_load_test_reports_every_action(live_server):
+    result = run_load(live_server, users=2, concurrency=3, duration=1.0, players_per_user=5)
+
+    assert set(result["endpoints"]) == {action.name for action in DASHBOARD_MIX}
+    assert result["total"]["requests"] == sum(r["requests"] for r in result["endpoints"].values())
+    assert result["total"]["errors"] == 0
+    for report in result["endpoints"].values():
+        latency = report["latency_ms"]
+        assert latency["min"] <= latency["median"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+        assert report["throughput_rps"] > 0
+
+    # Segunda execução reaproveita usuários e período já criados
+    again = run_load(live_server, users=2, concurrency=1, duration=0.3, players_per_user=5)
+    assert again["total"]["errors"] == 0
+    assert "TOTAL" in format_load_report(again)
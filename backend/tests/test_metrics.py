@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from backend.services import metrics as metrics_service
+from backend.services.metrics import MetricsRegistry, REQUEST_BUCKETS, histogram_quantile
+from backend.tests.fixtures.api import register_user
+
+
+def test_metrics_endpoint(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for _ in range(3):
+        assert api_client.get("/api/players", headers=headers).status_code == 200
+    api_client.get("/api/players")  # 401 sem token
+
+    r = api_client.get("/metrics")
+    assert r.status_code == 200
+    assert r.mimetype == "text/plain"
+    text = r.get_data(as_text=True)
+    assert 'http_requests_total{method="GET",endpoint="/api/players",status="200"} 3' in text
+    assert 'http_requests_total{method="GET",endpoint="/api/players",status="401"} 1' in text
+    assert re.search(r'http_request_duration_seconds_bucket\{method="GET",endpoint="/api/players",le="\+Inf"\} 4', text)
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert re.search(r"db_pool_checkouts_total \d+", text)
+    assert "db_pool_checkout_wait_seconds_count" in text
+
+    summary = api_client.get("/metrics?format=json").get_json()
+    route = next(r for r in summary["routes"] if r["endpoint"] == "/api/players")
+    assert route["statuses"] == {"200": 3, "401": 1}
+    assert route["count"] == 4
+    assert route["p50_ms"] <= route["p95_ms"] <= route["p99_ms"]
+    assert summary["db_pool"]["checkouts"] >= 1
+    assert summary["db_pool"]["checkout_wait"]["count"] == summary["db_pool"]["checkouts"]
+
+
+def test_metrics_requires_allowed_ip_or_token(api_app, api_client):
+    remote = {"REMOTE_ADDR": "10.1.2.3"}
+    assert api_client.get("/metrics", environ_base=remote).status_code == 403
+
+    api_app.config["METRICS_TOKEN"] = "scrape-secret"
+    assert api_client.get("/metrics", environ_base=remote,
+                          headers={"Authorization": "Bearer outro"}).status_code == 403
+    r = api_client.get("/metrics", environ_base=remote, headers={"Authorization": "Bearer scrape-secret"})
+    assert r.status_code == 200
+
+    api_app.config["METRICS_ALLOWED_IPS"] = ["10.1.2.3"]
+    assert api_client.get("/metrics?format=json", environ_base=remote).status_code == 200
+
+
+def test_histogram_quantile():
+    registry = MetricsRegistry()
+    for value in [0.001] * 90 + [0.2] * 10:
+        registry.observe("h", value, REQUEST_BUCKETS)
+    hist = next(iter(registry._snapshot()["histograms"].values()))
+    assert histogram_quantile(0.5, hist) <= 0.005
+    assert 0.1 < histogram_quantile(0.95, hist) <= 0.25
+
+
+def test_registry_aggregates_worker_snapshots(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    worker = MetricsRegistry(directory, flush_interval=0)
+    labels = (("method", "GET"), ("endpoint", "/api/players"), ("status", "200"))
+
+    # Snapshot de outro worker vivo e de um worker já encerrado
+    other = MetricsRegistry()
+    other.inc("http_requests_total", labels, 5)
+    other.observe("http_request_duration_seconds", 0.02, REQUEST_BUCKETS)
+    for pid in (111, 222):
+        with open(os.path.join(directory, f"{pid}.json"), "w") as fh:
+            json.dump(other._snapshot(), fh)
+    monkeypatch.setattr(metrics_service, "_pid_alive", lambda pid: pid != 222)
+
+    worker.inc("http_requests_total", labels, 2)
+    worker.flush()
+
+    total = worker.collect()
+    assert list(total["counters"].values()) == [12]
+    assert next(iter(total["histograms"].values()))["count"] == 2
+    # O snapshot do worker encerrado foi incorporado ao archive.json
+    assert sorted(os.listdir(directory)) == sorted(["111.json", "archive.json", f"{os.getpid()}.json", ".lock"])
+    assert list(worker.collect()["counters"].values()) == [12]
+    worker.close()
+
+
+def _requests_total(registry):
+    return sum(registry.collect()["counters"].values())
+
+
+def test_idle_worker_flushes_pending_requests(tmp_path):
+    labels = (("method", "GET"), ("endpoint", "/api/players"), ("status", "200"))
+    worker = MetricsRegistry(str(tmp_path), flush_interval=0.1)
+    worker.inc("http_requests_total", labels)
+    worker.flush()
+    # Segunda requisição dentro do intervalo: o flush do after_request é ignorado
+    worker.inc("http_requests_total", labels)
+    worker.flush()
+
+    reader = MetricsRegistry(str(tmp_path))
+    deadline = time.monotonic() + 5
+    while _requests_total(reader) < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _requests_total(reader) == 2
+    worker.close()
+    reader.close()
+
+
+def test_exiting_worker_flushes_pending_requests(tmp_path):
+    # Worker real em outro processo: encerra sem nova requisição depois da que foi limitada
+    code = (
+        "from backend.services.metrics import MetricsRegistry\n"
+        f"worker = MetricsRegistry({str(tmp_path)!r}, flush_interval=3600)\n"
+        "labels = (('method', 'GET'), ('endpoint', '/api/players'), ('status', '200'))\n"
+        "for _ in range(3):\n"
+        "    worker.inc('http_requests_total', labels)\n"
+        "    worker.flush()\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root,
+                   env={**os.environ, "PYTHONPATH": root})
+
+    reader = MetricsRegistry(str(tmp_path))
+    assert _requests_total(reader) == 3
+    # O snapshot do processo encerrado foi incorporado ao archive.json
+    assert "archive.json" in os.listdir(tmp_path)
+    reader.close()
@@ -0,0 +1,93 @@
+from datetime import date
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod, MonthlyPlayer, CasualPlayer
+from backend.tests.fixtures.api import count_queries, register_user
+
+
+def _seed_periods(api_app, user_id: str, n_periods: int, n_players: int = 3):
+    with api_app.app_context():
+        players = []
+        for i in range(n_players):
+            players.append(Player(
+                user_id=user_id,
+                name=f"Jogador {i}",
+                position="Atacante",
+                phone=f"1199999{i:04d}",
+                email=f"jogador{i}@example.com",
+                monthly_fee=50.0,
+            ))
+        db.session.add_all(players)
+        db.session.commit()
+
+        for m in range(1, n_periods + 1):
+            period = MonthlyPeriod(user_id=user_id, month=m, year=2024, name=f"{m:02d}/2024")
+            db.session.add(period)
+            db.session.flush()
+            for i, player in enumerate(players):
+                db.session.add(MonthlyPlayer(
+                    player_id=player.id,
+                    monthly_period_id=period.id,
+                    user_id=user_id,
+                    player_name=player.name,
+                    position=player.position,
+                    phone=player.phone,
+                    email=player.email,
+                    monthly_fee=player.monthly_fee,
+                    join_date=date(2024, 1, 1),
+                    status="paid" if i == 0 else "pending",
+                ))
+            db.session.add(CasualPlayer(
+                monthly_period_id=period.id,
+                user_id=user_id,
+                player_name="Avulso",
+                play_date=date(2024, m, 10),
+                invited_by="Jogador 0",
+                amount=20.0,
+            ))
+        db.session.commit()
+        return [p.id for p in players]
+
+
+def test_monthly_payments_query_count_is_constant(api_app, api_client):
+    token, user_id = register_user(api_client)
+    _seed_periods(api_app, user_id, n_periods=2)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with count_queries() as small:
+        r = api_client.get("/api/monthly-payments", headers=headers)
+    assert r.status_code == 200
+    assert len(r.get_json()["data"]) == 2
+
+    with api_app.app_context():
+        extra = [MonthlyPeriod(user_id=user_id, month=m, year=2024, name=f"{m:02d}/2024") for m in range(3, 9)]
+        db.session.add_all(extra)
+        db.session.commit()
+
+    with count_queries() as large:
+        r = api_client.get("/api/monthly-payments", headers=headers)
+    assert r.status_code == 200
+    assert len(r.get_json()["data"]) == 8
+
+    # Versão do tenant (cache) + paginação (count + página) + jogadores mensais + jogadores + avulsos
+    assert len(large) == len(small)
+    assert len(large) <= 6
+
+
+def test_monthly_payments_batch_filters(api_app, api_client):
+    token, user_id = register_user(api_client)
+    player_ids = _seed_periods(api_app, user_id, n_periods=3)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = api_client.get(f"/api/monthly-payments?player_id={player_ids[1]}", headers=headers)
+    assert r.status_code == 200
+    for item in r.get_json()["data"]:
+        assert [mp["player_id"] for mp in item["monthly_players"]] == [player_ids[1]]
+        assert len(item["casual_players"]) == 1
+
+    r = api_client.get("/api/monthly-payments?status=paid", headers=headers)
+    assert r.status_code == 200
+    for item in r.get_json()["data"]:
+        assert [mp["status"] for mp in item["monthly_players"]] == ["paid"]
+        assert item["monthly_players"][0]["player"]["name"] == "Jogador 0"
+        assert item["monthly_players"][0]["monthly_period"]["id"] == item["period"]["id"]
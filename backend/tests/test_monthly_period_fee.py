@@ -0,0 +1,126 @@
+from datetime import date
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import count_queries, register_user
+
+
+def _seed(api_app, user_id: str, months, n_players: int, year: int = 2024):
+    """Cria períodos do ano com n_players jogadores (o primeiro pago, o segundo com taxa customizada)"""
+    with api_app.app_context():
+        players = [
+            Player(user_id=user_id, name=f"Jogador {i}", position="forward",
+                   phone=f"119{year}{len(months)}{i:04d}", monthly_fee=100.0)
+            for i in range(n_players)
+        ]
+        db.session.add_all(players)
+        db.session.flush()
+
+        period_ids = []
+        for m in months:
+            period = MonthlyPeriod(user_id=user_id, month=m, year=year, name=f"{m:02d}/{year}")
+            db.session.add(period)
+            db.session.flush()
+            period_ids.append(period.id)
+            db.session.add_all([
+                MonthlyPlayer(
+                    player_id=player.id,
+                    monthly_period_id=period.id,
+                    user_id=user_id,
+                    player_name=player.name,
+                    position=player.position,
+                    phone=player.phone,
+                    email="",
+                    monthly_fee=100.0,
+                    custom_monthly_fee=50.0 if i == 1 else None,
+                    join_date=date(2024, 1, 1),
+                    status="paid" if i == 0 else "pending",
+                )
+                for i, player in enumerate(players)
+            ])
+        db.session.commit()
+        return period_ids
+
+
+def _player_statements(statements):
+    return [s for s in statements if "monthly_players" in s]
+
+
+def test_update_monthly_period_fee_is_set_based(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    small_id, = _seed(api_app, user_id, months=[1], n_players=3)
+
+    with count_queries() as small:
+        r = api_client.put(f"/api/monthly-periods/{small_id}", json={"monthly_fee": 120}, headers=headers)
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    # 2 jogadores sem taxa customizada a 120 + 1 com taxa customizada de 50
+    assert data["total_expected"] == 290.0
+    assert data["total_received"] == 120.0
+
+    with api_app.app_context():
+        fees = sorted(float(mp.effective_monthly_fee) for mp in MonthlyPlayer.query.filter_by(monthly_period_id=small_id))
+        assert fees == [50.0, 120.0, 120.0]
+
+    large_id, = _seed(api_app, user_id, months=[1], n_players=40, year=2025)
+
+    with count_queries() as large:
+        r = api_client.put(f"/api/monthly-periods/{large_id}", json={"monthly_fee": 120}, headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["data"]["total_expected"] == 39 * 120.0 + 50.0
+
+    # UPDATE em massa + uma agregação, independente do tamanho do elenco
+    assert len(_player_statements(large)) == len(_player_statements(small)) == 2
+
+
+def test_update_monthly_period_fee_and_status_together(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, = _seed(api_app, user_id, months=[2], n_players=2)
+
+    r = api_client.put(f"/api/monthly-periods/{period_id}", json={"monthly_fee": 80, "status": "closed"},
+                       headers=headers)
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    assert data["is_active"] is False
+    assert data["total_expected"] == 130.0
+
+    r = api_client.put(f"/api/monthly-periods/{period_id}", json={"monthly_fee": 0}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_readjust_fee_across_periods(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_ids = _seed(api_app, user_id, months=[1, 2, 3, 4], n_players=2)
+
+    r = api_client.put(
+        "/api/monthly-periods/monthly-fee",
+        json={"monthly_fee": 90, "from_year": 2024, "from_month": 2, "to_year": 2024, "to_month": 3},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    data = r.get_json()["data"]
+    assert data["updated_players"] == 2
+    assert [p["month"] for p in data["periods"]] == [2, 3]
+    assert all(p["total_expected"] == 140.0 for p in data["periods"])
+
+    r = api_client.put(
+        "/api/monthly-periods/monthly-fee",
+        json={"monthly_fee": 110, "period_ids": [period_ids[0], period_ids[3]]},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert [p["total_expected"] for p in r.get_json()["data"]["periods"]] == [160.0, 160.0]
+
+    with api_app.app_context():
+        expected = [float(p.total_expected) for p in
+                    MonthlyPeriod.query.filter_by(user_id=user_id).order_by(MonthlyPeriod.month)]
+        assert expected == [160.0, 140.0, 140.0, 160.0]
+
+    r = api_client.put("/api/monthly-periods/monthly-fee", json={"monthly_fee": 110, "period_ids": ["nope"]},
+                       headers=headers)
+    assert r.status_code == 400
+    r = api_client.put("/api/monthly-periods/monthly-fee", json={"monthly_fee": 110}, headers=headers)
+    assert r.status_code == 400
@@ -0,0 +1,103 @@
+import re
+from decimal import Decimal
+
+from backend.services import period_totals
+from backend.services.cashflow_ledger import verify_user
+from backend.services.db.models import MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import register_user
+
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+
+def _seed_january(api_client, headers):
+    """Janeiro/2025 com 3 jogadores: um pago, um com mensalidade customizada e um que será inativado"""
+    players = [{"name": name, "position": "midfielder", "phone": f"119999900{i:02d}", "monthly_fee": 100}
+               for i, name in enumerate(["Ana", "Bruno", "Carla"])]
+    ids = [r["id"] for r in api_client.post("/api/players/bulk", json={"players": players},
+                                            headers=headers).get_json()["data"]["results"]]
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 1},
+                                headers=headers).get_json()["period_id"]
+    assert api_client.post(f"/api/monthly-periods/{period_id}/players", json={"player_ids": ids},
+                           headers=headers).status_code == 200
+    assert api_client.patch(f"/api/monthly-periods/{period_id}/players/{ids[0]}/payment", json={"status": "paid"},
+                            headers=headers).status_code == 200
+    monthly_player_id = MonthlyPlayer.query.filter_by(monthly_period_id=period_id, player_id=ids[1]).one().id
+    assert api_client.put(f"/api/monthly-players/{monthly_player_id}/custom-fee",
+                          json={"custom_monthly_fee": 60}, headers=headers).status_code == 200
+    assert api_client.patch(f"/api/players/{ids[2]}/deactivate", headers=headers).status_code == 200
+    return period_id, ids
+
+
+def test_rollover_copies_active_roster_with_totals(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    january_id, ids = _seed_january(api_client, headers)
+
+    r = api_client.post("/api/monthly-periods/rollover", json={"carry_custom_fee": True}, headers=headers)
+    assert r.status_code == 201
+    data = r.get_json()["data"]
+    assert data["source_period_id"] == january_id
+    assert data["copied_players"] == 2
+    period = data["period"]
+    assert (period["year"], period["month"], period["name"]) == (2025, 2, "02/2025")
+    assert period["players_count"] == 2
+    assert period["total_expected"] == 160.0 and period["total_received"] == 0.0
+
+    rows = MonthlyPlayer.query.filter_by(monthly_period_id=period["id"]).order_by(MonthlyPlayer.player_name).all()
+    assert [(mp.player_id, mp.status, mp.custom_monthly_fee) for mp in rows] == [
+        (ids[0], "pending", None), (ids[1], "pending", Decimal("60.00"))]
+    assert all(UUID_RE.match(mp.id) for mp in rows)
+    assert period_totals.reconcile(user_id=user_id) == []
+    assert verify_user(user_id) == []
+
+    # Sem carregar a mensalidade customizada; mês já existente é recusado
+    r = api_client.post("/api/monthly-periods/rollover", headers=headers)
+    assert r.get_json()["data"]["period"]["total_expected"] == 200.0
+    r = api_client.post("/api/monthly-periods/rollover", json={"year": 2025, "month": 3}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_rollover_uses_constant_queries(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    players = [{"name": f"Jogador {i:02d}", "position": "defender", "phone": f"1198888{i:04d}", "monthly_fee": 90}
+               for i in range(40)]
+    api_client.post("/api/players/bulk", json={"players": players}, headers=headers)
+
+    counts = []
+    for month, size in ((1, 5), (3, 40)):
+        source_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": month},
+                                    headers=headers).get_json()["period_id"]
+        available = api_client.get(f"/api/monthly-periods/{source_id}/available-players", headers=headers).get_json()
+        api_client.post(f"/api/monthly-periods/{source_id}/players",
+                        json={"player_ids": [p["id"] for p in available["data"][:size]]}, headers=headers)
+        r = api_client.post("/api/monthly-periods/rollover", json={"source_period_id": source_id}, headers=headers)
+        assert r.get_json()["data"]["copied_players"] == size
+        counts.append(int(r.headers["X-DB-Queries"]))
+    assert counts[0] == counts[1]
+
+
+def test_season_precreates_periods_with_roster(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    january_id, _ = _seed_january(api_client, headers)
+    api_client.post("/api/monthly-payments", json={"year": 2025, "month": 9}, headers=headers)
+
+    r = api_client.post("/api/monthly-periods/season", json={"year": 2025, "source_period_id": january_id},
+                        headers=headers)
+    assert r.status_code == 201
+    data = r.get_json()["data"]
+    # Temporada padrão: agosto a maio (SEASON_START_MONTH/SEASON_END_MONTH)
+    assert [(p["year"], p["month"]) for p in data["periods"]] == \
+        [(2025, 8)] + [(2025, m) for m in range(10, 13)] + [(2026, m) for m in range(1, 6)]
+    assert data["skipped"] == ["09/2025"]
+    assert data["copied_players"] == 2 * 9
+    assert {p["players_count"] for p in data["periods"]} == {2}
+    assert MonthlyPeriod.query.filter_by(user_id=user_id).count() == 11
+    assert period_totals.reconcile(user_id=user_id) == []
+    assert verify_user(user_id) == []
+
+    r = api_client.post("/api/monthly-periods/season", json={"year": 2025, "start_month": 8, "months": 2},
+                        headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["data"]["skipped"] == ["08/2025", "09/2025"]
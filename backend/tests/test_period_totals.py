@@ -0,0 +1,129 @@
+from datetime import date
+
+from backend.cli import periods_cli
+from backend.services import period_totals
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_app, user_id: str):
+    with api_app.app_context():
+        players = [
+            Player(user_id=user_id, name=f"Jogador {i}", position="forward",
+                   phone=f"1195555{i:04d}", monthly_fee=100.0)
+            for i in range(3)
+        ]
+        period = MonthlyPeriod(user_id=user_id, month=6, year=2024, name="06/2024")
+        db.session.add_all(players + [period])
+        db.session.commit()
+        return period.id, [p.id for p in players]
+
+
+def _totals(period_id):
+    period = db.session.get(MonthlyPeriod, period_id)
+    db.session.refresh(period)
+    return float(period.total_expected), float(period.total_received), period.players_count
+
+
+def test_totals_follow_player_mutations(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, player_ids = _seed(api_app, user_id)
+
+    r = api_client.post(f"/api/monthly-periods/{period_id}/players", json={"player_ids": player_ids}, headers=headers)
+    assert r.status_code == 200
+    with api_app.app_context():
+        assert _totals(period_id) == (300.0, 0.0, 3)
+
+    r = api_client.patch(f"/api/monthly-periods/{period_id}/players/{player_ids[0]}/payment",
+                         json={"status": "paid"}, headers=headers)
+    assert r.status_code == 200
+    with api_app.app_context():
+        assert _totals(period_id) == (300.0, 100.0, 3)
+        paid_id = MonthlyPlayer.query.filter_by(player_id=player_ids[0]).one().id
+
+    # Taxa customizada de um jogador pago altera previsto e recebido
+    r = api_client.put(f"/api/monthly-players/{paid_id}/custom-fee", json={"custom_monthly_fee": 40}, headers=headers)
+    assert r.status_code == 200
+    with api_app.app_context():
+        assert _totals(period_id) == (240.0, 40.0, 3)
+
+    with api_app.app_context():
+        mp = MonthlyPlayer.query.filter_by(player_id=player_ids[1]).one()
+        db.session.delete(mp)
+        db.session.commit()
+        assert _totals(period_id) == (140.0, 40.0, 2)
+
+    with api_app.app_context():
+        assert period_totals.reconcile(user_id=user_id) == []
+
+
+def test_totals_delta_on_expired_attributes(api_app, api_client):
+    _, user_id = register_user(api_client)
+    period_id, player_ids = _seed(api_app, user_id)
+
+    with api_app.app_context():
+        db.session.add(MonthlyPlayer(
+            player_id=player_ids[0], monthly_period_id=period_id, user_id=user_id,
+            player_name="Jogador 0", position="forward", phone="1", email="",
+            monthly_fee=100.0, join_date=date(2024, 1, 1), status="pending",
+        ))
+        db.session.commit()
+        # Após o commit os atributos estão expirados: o valor anterior ainda precisa entrar no delta
+        mp = MonthlyPlayer.query.filter_by(player_id=player_ids[0]).one()
+        db.session.expire(mp)
+        mp.status = "paid"
+        mp.monthly_fee = 120.0
+        db.session.commit()
+        assert _totals(period_id) == (120.0, 120.0, 1)
+
+
+def test_totals_update_period_loaded_in_session(api_app, api_client):
+    _, user_id = register_user(api_client)
+    period_id, player_ids = _seed(api_app, user_id)
+
+    with api_app.app_context():
+        db.session.add(MonthlyPlayer(
+            player_id=player_ids[0], monthly_period_id=period_id, user_id=user_id,
+            player_name="Jogador 0", position="forward", phone="1", email="",
+            monthly_fee=100.0, join_date=date(2024, 1, 1), status="pending",
+        ))
+        db.session.commit()
+        # Período já carregado (sem alterações): o delta é aplicado ao próprio objeto
+        period = db.session.get(MonthlyPeriod, period_id)
+        assert float(period.total_received) == 0.0
+        MonthlyPlayer.query.filter_by(player_id=player_ids[0]).one().status = "paid"
+        db.session.flush()
+        assert float(period.total_received) == 100.0
+        db.session.commit()
+        assert (float(period.total_expected), float(period.total_received), period.players_count) == \
+            (100.0, 100.0, 1)
+
+
+def test_reconcile_detects_and_repairs_drift(api_app, api_client):
+    _, user_id = register_user(api_client)
+    period_id, _ = _seed(api_app, user_id)
+
+    with api_app.app_context():
+        # Deriva simulada: escrita direta que não passa pelo hook
+        db.session.execute(
+            MonthlyPeriod.__table__.update()
+            .where(MonthlyPeriod.__table__.c.id == period_id)
+            .values(total_expected=999, players_count=7)
+        )
+        db.session.commit()
+
+    runner = api_app.test_cli_runner()
+    result = runner.invoke(periods_cli, ["reconcile", "--user-id", user_id])
+    assert result.exit_code == 1
+    assert "total_expected" in result.output and "players_count" in result.output
+
+    result = runner.invoke(periods_cli, ["reconcile", "--repair"])
+    assert result.exit_code == 0
+    assert "2 divergência(s) corrigida(s)" in result.output
+
+    result = runner.invoke(periods_cli, ["reconcile"])
+    assert result.exit_code == 0
+    with api_app.app_context():
+        assert _totals(period_id) == (0.0, 0.0, 0)
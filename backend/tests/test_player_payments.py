@@ -0,0 +1,70 @@
+from backend.services.db.models import MonthlyPlayer
+from backend.tests.fixtures.api import register_user
+
+
+def _create_players(api_client, headers, names):
+    players = [{"name": name, "position": "goalkeeper", "phone": f"1196666{i:04d}", "monthly_fee": 90}
+               for i, name in enumerate(names)]
+    return [r["id"] for r in api_client.post("/api/players/bulk", json={"players": players},
+                                             headers=headers).get_json()["data"]["results"]]
+
+
+def _open_month(api_client, headers, year, month, player_ids):
+    period_id = api_client.post("/api/monthly-payments", json={"year": year, "month": month},
+                                headers=headers).get_json()["period_id"]
+    api_client.post(f"/api/monthly-periods/{period_id}/players", json={"player_ids": player_ids}, headers=headers)
+    return period_id
+
+
+def test_player_history_merges_monthly_and_casual_by_cursor(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    carla, _ = _create_players(api_client, headers, ["Carla", "Davi"])
+    jan = _open_month(api_client, headers, 2025, 1, [carla])
+    feb = _open_month(api_client, headers, 2025, 2, [])
+    mar = _open_month(api_client, headers, 2025, 3, [carla])
+    api_client.patch(f"/api/monthly-periods/{jan}/players/{carla}/payment", json={"status": "paid"}, headers=headers)
+    monthly_player_id = MonthlyPlayer.query.filter_by(monthly_period_id=mar, player_id=carla).one().id
+    api_client.put(f"/api/monthly-players/{monthly_player_id}/custom-fee", json={"custom_monthly_fee": 45},
+                   headers=headers)
+    # Jogo avulso em fevereiro com o mesmo nome do cadastro; o outro avulso não entra
+    for name in ("Carla", "Eva"):
+        r = api_client.post(f"/api/monthly-periods/{feb}/casual-players",
+                            json={"player_name": name, "play_date": "2025-02-08", "invited_by": "Davi", "amount": 25},
+                            headers=headers)
+        assert r.status_code in (200, 201)
+
+    url = f"/api/players/{carla}/payments"
+    r = api_client.get(f"{url}?per_page=2", headers=headers)
+    assert r.status_code == 200
+    body = r.get_json()
+    assert [(e["kind"], e["period_name"], e["amount"], e["status"]) for e in body["data"]] == [
+        ("monthly", "03/2025", 45.0, "pending"), ("casual", "02/2025", 25.0, "pending")]
+    assert body["data"][0]["pending_months_count"] == 1
+    assert body["data"][1]["play_date"] == "2025-02-08" and body["data"][1]["invited_by"] == "Davi"
+    assert [e["matched_by"] for e in body["data"]] == ["player_id", "name"]
+    assert body["pagination"]["has_next"] is True
+
+    r = api_client.get(f"{url}?per_page=2&cursor={body['pagination']['next_cursor']}", headers=headers)
+    body = r.get_json()
+    assert [(e["kind"], e["period_name"], e["status"]) for e in body["data"]] == [("monthly", "01/2025", "paid")]
+    assert body["data"][0]["payment_date"] is not None
+    assert body["pagination"]["has_next"] is False
+
+    assert api_client.get("/api/players/nao-existe/payments", headers=headers).status_code == 404
+    assert api_client.get(f"{url}?cursor=invalido", headers=headers).status_code == 400
+
+
+def test_player_history_uses_constant_queries(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    veteran, rookie = _create_players(api_client, headers, ["Veterano", "Novato"])
+    for month in range(1, 13):
+        _open_month(api_client, headers, 2025, month, [veteran, rookie] if month == 12 else [veteran])
+
+    counts = []
+    for player_id, size in ((rookie, 1), (veteran, 12)):
+        r = api_client.get(f"/api/players/{player_id}/payments?per_page=50", headers=headers)
+        assert len(r.get_json()["data"]) == size
+        counts.append(r.headers["X-DB-Queries"])
+    assert counts[0] == counts[1]
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import text
+
+from backend.services import player_search
+from backend.services.db.connection import db
+from backend.services.db.models import Player
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_app, user_id):
+    with api_app.app_context():
+        db.session.add_all([
+            Player(user_id=user_id, name="João Conceição", position="forward",
+                   phone="(11) 98765-4321", email="joao@example.com"),
+            Player(user_id=user_id, name="Joana Araújo", position="defender",
+                   phone="11 91234-0000", email="jo.araujo@clube.com.br"),
+            Player(user_id=user_id, name="Sebastião Jó", position="midfielder",
+                   phone="21 99999-1111"),
+        ])
+        db.session.commit()
+
+
+def _names(api_client, headers, term):
+    r = api_client.get("/api/players", query_string={"search": term, "per_page": 50}, headers=headers)
+    assert r.status_code == 200
+    return [p["name"] for p in r.get_json()["data"]]
+
+
+def test_search_text_is_normalized(api_app, api_client):
+    _, user_id = register_user(api_client)
+    _seed(api_app, user_id)
+    with api_app.app_context():
+        player = Player.query.filter_by(name="João Conceição").one()
+        assert player.search_text == "joao conceicao 11987654321 joao@example.com"
+
+        player.name = "João C. Conceição"
+        db.session.commit()
+        assert player.search_text.startswith("joao c. conceicao ")
+
+
+@pytest.mark.parametrize("with_fts", [False, True])
+def test_player_search_backends(api_app, api_client, with_fts):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_app, user_id)
+
+    if with_fts:
+        with api_app.app_context():
+            player_search.create_sqlite_fts(db.session.connection())
+            db.session.commit()
+            assert player_search.sqlite_fts_available()
+
+    # Sem acentos no termo, com acento no nome (e vice-versa)
+    assert _names(api_client, headers, "conceicao") == ["João Conceição"]
+    assert _names(api_client, headers, "ARAÚJO") == ["Joana Araújo"]
+    # Telefone com ou sem máscara; e-mail
+    assert _names(api_client, headers, "98765-4321") == ["João Conceição"]
+    assert _names(api_client, headers, "clube.com") == ["Joana Araújo"]
+    # Vários resultados; termo curto cai no LIKE mesmo com FTS
+    assert set(_names(api_client, headers, "jo")) == {"João Conceição", "Joana Araújo", "Sebastião Jó"}
+    assert _names(api_client, headers, "xyz") == []
+
+    if with_fts:
+        # Jogadores criados depois do índice entram via trigger
+        r = api_client.post("/api/players", json={"name": "Zé Grandão", "phone": "31 90000-0000"}, headers=headers)
+        assert r.status_code == 201
+        assert _names(api_client, headers, "grandao") == ["Zé Grandão"]
+
+
+def test_fts_index_is_keyed_on_player_id(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_app, user_id)
+    with api_app.app_context():
+        player_search.create_sqlite_fts(db.session.connection())
+        # Rowids renumerados (como numa cópia de batch_alter_table) não desalinham o índice
+        db.session.execute(text("UPDATE players SET rowid = rowid + 1000"))
+        db.session.commit()
+    assert _names(api_client, headers, "conceicao") == ["João Conceição"]
+
+    with api_app.app_context():
+        player = Player.query.filter_by(name="Joana Araújo").one()
+        player.name = "Joana Ribeiro"
+        db.session.delete(Player.query.filter_by(name="João Conceição").one())
+        db.session.commit()
+    assert _names(api_client, headers, "ribeiro") == ["Joana Ribeiro"]
+    assert _names(api_client, headers, "conceicao") == []
+    assert _names(api_client, headers, "98765") == []
+
+    # Recriar (ex.: depois de um batch_alter_table) reindexa a partir de players
+    with api_app.app_context():
+        player_search.create_sqlite_fts(db.session.connection())
+        db.session.commit()
+        assert db.session.execute(text("SELECT count(*) FROM players_fts")).scalar() == 2
+    assert _names(api_client, headers, "ribeiro") == ["Joana Ribeiro"]
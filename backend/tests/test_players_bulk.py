@@ -0,0 +1,121 @@
+from datetime import datetime
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player
+from backend.tests.fixtures.api import count_queries, register_user
+
+
+def _row(i, **overrides):
+    row = {
+        "name": f"Jogador {i}",
+        "position": "forward",
+        "email": "",
+        "phone": f"1198888{i:04d}",
+        "monthly_fee": 50,
+        "status": "active",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_bulk_create_players_single_insert(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    rows = [_row(i) for i in range(300)]
+
+    with count_queries() as statements:
+        r = api_client.post("/api/players/bulk", json={"players": rows}, headers=headers)
+    assert r.status_code == 201
+    data = r.get_json()["data"]
+    assert data["created"] == 300
+    assert [item["index"] for item in data["results"]] == list(range(300))
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO PLAYERS")]
+    assert len(inserts) == 1
+
+    with api_app.app_context():
+        assert Player.query.filter_by(user_id=user_id).count() == 300
+        assert Player.query.filter_by(user_id=user_id, email=None).count() == 300
+
+
+def test_bulk_create_players_reports_per_row(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = api_client.post("/api/players/bulk", json=[_row(0)], headers=headers)
+    assert r.status_code == 201
+
+    rows = [
+        _row(0),                                  # já cadastrado
+        _row(1, email="Novo@Example.com"),        # válido
+        _row(1, name="Outro"),                    # telefone repetido no lote
+        _row(2, position="striker"),              # posição inválida
+        _row(3, phone=""),                        # sem telefone
+        _row(4, status="suspended"),              # status fora do modelo
+    ]
+    r = api_client.post("/api/players/bulk", json={"players": rows}, headers=headers)
+    assert r.status_code == 201
+    data = r.get_json()["data"]
+    statuses = [item["status"] for item in data["results"]]
+    assert statuses == ["duplicate", "created", "duplicate", "error", "error", "error"]
+    assert "position" in data["results"][3]["errors"]
+    assert "phone" in data["results"][4]["errors"]
+    assert "status" in data["results"][5]["errors"]
+    assert (data["created"], data["duplicates"], data["errors"]) == (1, 2, 3)
+
+    with api_app.app_context():
+        created = Player.query.filter_by(user_id=user_id, phone=_row(1)["phone"]).one()
+        assert created.email == "novo@example.com"
+        assert created.name == "Jogador 1"
+
+    r = api_client.post("/api/players/bulk", json={"players": []}, headers=headers)
+    assert r.status_code == 400
+
+
+def test_bulk_create_players_invalidates_cached_reads(api_app, api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    r = api_client.get("/api/stats/players", headers=headers)
+    assert r.status_code == 200
+    assert r.get_json()["total"] == 0
+
+    r = api_client.post("/api/players/bulk", json=[_row(0), _row(1)], headers=headers)
+    assert r.status_code == 201
+
+    r = api_client.get("/api/stats/players", headers=headers)
+    assert r.headers.get("X-Cache") == "MISS"
+    assert r.get_json()["total"] == 2
+
+
+def test_bulk_create_players_concurrent_phone_is_duplicate(api_app, api_client, monkeypatch):
+    from backend.blueprints.api import controllers
+
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    build_search_text = controllers.build_search_text
+    raced = []
+
+    def _race(name, phone, email):
+        # Outra importação grava o mesmo telefone depois da verificação
+        if not raced:
+            raced.append(phone)
+            with db.engine.begin() as conn:
+                conn.execute(Player.__table__.insert(), [{
+                    "id": "concorrente", "user_id": user_id, "name": "Concorrente", "position": "forward",
+                    "phone": phone, "join_date": datetime.utcnow().date(), "status": "active",
+                    "monthly_fee": 50, "is_active": True, "created_at": datetime.utcnow(),
+                    "updated_at": datetime.utcnow(),
+                }])
+        return build_search_text(name, phone, email)
+
+    monkeypatch.setattr(controllers, "build_search_text", _race)
+    r = api_client.post("/api/players/bulk", json={"players": [_row(0), _row(1)]}, headers=headers)
+    assert r.status_code == 201
+    data = r.get_json()["data"]
+    assert [item["status"] for item in data["results"]] == ["duplicate", "created"]
+    assert (data["created"], data["duplicates"]) == (1, 1)
+    assert "id" not in data["results"][0]
+
+    with api_app.app_context():
+        assert Player.query.filter_by(user_id=user_id).count() == 2
@@ -0,0 +1,62 @@
+from backend.services import read_models
+from backend.services.db.connection import db
+from backend.tests.fixtures.api import register_user
+
+
+def _seed(api_client, headers):
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 6},
+                                headers=headers).get_json()["period_id"]
+    r = api_client.post("/api/players", json={"name": "Ana", "position": "meio", "phone": "11999990000",
+                                              "monthly_fee": 100}, headers=headers)
+    assert r.status_code in (200, 201)
+    r = api_client.post(f"/api/monthly-periods/{period_id}/expenses",
+                        json={"description": "Campo", "amount": 350.5, "category": "equipment",
+                              "expense_date": "2025-06-05"}, headers=headers)
+    assert r.status_code in (200, 201)
+    expense = r.get_json()["data"]
+    r = api_client.post(f"/api/monthly-periods/{period_id}/casual-players",
+                        json={"player_name": "Beto", "play_date": "2025-06-07", "invited_by": "Ana", "amount": 20},
+                        headers=headers)
+    assert r.status_code in (200, 201)
+    return period_id, expense, r.get_json()["data"]
+
+
+def test_list_endpoints_match_write_responses(api_client):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id, expense, casual = _seed(api_client, headers)
+
+    # Listagem e criação usam o mesmo serializador
+    expenses = api_client.get(f"/api/monthly-periods/{period_id}/expenses", headers=headers).get_json()["data"]
+    assert expenses == [expense]
+    assert expense["amount"] == 350.5 and expense["expense_date"] == "2025-06-05"
+
+    casuals = api_client.get(f"/api/monthly-periods/{period_id}/casual-players", headers=headers).get_json()
+    assert casuals == [casual]
+    assert casual["amount"] == 20.0 and casual["play_date"] == "2025-06-07"
+
+    periods = api_client.get("/api/monthly-periods", headers=headers).get_json()
+    assert [p["id"] for p in periods] == [period_id]
+    assert api_client.get(f"/api/monthly-periods/{period_id}", headers=headers).get_json() == periods[0]
+
+    available = api_client.get(f"/api/monthly-periods/{period_id}/available-players",
+                               headers=headers).get_json()["data"]
+    assert [p["name"] for p in available] == ["Ana"]
+    assert available[0]["monthly_fee"] == 100.0 and available[0]["email"] == ""
+
+
+def test_read_models_do_not_hydrate_entities(api_app, api_client):
+    token, user_id = register_user(api_client)
+    period_id, _, _ = _seed(api_client, {"Authorization": f"Bearer {token}"})
+
+    db.session.expunge_all()
+    periods = read_models.list_periods(user_id)
+    expenses = read_models.list_expenses(user_id, period_id)
+    casuals = read_models.list_casual_players(user_id, period_id)
+    available = read_models.list_available_players(user_id, period_id)
+
+    assert [p.id for p in periods] == [period_id]
+    assert isinstance(expenses[0], read_models.ExpenseRow)
+    assert len(casuals) == 1 and len(available) == 1
+    assert len(db.session.identity_map) == 0
+    assert not read_models.period_exists("outro-usuario", period_id)
@@ -0,0 +1,57 @@
+from backend.services.cache import LRUCache, SQLiteCache
+from backend.tests.fixtures.api import register_user
+
+
+def test_lru_cache_evicts_by_size_and_ttl():
+    cache = LRUCache(max_entries=2, default_timeout=60)
+    cache.set("a", 1, tenant="u1")
+    cache.set("b", 2, tenant="u1")
+    assert cache.get("a") == 1  # "a" passa a ser o mais recente
+    cache.set("c", 3, tenant="u2")
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.delete_tenant("u2")
+    assert cache.get("c") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, tenant="u2", timeout=0)
+    assert cache.get("d") is None
+    assert cache.get("a") == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = SQLiteCache(path, max_entries=10, default_timeout=60)
+    reader = SQLiteCache(path, max_entries=10, default_timeout=60)
+
+    writer.set("k1", {"body": "[]"}, tenant="u1")
+    writer.set("k2", {"body": "{}"}, tenant="u2")
+    assert reader.get("k1") == {"body": "[]"}
+
+    reader.delete_tenant("u1")
+    assert writer.get("k1") is None
+    assert writer.get("k2") == {"body": "{}"}
+
+    writer.set("k3", {"body": "x"}, tenant="u2", timeout=-1)
+    assert reader.get("k3") is None
+
+
+def test_cached_endpoint_hits_and_invalidates_on_write(api_client):
+    headers = {"Authorization": f"Bearer {register_user(api_client)[0]}"}
+
+    r = api_client.get("/api/stats/players", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["X-Cache"] == "MISS"
+    assert r.get_json()["total"] == 0
+
+    r = api_client.get("/api/stats/players", headers=headers)
+    assert r.headers["X-Cache"] == "HIT"
+    assert r.get_json()["total"] == 0
+
+    r = api_client.post("/api/players", json={"name": "Novo", "phone": "11911112222"}, headers=headers)
+    assert r.status_code == 201
+
+    r = api_client.get("/api/stats/players", headers=headers)
+    assert r.headers["X-Cache"] == "MISS"
+    assert r.get_json()["total"] == 1
@@ -0,0 +1,48 @@
+import re
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player
+from backend.services.server_timing import format_header
+from backend.tests.fixtures.api import register_user
+
+
+def _parse(header):
+    metrics = {}
+    for item in header.split(", "):
+        name, dur = re.match(r'(\w+);dur=([\d.]+)', item).groups()
+        metrics[name] = float(dur)
+    return metrics
+
+
+def test_format_header():
+    assert format_header({"total": 5.0, "custom": 1.0, "dump": 2.25, "db": 1.0}, db_queries=3) == (
+        'db;dur=1.0;desc="3 queries", dump;dur=2.2, custom;dur=1.0, total;dur=5.0'
+    )
+
+
+def test_server_timing_phases(api_app, api_client, monkeypatch):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+    with api_app.app_context():
+        db.session.add_all([
+            Player(user_id=user_id, name=f"Jogador {i}", position="forward", phone=f"1198888{i:04d}",
+                   email=f"jogador{i}@example.com")
+            for i in range(40)
+        ])
+        db.session.commit()
+
+    logged = []
+    monkeypatch.setattr(api_app.logger, "info", lambda msg, *args, **kwargs: logged.append((msg, kwargs)))
+    r = api_client.get("/api/players?per_page=40", headers=headers)
+    assert r.status_code == 200
+    assert r.headers.get("Content-Encoding") == "gzip"
+
+    metrics = _parse(r.headers["Server-Timing"])
+    assert {"db", "dump", "serialize", "json", "compress", "total"} <= set(metrics)
+    assert f'desc="{r.headers["X-DB-Queries"]} queries"' in r.headers["Server-Timing"]
+    assert metrics["total"] >= metrics["dump"]
+
+    # Log estruturado com as mesmas fases, indexado pelo trace id
+    msg, kwargs = next((m, k) for m, k in logged if m.startswith("[Perf][Request]"))
+    assert kwargs["extra"]["trace_id"] == r.headers["X-Trace-Id"]
+    assert set(kwargs["extra"]["timings"]) == set(metrics)
@@ -0,0 +1,84 @@
+from backend import create_app
+from backend.config import get_config
+from backend.services.db.connection import db
+from backend.services.db.models import Player
+from backend.services.sql_profiler import get_profiler, normalize_statement
+from backend.tests.fixtures.api import register_user
+
+
+def test_normalize_statement():
+    assert normalize_statement(
+        "SELECT *  FROM players\n WHERE id IN (?, ?, ?) AND name = 'O''Neil' LIMIT 10"
+    ) == "SELECT * FROM players WHERE id IN (?) AND name = ? LIMIT ?"
+    assert normalize_statement(
+        "SELECT * FROM players_1 WHERE user_id = %(user_id_1)s"
+    ) == "SELECT * FROM players_1 WHERE user_id = ?"
+
+
+def test_request_db_headers_and_slow_log(api_app, api_client, monkeypatch):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    with api_app.app_context():
+        db.session.add_all([
+            Player(user_id=user_id, name=f"Jogador {i}", position="forward", phone=f"1197777{i:04d}")
+            for i in range(3)
+        ])
+        db.session.commit()
+
+    r = api_client.get("/api/players", headers=headers)
+    assert r.status_code == 200
+    assert int(r.headers["X-DB-Queries"]) >= 1
+    assert float(r.headers["X-DB-Time-ms"]) >= 0
+    trace_id = r.headers["X-Trace-Id"]
+
+    # Todo statement acima de 0ms é "lento": o log carrega o trace id da requisição
+    logged = []
+    monkeypatch.setattr(api_app.logger, "warning", lambda msg, *args: logged.append(msg % args))
+    with api_app.app_context():
+        monkeypatch.setattr(get_profiler(), "slow_query_ms", 0)
+    r = api_client.get("/api/players", headers=headers)
+    assert len(logged) == int(r.headers["X-DB-Queries"])
+    assert all("[Perf][SlowQuery]" in line and r.headers["X-Trace-Id"] in line for line in logged)
+    assert r.headers["X-Trace-Id"] != trace_id
+
+
+def test_admin_slow_queries(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    api_client.get("/api/players", headers=headers)
+
+    # Estatísticas do processo: só operadores leem ou zeram
+    assert api_client.get("/api/admin/sql/slow-queries", headers=headers).status_code == 403
+    assert api_client.delete("/api/admin/sql/slow-queries", headers=headers).status_code == 403
+    with api_app.app_context():
+        assert get_profiler().slowest() != []
+    api_app.config["OPERATOR_USER_IDS"] = [user_id]
+
+    r = api_client.get("/api/admin/sql/slow-queries?limit=3", headers=headers)
+    assert r.status_code == 200
+    queries = r.get_json()["queries"]
+    assert 0 < len(queries) <= 3
+    assert queries == sorted(queries, key=lambda q: q["max_ms"], reverse=True)
+    assert all("'" not in q["statement"] and q["count"] >= 1 for q in queries)
+
+    assert api_client.delete("/api/admin/sql/slow-queries", headers=headers).status_code == 200
+    with api_app.app_context():
+        assert get_profiler().slowest() == []
+
+
+def test_profiler_disabled(monkeypatch):
+    monkeypatch.setattr(get_config("testing"), "SQL_PROFILER_ENABLED", False)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        assert get_profiler() is None
+        client = app.test_client()
+        token, user_id = register_user(client)
+        app.config["OPERATOR_USER_IDS"] = [user_id]
+        r = client.get("/api/players", headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code == 200
+        assert "X-DB-Queries" not in r.headers
+        assert "X-Request-Duration-ms" in r.headers
+        r = client.get("/api/admin/sql/slow-queries", headers={"Authorization": f"Bearer {token}"})
+        assert r.status_code == 404
+        db.drop_all()
@@ -0,0 +1,77 @@
+from datetime import date
+
+from backend.services.db.connection import db
+from backend.services.db.models import Player, MonthlyPeriod, MonthlyPlayer
+from backend.tests.fixtures.api import count_queries, register_user
+
+
+def _seed(api_app, user_id):
+    with api_app.app_context():
+        spec = [("forward", "active"), ("forward", "active"), ("forward", "pending"),
+                ("defender", "inactive"), ("goalkeeper", "delayed")]
+        players = [
+            Player(user_id=user_id, name=f"Jogador {i}", position=pos, status=status,
+                   phone=f"1196666{i:04d}", monthly_fee=100.0)
+            for i, (pos, status) in enumerate(spec)
+        ]
+        periods = [MonthlyPeriod(user_id=user_id, month=m, year=2024, name=f"{m:02d}/2024") for m in (5, 6, 7)]
+        db.session.add_all(players + periods)
+        db.session.flush()
+        june = periods[1]
+        for player, status in zip(players[:3], ("paid", "pending", "paid")):
+            db.session.add(MonthlyPlayer(
+                player_id=player.id, monthly_period_id=june.id, user_id=user_id,
+                player_name=player.name, position=player.position, phone=player.phone, email="",
+                monthly_fee=100.0, join_date=date(2024, 6, 1),
+                status=status,
+            ))
+        db.session.commit()
+
+
+def test_player_stats_single_query(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_app, user_id)
+
+    with api_app.app_context(), count_queries() as statements:
+        r = api_client.get("/api/stats/players", headers=headers)
+    assert r.status_code == 200
+    assert len([s for s in statements if "FROM players" in s]) == 1
+    stats = r.get_json()
+    assert {k: stats[k] for k in ("total", "active", "inactive", "pending", "delayed")} == {
+        "total": 5, "active": 2, "inactive": 1, "pending": 1, "delayed": 1
+    }
+    assert stats["by_position"] == {"forward": 3, "defender": 1, "goalkeeper": 1}
+
+    r = api_client.get("/api/stats/players?position=forward", headers=headers)
+    assert r.get_json()["total"] == 3
+    assert r.get_json()["by_position"] == {"forward": 3}
+
+
+def test_payment_stats_single_query(api_app, api_client):
+    token, user_id = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    _seed(api_app, user_id)
+
+    with api_app.app_context(), count_queries() as statements:
+        r = api_client.get("/api/stats/payments/2024/6", headers=headers)
+    assert r.status_code == 200
+    assert len([s for s in statements if "monthly_p" in s]) == 1
+    stats = r.get_json()
+    assert (stats["total_players"], stats["paid"], stats["pending"], stats["partial"]) == (3, 2, 1, 0)
+    assert float(stats["total_expected"]) == 300.0
+    assert float(stats["total_received"]) == 200.0
+    assert round(float(stats["collection_rate"]), 2) == 66.67
+
+    assert api_client.get("/api/stats/payments/2023/6", headers=headers).status_code == 404
+
+    # Intervalo: um item por período, inclusive os vazios, em uma consulta
+    with api_app.app_context(), count_queries() as statements:
+        r = api_client.get("/api/stats/payments?from_year=2024&from_month=6&to_year=2024", headers=headers)
+    assert r.status_code == 200
+    assert len([s for s in statements if "monthly_p" in s]) == 1
+    data = r.get_json()["data"]
+    assert [(d["month"], d["total_players"], d["paid"]) for d in data] == [(6, 3, 2), (7, 0, 0)]
+
+    r = api_client.get("/api/stats/payments?from_year=2024&from_month=13&to_year=2024", headers=headers)
+    assert r.status_code == 400
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+
+import pytest
+
+from backend.services import structured_logging
+from backend.services.structured_logging import debug_sampled, init_logging
+from backend.tests.fixtures.api import register_user
+
+
+@pytest.fixture(autouse=True)
+def _stop_logging():
+    # Listener iniciado por init_logging não sobrevive ao teste
+    yield
+    structured_logging.stop_logging()
+
+
+def _configure(api_app, tmp_path, **config):
+    log_file = tmp_path / "app.log"
+    api_app.config.update(LOG_FORMAT="json", LOG_FILE=str(log_file), **config)
+    init_logging(api_app)
+    return log_file
+
+
+def _records(log_file):
+    # Para o listener: a fila é esvaziada antes de ler o arquivo
+    structured_logging.stop_logging()
+    return [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+
+
+def test_period_players_diagnostic_is_structured_and_traced(api_app, api_client, tmp_path):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}", "X-Trace-Id": "trace-abc-123"}
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 3},
+                                headers=headers).get_json()["period_id"]
+
+    log_file = _configure(api_app, tmp_path, LOG_LEVEL="DEBUG", LOG_DEBUG_SAMPLE_RATE=1.0)
+    r = api_client.get(f"/api/monthly-periods/{period_id}/players", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["X-Trace-Id"] == "trace-abc-123"
+
+    events = [rec for rec in _records(log_file) if rec.get("event") == "period_players.loaded"]
+    assert len(events) == 1
+    event = events[0]
+    assert event["level"] == "DEBUG"
+    assert event["trace_id"] == "trace-abc-123"
+    assert event["period_id"] == period_id
+    assert event["players"] == 0
+    assert event["user_periods"] == {}
+
+
+def test_diagnostics_are_gated_by_level_and_sampling(api_app, api_client, tmp_path):
+    token, _ = register_user(api_client)
+    headers = {"Authorization": f"Bearer {token}"}
+    period_id = api_client.post("/api/monthly-payments", json={"year": 2025, "month": 4},
+                                headers=headers).get_json()["period_id"]
+
+    log_file = _configure(api_app, tmp_path, LOG_LEVEL="INFO")
+    api_client.get(f"/api/monthly-periods/{period_id}/players", headers=headers)
+    records = _records(log_file)
+    assert records, "o log [Perf][Request] deveria ter sido gravado"
+    assert not any(rec.get("event", "").startswith("period_players") for rec in records)
+    # Trace id gerado pela aplicação quando não vem no header
+    assert all(len(rec["trace_id"]) == 32 for rec in records if "Request" in rec["message"])
+
+    logger = logging.getLogger("backend.tests")
+    api_app.logger.setLevel(logging.DEBUG)
+    with api_app.app_context():
+        assert debug_sampled(logger, rate=1.0)
+        assert not debug_sampled(logger, rate=0.0)
+    api_app.logger.setLevel(logging.INFO)
+    assert not debug_sampled(logger, rate=1.0)
+
+
+def test_exception_traceback_is_logged(api_app, tmp_path):
+    log_file = _configure(api_app, tmp_path)
+    try:
+        raise RuntimeError("falhou")
+    except RuntimeError:
+        logging.getLogger("backend.tests").exception("Erro %s", "x")
+
+    record = next(rec for rec in _records(log_file) if rec["message"] == "Erro x")
+    assert record["level"] == "ERROR"
+    assert record["trace_id"] is None
+    assert "RuntimeError: falhou" in record["exc"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requer fork")
+def test_forked_child_gets_its_own_listener(api_app, tmp_path):
+    log_file = _configure(api_app, tmp_path)
+    pid = os.fork()
+    if pid == 0:
+        # Processo filho (worker do gunicorn com --preload-api_app)
+        code = 1
+        try:
+            if structured_logging._listener._thread.is_alive():
+                api_app.logger.warning("FROM_CHILD")
+                structured_logging.stop_logging()
+                code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+    api_app.logger.warning("FROM_PARENT")
+    messages = [rec["message"] for rec in _records(log_file)]
+    assert messages.count("FROM_CHILD") == 1
+    assert messages.count("FROM_PARENT") == 1
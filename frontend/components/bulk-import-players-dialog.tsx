@@ -113,23 +113,30 @@ export function BulkImportPlayersDialog({ onImported, defaultMonthlyFee = 150 }:
     const successes: string[] = []
     const failures: Array<{ name: string; reason: string }> = []
 
-    for (const item of parsed) {
-      const payload: CreatePlayerRequest = {
-        name: item.name,
-        position: "forward",
-        email: "", // opcional: vazio passa na validação
-        phone: item.phone,
-        monthly_fee: defaultMonthlyFee,
-        status: "active",
-      }
+    const payload: CreatePlayerRequest[] = parsed.map((item) => ({
+      name: item.name,
+      position: "forward",
+      email: "", // opcional: vazio passa na validação
+      phone: item.phone,
+      monthly_fee: defaultMonthlyFee,
+      status: "active",
+    }))
 
-      try {
-        await playersService.createPlayer(payload)
-        successes.push(item.name)
-      } catch (err: any) {
-        const reason = err?.message || "Erro desconhecido"
-        failures.push({ name: item.name, reason })
+    try {
+      // Uma única requisição para todo o lote
+      const response = await playersService.bulkCreatePlayers(payload)
+      for (const result of response.data.results) {
+        const name = parsed[result.index]?.name ?? `linha ${result.index + 1}`
+        if (result.status === "created") {
+          successes.push(name)
+        } else {
+          const reason = Object.values(result.errors ?? {}).flat().join("; ") || "Erro desconhecido"
+          failures.push({ name, reason })
+        }
       }
+    } catch (err: any) {
+      const reason = err?.message || "Erro desconhecido"
+      parsed.forEach((item) => failures.push({ name: item.name, reason }))
     }
 
     setLoading(false)
@@ -11,6 +11,10 @@ import {
   CasualPlayer,
   CreateMonthlyPeriodRequest,
   UpdateMonthlyPeriodRequest,
+  ReadjustMonthlyFeeRequest,
+  ReadjustMonthlyFeeResponse,
+  BulkPaymentStatusItem,
+  BulkPaymentStatusResponse,
   CreateCasualPlayerRequest,
   UpdateCustomMonthlyFeeRequest,
   MonthlyPaymentsFilters,
@@ -189,6 +193,33 @@ export class PaymentsService {
     }
   }
 
+  /**
+   * Reajusta a mensalidade padrão de vários períodos em uma única chamada
+   */
+  async readjustMonthlyFee(request: ReadjustMonthlyFeeRequest): Promise<StandardApiResponse<ReadjustMonthlyFeeResponse>> {
+    if (!(toNum(request.monthly_fee) > 0)) {
+      throw new ApiException('Mensalidade deve ser maior que zero', 400);
+    }
+
+    try {
+      const response = await api.put<StandardApiResponse<ReadjustMonthlyFeeResponse>>(
+        `${this.baseEndpoint}/monthly-fee`,
+        request
+      );
+
+      this.validateStandardResponse(response);
+      const periods: MonthlyPeriod[] = response.data.periods.map((period) => ({
+        ...period,
+        total_expected: toNum(period.total_expected),
+        total_received: toNum(period.total_received),
+        players_count: toNum(period.players_count),
+      }));
+      return { ...response, data: { ...response.data, periods } };
+    } catch (error) {
+      throw this.handleServiceError('Erro ao reajustar mensalidade dos períodos', error);
+    }
+  }
+
   /**
    * Remove um período mensal
    */
@@ -436,6 +467,43 @@ export class PaymentsService {
     }
   }
 
+  /**
+   * Atualiza o status de pagamento de vários jogadores do período de uma vez
+   */
+  async bulkUpdateMonthlyPlayerPayments(periodId: string, payments: BulkPaymentStatusItem[]): Promise<StandardApiResponse<BulkPaymentStatusResponse>> {
+    if (!periodId?.trim()) {
+      throw new ApiException('ID do período é obrigatório', 400);
+    }
+    if (!payments.length) {
+      throw new ApiException('Nenhum pagamento informado', 400);
+    }
+
+    try {
+      const response = await api.patch<StandardApiResponse<BulkPaymentStatusResponse>>(
+        `${this.baseEndpoint}/${periodId}/players/payments`,
+        { payments }
+      );
+
+      this.validateStandardResponse(response);
+      const players: MonthlyPlayer[] = response.data.players.map((player) => ({
+        ...player,
+        monthly_fee: toNum(player.monthly_fee),
+        custom_monthly_fee: player.custom_monthly_fee !== undefined ? toNum(player.custom_monthly_fee) : undefined,
+        effective_monthly_fee: toNum(player.effective_monthly_fee),
+        amount_paid: toNum(player.amount_paid),
+        pending_months_count: toNum(player.pending_months_count),
+      }));
+      const period = {
+        ...response.data.period,
+        total_expected: toNum(response.data.period.total_expected),
+        total_received: toNum(response.data.period.total_received),
+      };
+      return { ...response, data: { period, players } };
+    } catch (error) {
+      throw this.handleServiceError(`Erro ao atualizar pagamentos do período ${periodId}`, error);
+    }
+  }
+
   /**
    * Atualiza a mensalidade customizada de um jogador
    */
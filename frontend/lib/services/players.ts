@@ -8,6 +8,7 @@ import { toNum } from '../monthly-utils';
 import {
   Player,
   CreatePlayerRequest,
+  BulkCreatePlayersResponse,
   UpdatePlayerRequest,
   PlayersFilters,
   PlayerStats
@@ -87,6 +88,28 @@ export class PlayersService {
     }
   }
 
+  /**
+   * Importa vários jogadores em uma única requisição
+   * O resultado de cada linha vem em `results`, na ordem de envio
+   */
+  async bulkCreatePlayers(players: CreatePlayerRequest[]): Promise<StandardApiResponse<BulkCreatePlayersResponse>> {
+    if (!players.length) {
+      throw new ApiException('Nenhum jogador para importar', 400);
+    }
+
+    try {
+      const response = await api.post<StandardApiResponse<BulkCreatePlayersResponse>>(
+        `${this.baseEndpoint}/bulk`,
+        { players }
+      );
+
+      this.validateStandardResponse(response);
+      return response;
+    } catch (error) {
+      throw this.handleServiceError('Erro ao importar jogadores', error);
+    }
+  }
+
   /**
    * Atualiza um jogador existente
    */
@@ -30,8 +30,7 @@ export class StatsService {
         inactive_players: Number(apiStats.inactive ?? 0),
         pending_players: Number((apiStats as any).pending ?? 0),
         delayed_players: Number((apiStats as any).delayed ?? 0),
-        // players_by_position não é retornado por este endpoint atualmente
-        players_by_position: undefined,
+        players_by_position: apiStats.by_position,
       };
       // Se a resposta estiver no formato StandardApiResponse
       if ((response as any)?.success) {
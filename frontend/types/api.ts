@@ -100,6 +100,20 @@ export interface CreatePlayerRequest {
   status?: PlayerStatus;
 }
 
+export interface BulkCreatePlayersRowResult {
+  index: number;
+  status: 'created' | 'duplicate' | 'error';
+  id?: string;
+  errors?: Record<string, string[]>;
+}
+
+export interface BulkCreatePlayersResponse {
+  created: number;
+  duplicates: number;
+  errors: number;
+  results: BulkCreatePlayersRowResult[];
+}
+
 export interface UpdatePlayerRequest {
   name?: string;
   position?: string;
@@ -120,10 +134,37 @@ export interface UpdateMonthlyPeriodRequest {
   status?: 'active' | 'closed';
 }
 
+// Reajuste de mensalidade em vários períodos (lista de IDs ou intervalo de meses)
+export interface ReadjustMonthlyFeeRequest {
+  monthly_fee: number;
+  period_ids?: string[];
+  from_year?: number;
+  from_month?: number;
+  to_year?: number;
+  to_month?: number;
+}
+
+export interface ReadjustMonthlyFeeResponse {
+  updated_players: number;
+  periods: MonthlyPeriod[];
+}
+
 export interface UpdatePaymentStatusRequest {
   status: PaymentStatus; // Renomeado de payment_status
 }
 
+// Atualização de status de vários jogadores do período em uma chamada
+export interface BulkPaymentStatusItem {
+  player_id: string;
+  status: 'paid' | 'pending' | 'overdue';
+  payment_date?: string;
+}
+
+export interface BulkPaymentStatusResponse {
+  period: Pick<MonthlyPeriod, 'id' | 'total_expected' | 'total_received'>;
+  players: MonthlyPlayer[];
+}
+
 export interface CreateCasualPlayerRequest {
   player_name: string; // Corrigido: player_name
   monthly_period_id: string; // Corrigido: string (UUID)
@@ -196,6 +237,7 @@ export interface ApiPlayerStats {
   inactive: number;
   pending?: number;
   delayed?: number;
+  by_position?: Record<string, number>;
 }
 
 // Estatísticas de jogadores - formato usado internamente no frontend
@@ -0,0 +1,69 @@
+"""add cashflow_monthly ledger table
+
+Revision ID: a7c3e91b2d40
+Revises: e1a2b3c4d5f6
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91b2d40'
+down_revision = 'e1a2b3c4d5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cashflow_monthly',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('period_name', sa.String(length=50), nullable=False),
+        sa.Column('expected', sa.Numeric(12, 2), nullable=False),
+        sa.Column('received', sa.Numeric(12, 2), nullable=False),
+        sa.Column('expenses_total', sa.Numeric(12, 2), nullable=False),
+        sa.Column('expenses_count', sa.Integer(), nullable=False),
+        sa.Column('net', sa.Numeric(12, 2), nullable=False),
+        sa.Column('balance', sa.Numeric(12, 2), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'year', 'month'),
+    )
+
+    # Backfill: totais por mês + saldo acumulado via função de janela
+    # (suportada por PostgreSQL e SQLite >= 3.25)
+    op.execute(sa.text(
+        """
+        INSERT INTO cashflow_monthly (
+            user_id, year, month, period_name, expected, received,
+            expenses_total, expenses_count, net, balance, updated_at
+        )
+        SELECT
+            p.user_id, p.year, p.month, p.name,
+            COALESCE(p.total_expected, 0),
+            COALESCE(p.total_received, 0),
+            COALESCE(e.total, 0),
+            COALESCE(e.cnt, 0),
+            COALESCE(p.total_received, 0) - COALESCE(e.total, 0),
+            COALESCE(u.initial_balance, 0) + SUM(COALESCE(p.total_received, 0) - COALESCE(e.total, 0)) OVER (
+                PARTITION BY p.user_id ORDER BY p.year, p.month
+                ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+            ),
+            CURRENT_TIMESTAMP
+        FROM monthly_periods p
+        JOIN users u ON u.id = p.user_id
+        LEFT JOIN (
+            SELECT user_id, year, month, SUM(amount) AS total, COUNT(id) AS cnt
+            FROM expenses
+            GROUP BY user_id, year, month
+        ) e ON e.user_id = p.user_id AND e.year = p.year AND e.month = p.month
+        """
+    ))
+
+
+def downgrade():
+    op.drop_table('cashflow_monthly')
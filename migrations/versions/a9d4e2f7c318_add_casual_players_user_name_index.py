@@ -0,0 +1,24 @@
+"""add (user_id, player_name) index on casual_players for player payment history
+
+Revision ID: a9d4e2f7c318
+Revises: f3b7c1e9a052
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4e2f7c318'
+down_revision = 'f3b7c1e9a052'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_casual_players_user_name', 'casual_players', ['user_id', 'player_name'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_casual_players_user_name', table_name='casual_players')
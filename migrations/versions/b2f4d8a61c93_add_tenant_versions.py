@@ -0,0 +1,32 @@
+"""add tenant_versions table
+
+Revision ID: b2f4d8a61c93
+Revises: a7c3e91b2d40
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2f4d8a61c93'
+down_revision = 'a7c3e91b2d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Usuários sem linha são tratados como versão 0; não há backfill.
+    op.create_table(
+        'tenant_versions',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('tenant_versions')
@@ -0,0 +1,82 @@
+"""rekey the SQLite players_fts index on players.id instead of the implicit rowid
+
+Revision ID: b7e3c9a1d5f2
+Revises: a9d4e2f7c318
+Create Date: 2026-10-18 16:00:00
+
+A tabela FTS5 de d8b3f6a2c417 era de conteúdo externo (content='players')
+ligada pelo rowid implícito de ``players``. Um ``batch_alter_table`` em
+``players`` copia a tabela e renumera os rowids, deixando o índice apontando
+para jogadores errados. Agora a FTS5 guarda o texto e ``id UNINDEXED`` e a
+busca faz JOIN pelo id.
+
+No SQLite o ``batch_alter_table`` também descarta os triggers de ``players``:
+migrações futuras que o usarem devem recriar o índice em seguida (mesmas
+instruções de ``backend.services.player_search.create_sqlite_fts``) ou
+rodar ``flask players reindex-search``.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3c9a1d5f2'
+down_revision = 'a9d4e2f7c318'
+branch_labels = None
+depends_on = None
+
+TRIGGERS = ('players_fts_ai', 'players_fts_ad', 'players_fts_au')
+
+
+def _drop_fts():
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS players_fts')
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_fts()
+    op.execute("CREATE VIRTUAL TABLE players_fts USING fts5(id UNINDEXED, search_text, tokenize='trigram')")
+    op.execute(
+        "CREATE TRIGGER players_fts_ai AFTER INSERT ON players BEGIN"
+        " INSERT INTO players_fts(id, search_text) VALUES (new.id, new.search_text); END"
+    )
+    op.execute(
+        "CREATE TRIGGER players_fts_ad AFTER DELETE ON players BEGIN"
+        " DELETE FROM players_fts WHERE id = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER players_fts_au AFTER UPDATE OF id, search_text ON players BEGIN"
+        " DELETE FROM players_fts WHERE id = old.id;"
+        " INSERT INTO players_fts(id, search_text) VALUES (new.id, new.search_text); END"
+    )
+    op.execute("INSERT INTO players_fts(id, search_text) SELECT id, search_text FROM players")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_fts()
+    op.execute(
+        "CREATE VIRTUAL TABLE players_fts USING fts5("
+        " search_text, content='players', content_rowid='rowid', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER players_fts_ai AFTER INSERT ON players BEGIN"
+        " INSERT INTO players_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END"
+    )
+    op.execute(
+        "CREATE TRIGGER players_fts_ad AFTER DELETE ON players BEGIN"
+        " INSERT INTO players_fts(players_fts, rowid, search_text)"
+        " VALUES ('delete', old.rowid, old.search_text); END"
+    )
+    op.execute(
+        "CREATE TRIGGER players_fts_au AFTER UPDATE OF search_text ON players BEGIN"
+        " INSERT INTO players_fts(players_fts, rowid, search_text)"
+        " VALUES ('delete', old.rowid, old.search_text);"
+        " INSERT INTO players_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END"
+    )
+    op.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
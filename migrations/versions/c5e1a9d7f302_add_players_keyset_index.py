@@ -0,0 +1,24 @@
+"""add (user_id, name, id) index on players for keyset pagination
+
+Revision ID: c5e1a9d7f302
+Revises: b2f4d8a61c93
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1a9d7f302'
+down_revision = 'b2f4d8a61c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_players_user_name_id', 'players', ['user_id', 'name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_players_user_name_id', table_name='players')
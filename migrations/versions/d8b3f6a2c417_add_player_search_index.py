@@ -0,0 +1,93 @@
+"""add players.search_text with pg_trgm / FTS5 search index
+
+Revision ID: d8b3f6a2c417
+Revises: c5e1a9d7f302
+Create Date: 2026-10-18 12:00:00
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f6a2c417'
+down_revision = 'c5e1a9d7f302'
+branch_labels = None
+depends_on = None
+
+
+def _normalize(value):
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def _search_text(name, phone, email):
+    parts = (_normalize(name), re.sub(r'\D', '', phone or ''), (email or '').strip().lower())
+    return ' '.join(part for part in parts if part)
+
+
+def upgrade():
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_text', sa.String(length=300), nullable=True))
+
+    # Backfill em Python (remoção de acentos independente do banco)
+    conn = op.get_bind()
+    players = sa.table(
+        'players',
+        sa.column('id', sa.String), sa.column('name', sa.String), sa.column('phone', sa.String),
+        sa.column('email', sa.String), sa.column('search_text', sa.String),
+    )
+    rows = conn.execute(sa.select(players.c.id, players.c.name, players.c.phone, players.c.email)).all()
+    if rows:
+        conn.execute(
+            players.update().where(players.c.id == sa.bindparam('player_id'))
+            .values(search_text=sa.bindparam('value')),
+            [{'player_id': r.id, 'value': _search_text(r.name, r.phone, r.email)} for r in rows]
+        )
+
+    if conn.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            'CREATE INDEX IF NOT EXISTS idx_players_search_trgm '
+            'ON players USING gin (search_text gin_trgm_ops)'
+        )
+    elif conn.dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5("
+            " search_text, content='players', content_rowid='rowid', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS players_fts_ai AFTER INSERT ON players BEGIN"
+            " INSERT INTO players_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS players_fts_ad AFTER DELETE ON players BEGIN"
+            " INSERT INTO players_fts(players_fts, rowid, search_text)"
+            " VALUES ('delete', old.rowid, old.search_text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS players_fts_au AFTER UPDATE OF search_text ON players BEGIN"
+            " INSERT INTO players_fts(players_fts, rowid, search_text)"
+            " VALUES ('delete', old.rowid, old.search_text);"
+            " INSERT INTO players_fts(rowid, search_text) VALUES (new.rowid, new.search_text); END"
+        )
+        op.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS idx_players_search_trgm')
+    elif conn.dialect.name == 'sqlite':
+        for trigger in ('players_fts_ai', 'players_fts_ad', 'players_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS players_fts')
+
+    with op.batch_alter_table('players', schema=None) as batch_op:
+        batch_op.drop_column('search_text')
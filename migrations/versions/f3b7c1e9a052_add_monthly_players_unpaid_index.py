@@ -0,0 +1,49 @@
+"""add partial index on unpaid monthly_players and backfill pending_months_count
+
+Revision ID: f3b7c1e9a052
+Revises: d8b3f6a2c417
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7c1e9a052'
+down_revision = 'd8b3f6a2c417'
+branch_labels = None
+depends_on = None
+
+UNPAID = "status IN ('pending', 'overdue')"
+
+
+def upgrade():
+    op.create_index(
+        'idx_monthly_players_unpaid', 'monthly_players', ['user_id', 'player_id', 'monthly_period_id'],
+        unique=False, postgresql_where=sa.text(UNPAID), sqlite_where=sa.text(UNPAID),
+    )
+
+    # Backfill: meses consecutivos em aberto por jogador, em ordem (year, month)
+    op.execute(f"""
+        UPDATE monthly_players SET pending_months_count = streaks.streak
+        FROM (
+            SELECT id, SUM(unpaid) OVER (
+                PARTITION BY player_id, run ORDER BY year, month ROWS UNBOUNDED PRECEDING
+            ) AS streak
+            FROM (
+                SELECT mp.id, mp.player_id, p.year, p.month,
+                       CASE WHEN mp.{UNPAID} THEN 1 ELSE 0 END AS unpaid,
+                       SUM(CASE WHEN mp.{UNPAID} THEN 0 ELSE 1 END) OVER (
+                           PARTITION BY mp.player_id ORDER BY p.year, p.month ROWS UNBOUNDED PRECEDING
+                       ) AS run
+                FROM monthly_players mp JOIN monthly_periods p ON p.id = mp.monthly_period_id
+            ) AS ordered
+        ) AS streaks
+        WHERE monthly_players.id = streaks.id
+          AND monthly_players.pending_months_count <> streaks.streak
+    """)
+
+
+def downgrade():
+    op.drop_index('idx_monthly_players_unpaid', table_name='monthly_players')
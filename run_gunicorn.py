@@ -14,22 +14,34 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Ajustáveis por ambiente (ex.: comparar configurações com `python -m backend.benchmarks load`)
+BIND = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+WORKERS = os.environ.get('GUNICORN_WORKERS', '4')
+WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+THREADS = os.environ.get('GUNICORN_THREADS', '1')
+
 def main():
     """Executa Flask com Gunicorn"""
     print("🚀 Iniciando Flask com GUNICORN (Produção Avançada)")
     print("=" * 60)
     print("📁 Diretório:", PROJECT_ROOT)
-    print("🌐 URL: http://0.0.0.0:5000")
-    print("👥 Workers: 4")
+    print(f"🌐 URL: http://{BIND}")
+    print(f"👥 Workers: {WORKERS} ({WORKER_CLASS}, {THREADS} thread(s))")
     print("⚡ Performance: MÁXIMA")
     print("=" * 60)
     
+    # Métricas: snapshots por worker de execuções anteriores não devem somar na nova
+    metrics_dir = Path(os.environ.get('METRICS_DIR', PROJECT_ROOT / 'backend' / 'instance' / 'metrics'))
+    for snapshot in metrics_dir.glob('*.json'):
+        snapshot.unlink()
+
     # Comando Gunicorn
     cmd = [
         'gunicorn',
-        '--bind', '0.0.0.0:5000',
-        '--workers', '4',
-        '--worker-class', 'sync',
+        '--bind', BIND,
+        '--workers', WORKERS,
+        '--worker-class', WORKER_CLASS,
+        '--threads', THREADS,
         '--worker-connections', '1000',
         '--max-requests', '1000',
         '--max-requests-jitter', '100',